@@ -0,0 +1,67 @@
+"""
+Loader bersama untuk data/clubs.csv.
+
+File CSV hanya di-parse sekali lalu disimpan di memori proses (main.file_cache),
+dan di-parse ulang ketika mtime atau ukuran file berubah, sehingga edit pada CSV
+tetap terbaca tanpa restart server.
+"""
+import csv
+import os
+
+from django.conf import settings
+
+from main.file_cache import FileCache
+
+
+def get_csv_path():
+    return os.path.join(settings.BASE_DIR, 'data', 'clubs.csv')
+
+
+def _parse(csv_path):
+    rows = []
+    with open(csv_path, 'r', encoding='utf-8') as file:
+        csv_reader = csv.DictReader(file)
+
+        for idx, row in enumerate(csv_reader, start=1):
+            club_name = row['Club_name']
+            win = int(row['Win_count'])
+            draw = int(row['Draw_count'])
+            lose = int(row['Lose_count'])
+            rows.append({
+                'id': idx,
+                'nama_klub': club_name,
+                'logo_filename': club_name.replace(' ', '_'),
+                'jumlah_win': win,
+                'jumlah_draw': draw,
+                'jumlah_lose': lose,
+                'total_matches': win + draw + lose,
+                'points': (win * 3) + draw,
+            })
+    return rows
+
+
+def _parse_indexed(csv_path):
+    rows = _parse(csv_path)
+    return rows, {r['nama_klub']: r for r in rows}
+
+
+# (rows, rows_by_name) per path CSV
+_cache = FileCache(lambda csv_path: _parse_indexed(csv_path))
+
+
+def _load():
+    return _cache.load(get_csv_path())
+
+
+def get_clubs():
+    """Semua baris klub sesuai urutan CSV. Dict yang dikembalikan jangan diubah."""
+    return _load()[0]
+
+
+def get_club(nama_klub):
+    """Lookup O(1) berdasarkan nama klub, None jika tidak ada."""
+    return _load()[1].get(nama_klub)
+
+
+def clear_cache():
+    _cache.clear()
@@ -0,0 +1,132 @@
+"""
+Data halaman detail klub: skuad, riwayat pertandingan kandang/tandang, form,
+head-to-head per lawan, dan komentar.
+
+Semua data diambil dengan jumlah query tetap (klub, pemain, pertandingan,
+komentar + user), lalu diolah di Python dan disimpan di cache Django per klub.
+Cache dihapus per klub saat ``Match`` atau ``ClubComment`` klub itu berubah,
+dan seluruhnya (token versi) saat ``Club``/``Player`` berubah atau setelah
+import massal (clubs.signals).
+"""
+import uuid
+from urllib.parse import quote
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Club, ClubComment
+
+VERSION_KEY = 'clubs:detail:version'
+DETAIL_TIMEOUT = 10 * 60  # pertandingan berpindah ke "sudah dimainkan" seiring waktu
+FORM_WINDOW = 5
+
+
+def version():
+    token = cache.get(VERSION_KEY)
+    if token is None:
+        token = uuid.uuid4().hex
+        if not cache.add(VERSION_KEY, token, None):
+            token = cache.get(VERSION_KEY, token)
+    return token
+
+
+def _key(nama_klub):
+    return f'clubs:detail:{version()}:{quote(nama_klub)}'
+
+
+def invalidate(club_names=None):
+    """Hapus cache klub tertentu, atau semua klub jika ``club_names`` None."""
+    if club_names is None:
+        cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+        return
+    cache.delete_many([_key(name) for name in set(club_names)])
+
+
+def _serialize_player(player):
+    return {
+        'name': player.name,
+        'static_image': player.static_image,
+        'photo': player.profile_picture_url.url if player.profile_picture_url else '',
+    }
+
+
+def _match_history(nama_klub, match_model, now):
+    matches, head_to_head = [], {}
+    home_count = away_count = 0
+    played = match_model.objects.filter(
+        Q(home_team=nama_klub) | Q(away_team=nama_klub), match_date__lte=now,
+    ).order_by('-match_date', '-id')
+
+    for match in played:
+        home = match.home_team == nama_klub
+        if home:
+            home_count += 1
+            opponent, goals_for, goals_against = match.away_team, match.home_score, match.away_score
+        else:
+            away_count += 1
+            opponent, goals_for, goals_against = match.home_team, match.away_score, match.home_score
+        result = 'W' if goals_for > goals_against else 'D' if goals_for == goals_against else 'L'
+        matches.append({
+            'week': match.week,
+            'match_date': match.match_date,
+            'opponent': opponent,
+            'venue': 'Kandang' if home else 'Tandang',
+            'goals_for': goals_for,
+            'goals_against': goals_against,
+            'result': result,
+        })
+
+        h2h = head_to_head.setdefault(opponent, {
+            'opponent': opponent, 'played': 0, 'W': 0, 'D': 0, 'L': 0, 'goals_for': 0, 'goals_against': 0,
+        })
+        h2h['played'] += 1
+        h2h[result] += 1
+        h2h['goals_for'] += goals_for
+        h2h['goals_against'] += goals_against
+
+    return {
+        'matches': matches,
+        'home_matches_count': home_count,
+        'away_matches_count': away_count,
+        # form lama -> baru, seperti tampilan klasemen
+        'form': ''.join(match['result'] for match in reversed(matches[:FORM_WINDOW])),
+        'head_to_head': sorted(head_to_head.values(), key=lambda row: row['opponent']),
+    }
+
+
+def assemble(club, match_model=None):
+    """Context detail klub tanpa cache (``match_model`` None = tanpa data pertandingan)."""
+    from players.models import Player
+
+    context = {
+        'club': club,
+        'players': [_serialize_player(player) for player in Player.objects.filter(team_id=club.id)],
+        'matches': [],
+        'home_matches_count': 0,
+        'away_matches_count': 0,
+        'form': '',
+        'head_to_head': [],
+        'comments': [{
+            'user': comment.user.username,
+            'comment': comment.comment,
+            'created_at': comment.created_at,
+        } for comment in ClubComment.objects.filter(club_name=club.nama_klub).select_related('user')],
+    }
+    if match_model is not None:
+        context.update(_match_history(club.nama_klub, match_model, timezone.now()))
+    return context
+
+
+def club_detail_context(nama_klub, match_model=None):
+    """Context detail klub dari cache, None jika klub tidak ada."""
+    key = _key(nama_klub)
+    context = cache.get(key)
+    if context is None or context['has_matches'] != (match_model is not None):
+        club = Club.objects.filter(nama_klub=nama_klub).first()
+        if club is None:
+            return None
+        context = assemble(club, match_model)
+        context['has_matches'] = match_model is not None
+        cache.set(key, context, DETAIL_TIMEOUT)
+    return context
@@ -1,73 +1,85 @@
-import csv
 import os
-import re
 from django.core.management.base import BaseCommand
-from django.core.files import File
 from django.conf import settings
+from django.db import transaction
 from clubs.models import Club
+from clubs import club_table
+from main import media_files
+from clubs import detail as club_detail
+from matches.standings import recompute_clubs, refresh_snapshots
+from stats import analytics, leaderboards
+
+# W/D/L tidak diambil dari CSV: klasemen diturunkan dari hasil Match (matches.standings)
+UPDATE_FIELDS = ['logo']
+UPLOAD_TO = Club._meta.get_field('logo').upload_to
 
 
 class Command(BaseCommand):
-    help = 'Import data clubs dari CSV dan gambar logo dari static/img/club/'
+    help = 'Import daftar clubs dari CSV dan gambar logo dari static/img/club/ (klasemen dihitung dari Match)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Tampilkan perubahan tanpa menulis ke database maupun media')
 
     def handle(self, *args, **options):
-        csv_path = os.path.join(settings.BASE_DIR, 'data', 'clubs.csv')
+        csv_path = club_table.get_csv_path()
         logo_dir = os.path.join(settings.BASE_DIR, 'static', 'img', 'club')
+        dry_run = options['dry_run']
 
         if not os.path.exists(csv_path):
             self.stderr.write(self.style.ERROR(f"❌ File {csv_path} tidak ditemukan."))
             return
 
-        with open(csv_path, newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                name = row['Club_name'].strip()
-                win = int(row['Win_count'])
-                draw = int(row['Draw_count'])
-                lose = int(row['Lose_count'])
+        existing = {club.nama_klub: club for club in Club.objects.all()}
+        logos = media_files.index_images(logo_dir)
+        to_create, to_update = [], []
+        unchanged = 0
 
-                # --- 🔍 cari logo berdasarkan nama klub ---
-                # Ubah nama klub jadi format nama file (spasi → underscore, huruf besar/kecil tidak masalah)
-                normalized_name = re.sub(r'\s+', '_', name)
-                logo_path = None
+        for row in club_table.get_clubs():
+            name = row['nama_klub'].strip()
+            values = {}
 
-                # Coba berbagai kemungkinan ekstensi dan variasi nama
-                for ext in ['.png', '.jpg', '.jpeg', '.webp']:
-                    candidate = os.path.join(logo_dir, f"{normalized_name}{ext}")
-                    if os.path.exists(candidate):
-                        logo_path = candidate
-                        break
-                    # beberapa file bisa juga huruf kecil semua
-                    candidate_lower = os.path.join(logo_dir, f"{normalized_name.lower()}{ext}")
-                    if os.path.exists(candidate_lower):
-                        logo_path = candidate_lower
-                        break
+            # --- 🔍 logo dibandingkan lewat hash isi file, bukan disalin ulang ---
+            logo_path = media_files.find_image(logos, name)
+            club = existing.get(name)
+            if logo_path:
+                logo_name = media_files.media_name(logo_path, UPLOAD_TO, media_files.content_hash(logo_path))
+                if club is None or club.logo.name != logo_name:
+                    values['logo'] = logo_name if dry_run else media_files.store_by_hash(logo_path, UPLOAD_TO)
+            else:
+                self.stdout.write(self.style.WARNING(f"⚠️ Logo untuk {name} tidak ditemukan."))
 
-                # --- 🧱 Simpan ke database ---
-                club, created = Club.objects.get_or_create(
-                    nama_klub=name,
-                    defaults={
-                        'jumlah_win': win,
-                        'jumlah_draw': draw,
-                        'jumlah_lose': lose,
-                    }
-                )
+            if club is None:
+                to_create.append(Club(nama_klub=name, **values))
+                self.stdout.write(self.style.SUCCESS(f"🟢 Baru: {name}"))
+                continue
 
-                if not created:
-                    club.jumlah_win = win
-                    club.jumlah_draw = draw
-                    club.jumlah_lose = lose
+            changes = {field: value for field, value in values.items() if getattr(club, field) != value}
+            if not changes:
+                unchanged += 1
+            else:
+                diff = ', '.join(f"{field}: {getattr(club, field)} → {value}" for field, value in changes.items())
+                for field, value in changes.items():
+                    setattr(club, field, value)
+                to_update.append(club)
+                self.stdout.write(self.style.SUCCESS(f"🟡 Berubah: {name} ({diff})"))
 
-                # Jika ada logo, simpan ke field ImageField
-                if logo_path:
-                    with open(logo_path, 'rb') as f:
-                        club.logo.save(os.path.basename(logo_path), File(f), save=False)
-                else:
-                    self.stdout.write(self.style.WARNING(f"⚠️ Logo untuk {name} tidak ditemukan."))
-
-                club.save()
+        summary = f"{len(to_create)} baru, {len(to_update)} berubah, {unchanged} tidak berubah"
+        if dry_run:
+            self.stdout.write(self.style.WARNING(f"🔎 Dry run, tidak ada yang ditulis: {summary}."))
+            return
 
-                status = "🟢 Dibuat" if created else "🟡 Diperbarui"
-                self.stdout.write(self.style.SUCCESS(f"{status}: {club.nama_klub}"))
+        if to_create or to_update:
+            with transaction.atomic():
+                Club.objects.bulk_create(to_create)
+                Club.objects.bulk_update(to_update, UPDATE_FIELDS)
+                if to_create:
+                    # klub baru: baris klasemen dan snapshot dari pertandingan yang sudah ada
+                    recompute_clubs([club.nama_klub for club in to_create])
+                    refresh_snapshots(from_week=0)
+            # bulk query tidak memicu signal invalidasi cache analitik, statistik dan detail klub
+            analytics.invalidate()
+            leaderboards.invalidate()
+            club_detail.invalidate()
 
-        self.stdout.write(self.style.SUCCESS("✅ Import selesai!"))
+        self.stdout.write(self.style.SUCCESS(f"✅ Import selesai! {summary}."))
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:59
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0002_alter_club_options_alter_club_jumlah_draw_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='club',
+            name='points',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('jumlah_win'), '*', models.Value(3)), '+', models.F('jumlah_draw')), output_field=models.IntegerField()),
+        ),
+        migrations.AddField(
+            model_name='club',
+            name='total_matches',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('jumlah_win'), '+', models.F('jumlah_draw')), '+', models.F('jumlah_lose')), output_field=models.IntegerField()),
+        ),
+        migrations.AddIndex(
+            model_name='club',
+            index=models.Index(fields=['-points', 'nama_klub'], name='club_points_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:01
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0003_club_points_total_matches'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='club',
+            name='club_points_idx',
+        ),
+        migrations.AddField(
+            model_name='club',
+            name='jumlah_gol',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='club',
+            name='jumlah_kebobolan',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='club',
+            name='selisih_gol',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(models.F('jumlah_gol'), '-', models.F('jumlah_kebobolan')), output_field=models.IntegerField()),
+        ),
+        migrations.AddIndex(
+            model_name='club',
+            index=models.Index(fields=['-points', '-selisih_gol', '-jumlah_gol', 'nama_klub'], name='club_standings_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0004_club_goals_standings_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='club',
+            index=models.Index(fields=['nama_klub'], name='club_nama_klub_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clubcomment',
+            index=models.Index(fields=['club_name', '-created_at'], name='clubcomment_club_created_idx'),
+        ),
+    ]
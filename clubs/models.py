@@ -1,20 +1,53 @@
 from django.db import models
+from django.db.models import F
 from django.contrib.auth.models import User
 
+class ClubQuerySet(models.QuerySet):
+    def standings(self):
+        """Urutan klasemen: poin, selisih gol, lalu gol memasukkan."""
+        return self.order_by('-points', '-selisih_gol', '-jumlah_gol', 'nama_klub')
+
+
 class Club(models.Model):
     nama_klub = models.CharField(max_length=100)
     jumlah_win = models.IntegerField(default=0)
     jumlah_draw = models.IntegerField(default=0)
     jumlah_lose = models.IntegerField(default=0)
+    jumlah_gol = models.IntegerField(default=0)
+    jumlah_kebobolan = models.IntegerField(default=0)
     logo = models.ImageField(upload_to='club_logos/', blank=True, null=True)
+    # Disimpan di database supaya klasemen bisa di-ORDER BY + LIMIT langsung di SQL
+    points = models.GeneratedField(
+        expression=F('jumlah_win') * 3 + F('jumlah_draw'),
+        output_field=models.IntegerField(),
+        db_persist=True,
+    )
+    total_matches = models.GeneratedField(
+        expression=F('jumlah_win') + F('jumlah_draw') + F('jumlah_lose'),
+        output_field=models.IntegerField(),
+        db_persist=True,
+    )
+    selisih_gol = models.GeneratedField(
+        expression=F('jumlah_gol') - F('jumlah_kebobolan'),
+        output_field=models.IntegerField(),
+        db_persist=True,
+    )
 
-    @property
-    def points(self):
-        return (self.jumlah_win * 3) + self.jumlah_draw
+    objects = ClubQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['-points', '-selisih_gol', '-jumlah_gol', 'nama_klub'],
+                name='club_standings_idx',
+            ),
+            # Lookup per nama (detail klub, import, klasemen)
+            models.Index(fields=['nama_klub'], name='club_nama_klub_idx'),
+        ]
 
     @property
-    def total_matches(self):
-        return self.jumlah_win + self.jumlah_draw + self.jumlah_lose
+    def logo_filename(self):
+        return self.nama_klub.replace(' ', '_')
 
     def __str__(self):
         return self.nama_klub
@@ -29,6 +62,9 @@ class ClubComment(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['club_name', '-created_at'], name='clubcomment_club_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.club_name}"
\ No newline at end of file
@@ -0,0 +1,29 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from matches.models import Match
+from players.models import Player
+
+from . import detail
+from .models import Club, ClubComment
+
+
+@receiver([post_save, post_delete], sender=Club)
+@receiver([post_save, post_delete], sender=Player)
+def invalidate_all_details(sender, **kwargs):
+    detail.invalidate()
+
+
+@receiver([post_save, post_delete], sender=Match)
+def invalidate_match_clubs(sender, instance, **kwargs):
+    teams = [instance.home_team, instance.away_team]
+    previous = getattr(instance, '_previous_state', None)
+    if previous:
+        # tim lama juga berubah jika match dipindah ke tim lain
+        teams += previous[:2]
+    detail.invalidate(teams)
+
+
+@receiver([post_save, post_delete], sender=ClubComment)
+def invalidate_comment_club(sender, instance, **kwargs):
+    detail.invalidate([instance.club_name])
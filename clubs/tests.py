@@ -1,7 +1,7 @@
 from django.test import TestCase, RequestFactory, Client
 from django.urls import reverse
 from django.contrib.auth.models import User
-from clubs.models import ClubComment
+from clubs.models import Club, ClubComment
 from clubs import views as club_views
 import json
 
@@ -412,115 +412,51 @@ class ClubListAPIEdgeCasesTest(TestCase):
     def setUp(self):
         self.client = Client()
     
-    def test_club_list_api_with_csv_not_found(self):
-        """Test API when CSV file doesn't exist"""
-        import tempfile
-        from unittest.mock import patch
+    def test_club_list_api_empty_database(self):
+        """Test API when no club has been imported yet"""
+        response = self.client.get(reverse('clubs:club_list_api'))
         
-        fake_dir = '/nonexistent/directory'
-        
-        with patch('clubs.views.settings.BASE_DIR', fake_dir):
-            response = self.client.get(reverse('clubs:club_list_api'))
-            
-            self.assertEqual(response.status_code, 404)
-            data = json.loads(response.content)
-            self.assertIn('error', data)
-            self.assertIn('not found', data['error'].lower())
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(data['data'], [])
     
     def test_club_list_api_calculates_points_correctly(self):
         """Test that API calculates points correctly (wins*3 + draws)"""
-        import tempfile
-        import os
-        from unittest.mock import patch
+        Club.objects.create(nama_klub='Arsenal', jumlah_win=10, jumlah_draw=5, jumlah_lose=3)
+        Club.objects.create(nama_klub='Chelsea', jumlah_win=5, jumlah_draw=8, jumlah_lose=2)
         
-        test_dir = tempfile.mkdtemp()
+        response = self.client.get(reverse('clubs:club_list_api'))
         
-        try:
-            data_dir = os.path.join(test_dir, 'data')
-            os.makedirs(data_dir)
-            csv_path = os.path.join(data_dir, 'clubs.csv')
-            
-            with open(csv_path, 'w', encoding='utf-8') as f:
-                f.write('Club_name,Win_count,Draw_count,Lose_count\n')
-                f.write('Arsenal,10,5,3\n')  
-                f.write('Chelsea,5,8,2\n') 
-            
-            with patch('clubs.views.settings.BASE_DIR', test_dir):
-                response = self.client.get(reverse('clubs:club_list_api'))
-                
-                self.assertEqual(response.status_code, 200)
-                data = json.loads(response.content)
-                
-                arsenal = next(c for c in data['data'] if c['nama_klub'] == 'Arsenal')
-                chelsea = next(c for c in data['data'] if c['nama_klub'] == 'Chelsea')
-                
-                self.assertEqual(arsenal['points'], 35)  
-                self.assertEqual(chelsea['points'], 23) 
-                
-        finally:
-            import shutil
-            if os.path.exists(test_dir):
-                shutil.rmtree(test_dir)
-    
-    def test_club_list_api_generic_exception(self):
-        """Test API handles generic exceptions"""
-        import tempfile
-        import os
-        from unittest.mock import patch
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
         
-        test_dir = tempfile.mkdtemp()
+        arsenal = next(c for c in data['data'] if c['nama_klub'] == 'Arsenal')
+        chelsea = next(c for c in data['data'] if c['nama_klub'] == 'Chelsea')
         
-        try:
-            data_dir = os.path.join(test_dir, 'data')
-            os.makedirs(data_dir)
-            csv_path = os.path.join(data_dir, 'clubs.csv')
-            
-            with open(csv_path, 'w', encoding='utf-8') as f:
-                f.write('Invalid,Headers\n')
-                f.write('Test,Data\n')
-            
-            with patch('clubs.views.settings.BASE_DIR', test_dir):
-                response = self.client.get(reverse('clubs:club_list_api'))
-                
-                self.assertEqual(response.status_code, 500)
-                data = json.loads(response.content)
-                self.assertIn('error', data)
-                
-        finally:
-            import shutil
-            if os.path.exists(test_dir):
-                shutil.rmtree(test_dir)
+        self.assertEqual(arsenal['points'], 35)  
+        self.assertEqual(chelsea['points'], 23) 
+    
+    def test_club_list_api_ordered_by_points(self):
+        """Test that API returns clubs ordered by points from the database"""
+        Club.objects.create(nama_klub='Chelsea', jumlah_win=5, jumlah_draw=8, jumlah_lose=2)
+        Club.objects.create(nama_klub='Arsenal', jumlah_win=10, jumlah_draw=5, jumlah_lose=3)
+        
+        response = self.client.get(reverse('clubs:club_list_api'))
+        data = json.loads(response.content)
+        
+        self.assertEqual([c['nama_klub'] for c in data['data']], ['Arsenal', 'Chelsea'])
     
     def test_club_list_api_logo_filename_generation(self):
         """Test that logo filename replaces spaces with underscores"""
-        import tempfile
-        import os
-        from unittest.mock import patch
+        Club.objects.create(nama_klub='Manchester United', jumlah_win=8, jumlah_draw=4, jumlah_lose=2)
         
-        test_dir = tempfile.mkdtemp()
+        response = self.client.get(reverse('clubs:club_list_api'))
         
-        try:
-            data_dir = os.path.join(test_dir, 'data')
-            os.makedirs(data_dir)
-            csv_path = os.path.join(data_dir, 'clubs.csv')
-            
-            with open(csv_path, 'w', encoding='utf-8') as f:
-                f.write('Club_name,Win_count,Draw_count,Lose_count\n')
-                f.write('Manchester United,8,4,2\n')
-            
-            with patch('clubs.views.settings.BASE_DIR', test_dir):
-                response = self.client.get(reverse('clubs:club_list_api'))
-                
-                self.assertEqual(response.status_code, 200)
-                data = json.loads(response.content)
-                
-                man_utd = data['data'][0]
-                self.assertEqual(man_utd['logo_filename'], 'Manchester_United')
-                
-        finally:
-            import shutil
-            if os.path.exists(test_dir):
-                shutil.rmtree(test_dir)
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        
+        man_utd = data['data'][0]
+        self.assertEqual(man_utd['logo_filename'], 'Manchester_United')
 
 
 class ClubCommentExceptionTest(TestCase):
@@ -596,130 +532,56 @@ class ClubDetailViewTest(TestCase):
     
     def test_club_detail_with_match_available_false(self):
         """Test club_detail when Match model is not available"""
-        import tempfile
-        import os
         from unittest.mock import patch
         
-        test_dir = tempfile.mkdtemp()
+        Club.objects.create(nama_klub='Arsenal', jumlah_win=10, jumlah_draw=5, jumlah_lose=3)
         
-        try:
-            data_dir = os.path.join(test_dir, 'data')
-            os.makedirs(data_dir)
-            csv_path = os.path.join(data_dir, 'clubs.csv')
-            
-            with open(csv_path, 'w', encoding='utf-8') as f:
-                f.write('Club_name,Win_count,Draw_count,Lose_count\n')
-                f.write('Arsenal,10,5,3\n')
+        with patch('clubs.views.MATCH_AVAILABLE', False):
+            request = self.factory.get('/clubs/Arsenal/')
+            request.user = self.user
+            response = club_views.club_detail(request, 'Arsenal')
             
-            with patch('clubs.views.settings.BASE_DIR', test_dir):
-                with patch('clubs.views.MATCH_AVAILABLE', False):
-                    request = self.factory.get('/clubs/Arsenal/')
-                    request.user = self.user
-                    response = club_views.club_detail(request, 'Arsenal')
-                    
-                    self.assertEqual(response.status_code, 200)
-                    self.assertIn(b'Arsenal', response.content)
-                    
-        finally:
-            import shutil
-            if os.path.exists(test_dir):
-                shutil.rmtree(test_dir)
-    
-    def test_club_detail_csv_exception(self):
-        """Test club_detail handles CSV reading exceptions gracefully"""
-        import tempfile
-        import os
-        from unittest.mock import patch
-        
-        test_dir = tempfile.mkdtemp()
+            self.assertEqual(response.status_code, 200)
+            self.assertIn(b'Arsenal', response.content)
+    
+    def test_club_detail_unknown_club(self):
+        """Test club_detail raises 404 for a club that is not in the database"""
+        request = self.factory.get('/clubs/Arsenal/')
+        request.user = self.user
         
-        try:
-            data_dir = os.path.join(test_dir, 'data')
-            os.makedirs(data_dir)
-            csv_path = os.path.join(data_dir, 'clubs.csv')
-            
-            with open(csv_path, 'w', encoding='utf-8') as f:
-                f.write('Invalid\n')
-            
-            with patch('clubs.views.settings.BASE_DIR', test_dir):
-                request = self.factory.get('/clubs/Arsenal/')
-                request.user = self.user
-                
-                from django.http import Http404
-                with self.assertRaises(Http404):
-                    club_views.club_detail(request, 'Arsenal')
-                    
-        finally:
-            import shutil
-            if os.path.exists(test_dir):
-                shutil.rmtree(test_dir)
+        from django.http import Http404
+        with self.assertRaises(Http404):
+            club_views.club_detail(request, 'Arsenal')
     
     def test_club_detail_with_players(self):
         """Test club_detail includes players correctly"""
-        import tempfile
-        import os
-        from unittest.mock import patch, Mock
         from players.models import Player
         
-        test_dir = tempfile.mkdtemp()
+        club = Club.objects.create(nama_klub='Arsenal', jumlah_win=10, jumlah_draw=5, jumlah_lose=3)
+        Player.objects.create(name='Test Player', position='FW', team=club, citizenship='England')
         
-        try:
-            data_dir = os.path.join(test_dir, 'data')
-            os.makedirs(data_dir)
-            csv_path = os.path.join(data_dir, 'clubs.csv')
-            
-            with open(csv_path, 'w', encoding='utf-8') as f:
-                f.write('Club_name,Win_count,Draw_count,Lose_count\n')
-                f.write('Arsenal,10,5,3\n')
-            
-            mock_player = Mock()
-            mock_player.name = 'Test Player'
-            
-            with patch('clubs.views.settings.BASE_DIR', test_dir):
-                with patch('clubs.views.Player.objects.filter', return_value=[mock_player]):
-                    request = self.factory.get('/clubs/Arsenal/')
-                    request.user = self.user
-                    response = club_views.club_detail(request, 'Arsenal')
-                    
-                    self.assertEqual(response.status_code, 200)
-                    
-        finally:
-            import shutil
-            if os.path.exists(test_dir):
-                shutil.rmtree(test_dir)
+        request = self.factory.get('/clubs/Arsenal/')
+        request.user = self.user
+        response = club_views.club_detail(request, 'Arsenal')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'Test Player', response.content)
     
     def test_club_detail_context_data(self):
         """Test club_detail returns correct context data"""
-        import tempfile
-        import os
         from unittest.mock import patch
         
-        test_dir = tempfile.mkdtemp()
+        Club.objects.create(nama_klub='Liverpool', jumlah_win=12, jumlah_draw=3, jumlah_lose=1)
         
-        try:
-            data_dir = os.path.join(test_dir, 'data')
-            os.makedirs(data_dir)
-            csv_path = os.path.join(data_dir, 'clubs.csv')
-            
-            with open(csv_path, 'w', encoding='utf-8') as f:
-                f.write('Club_name,Win_count,Draw_count,Lose_count\n')
-                f.write('Liverpool,12,3,1\n')
+        with patch('players.models.Player.objects.filter', return_value=[]):
+            request = self.factory.get('/clubs/Liverpool/')
+            request.user = self.user
+            response = club_views.club_detail(request, 'Liverpool')
             
-            with patch('clubs.views.settings.BASE_DIR', test_dir):
-                with patch('clubs.views.Player.objects.filter', return_value=[]):
-                    request = self.factory.get('/clubs/Liverpool/')
-                    request.user = self.user
-                    response = club_views.club_detail(request, 'Liverpool')
-                    
-                    self.assertIn(b'Liverpool', response.content)
-                    self.assertIn(b'12', response.content)  
-                    self.assertIn(b'3', response.content)  
-                    self.assertIn(b'1', response.content)  
-                    
-        finally:
-            import shutil
-            if os.path.exists(test_dir):
-                shutil.rmtree(test_dir)
+            self.assertIn(b'Liverpool', response.content)
+            self.assertIn(b'12', response.content)  
+            self.assertIn(b'3', response.content)  
+            self.assertIn(b'1', response.content)  
 
 
 class ClubListViewTest(TestCase):
@@ -761,72 +623,236 @@ class ClubAPIDataIntegrityTest(TestCase):
     
     def test_club_api_data_structure(self):
         """Test club API returns all required fields"""
+        Club.objects.create(nama_klub='Arsenal', jumlah_win=10, jumlah_draw=5, jumlah_lose=3)
+        
+        response = self.client.get(reverse('clubs:club_list_api'))
+        
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        
+        club = data['data'][0]
+        
+        required_fields = [
+            'id', 'nama_klub', 'logo_filename',
+            'jumlah_win', 'jumlah_draw', 'jumlah_lose',
+            'total_matches', 'points'
+        ]
+        
+        for field in required_fields:
+            self.assertIn(field, club, f"Field '{field}' missing from API response")
+        
+        self.assertEqual(club['total_matches'], 18)
+    
+    def test_club_api_ids_match_database(self):
+        """Test that club IDs are the database primary keys"""
+        arsenal = Club.objects.create(nama_klub='Arsenal', jumlah_win=10, jumlah_draw=5, jumlah_lose=3)
+        chelsea = Club.objects.create(nama_klub='Chelsea', jumlah_win=8, jumlah_draw=6, jumlah_lose=4)
+        liverpool = Club.objects.create(nama_klub='Liverpool', jumlah_win=12, jumlah_draw=3, jumlah_lose=1)
+        
+        response = self.client.get(reverse('clubs:club_list_api'))
+        
+        data = json.loads(response.content)
+        
+        self.assertEqual(data['data'][0]['id'], liverpool.id)
+        self.assertEqual(data['data'][1]['id'], arsenal.id)
+        self.assertEqual(data['data'][2]['id'], chelsea.id)
+
+
+class ClubTableCacheTest(TestCase):
+    """Test shared clubs.csv loader cache"""
+    
+    def setUp(self):
         import tempfile
         import os
         from unittest.mock import patch
         
-        test_dir = tempfile.mkdtemp()
+        self.test_dir = tempfile.mkdtemp()
+        data_dir = os.path.join(self.test_dir, 'data')
+        os.makedirs(data_dir)
+        self.csv_path = os.path.join(data_dir, 'clubs.csv')
         
-        try:
-            data_dir = os.path.join(test_dir, 'data')
-            os.makedirs(data_dir)
-            csv_path = os.path.join(data_dir, 'clubs.csv')
-            
-            with open(csv_path, 'w', encoding='utf-8') as f:
-                f.write('Club_name,Win_count,Draw_count,Lose_count\n')
-                f.write('Arsenal,10,5,3\n')
-            
-            with patch('clubs.views.settings.BASE_DIR', test_dir):
-                response = self.client.get(reverse('clubs:club_list_api'))
-                
-                self.assertEqual(response.status_code, 200)
-                data = json.loads(response.content)
-                
-                club = data['data'][0]
-                
-                required_fields = [
-                    'id', 'nama_klub', 'logo_filename',
-                    'jumlah_win', 'jumlah_draw', 'jumlah_lose',
-                    'total_matches', 'points'
-                ]
-                
-                for field in required_fields:
-                    self.assertIn(field, club, f"Field '{field}' missing from API response")
-                
-        finally:
-            import shutil
-            if os.path.exists(test_dir):
-                shutil.rmtree(test_dir)
-    
-    def test_club_api_id_increments_correctly(self):
-        """Test that club IDs increment correctly"""
-        import tempfile
-        import os
+        with open(self.csv_path, 'w', encoding='utf-8') as f:
+            f.write('Club_name,Win_count,Draw_count,Lose_count\n')
+            f.write('Arsenal,10,5,3\n')
+            f.write('Chelsea,5,8,2\n')
+        
+        patcher = patch('clubs.club_table.settings.BASE_DIR', self.test_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def tearDown(self):
+        import shutil
+        from clubs import club_table
+        club_table.clear_cache()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def test_csv_parsed_once(self):
+        """Test that repeated reads reuse the parsed rows"""
         from unittest.mock import patch
+        from clubs import club_table
         
-        test_dir = tempfile.mkdtemp()
+        first = club_table.get_clubs()
+        with patch('clubs.club_table._parse') as mock_parse:
+            second = club_table.get_clubs()
+            chelsea = club_table.get_club('Chelsea')
+            mock_parse.assert_not_called()
         
-        try:
-            data_dir = os.path.join(test_dir, 'data')
-            os.makedirs(data_dir)
-            csv_path = os.path.join(data_dir, 'clubs.csv')
-            
-            with open(csv_path, 'w', encoding='utf-8') as f:
-                f.write('Club_name,Win_count,Draw_count,Lose_count\n')
-                f.write('Arsenal,10,5,3\n')
-                f.write('Chelsea,8,6,4\n')
-                f.write('Liverpool,12,3,1\n')
-            
-            with patch('clubs.views.settings.BASE_DIR', test_dir):
-                response = self.client.get(reverse('clubs:club_list_api'))
-                
-                data = json.loads(response.content)
-                
-                self.assertEqual(data['data'][0]['id'], 1)
-                self.assertEqual(data['data'][1]['id'], 2)
-                self.assertEqual(data['data'][2]['id'], 3)
-                
-        finally:
-            import shutil
-            if os.path.exists(test_dir):
-                shutil.rmtree(test_dir)
\ No newline at end of file
+        self.assertIs(first, second)
+        self.assertEqual(chelsea['points'], 23)
+        self.assertIsNone(club_table.get_club('Liverpool'))
+    
+    def test_cache_invalidated_when_file_changes(self):
+        """Test that editing the CSV is picked up without restart"""
+        from clubs import club_table
+        
+        self.assertEqual(len(club_table.get_clubs()), 2)
+        
+        with open(self.csv_path, 'a', encoding='utf-8') as f:
+            f.write('Liverpool,12,3,1\n')
+        
+        self.assertEqual(len(club_table.get_clubs()), 3)
+        self.assertEqual(club_table.get_club('Liverpool')['id'], 3)
+
+
+class ImportClubsCommandTest(TestCase):
+    """Test import_clubs yang idempotent dan dedupe logo"""
+    
+    def setUp(self):
+        import tempfile
+        import os
+        from PIL import Image
+        from django.test import override_settings
+        
+        self.test_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.test_dir, 'data'))
+        logo_dir = os.path.join(self.test_dir, 'static', 'img', 'club')
+        os.makedirs(logo_dir)
+        self.logo_path = os.path.join(logo_dir, 'Arsenal.png')
+        Image.new('RGB', (20, 20), color='red').save(self.logo_path)
+        self.write_csv('Arsenal,10,5,3\nChelsea,5,8,2\n')
+        
+        settings_override = override_settings(BASE_DIR=self.test_dir, MEDIA_ROOT=os.path.join(self.test_dir, 'media'))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+    
+    def tearDown(self):
+        import shutil
+        from clubs import club_table
+        club_table.clear_cache()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def write_csv(self, rows):
+        import os
+        with open(os.path.join(self.test_dir, 'data', 'clubs.csv'), 'w', encoding='utf-8') as f:
+            f.write('Club_name,Win_count,Draw_count,Lose_count\n' + rows)
+    
+    def run_import(self, **options):
+        import io
+        from django.core.management import call_command
+        out = io.StringIO()
+        call_command('import_clubs', stdout=out, **options)
+        return out.getvalue()
+    
+    def logo_files(self):
+        import os
+        return os.listdir(os.path.join(self.test_dir, 'media', 'club_logos'))
+    
+    def test_rerun_does_not_duplicate_logos(self):
+        """Import berulang tidak menulis ulang club maupun logo"""
+        self.assertIn('2 baru, 0 berubah, 0 tidak berubah', self.run_import())
+        arsenal = Club.objects.get(nama_klub='Arsenal')
+        self.assertTrue(arsenal.logo.name.startswith('club_logos/Arsenal.'))
+        
+        with self.assertNumQueries(1):
+            output = self.run_import()
+        self.assertIn('0 baru, 0 berubah, 2 tidak berubah', output)
+        self.assertEqual(len(self.logo_files()), 1)
+    
+    def test_dry_run_reports_diff(self):
+        """Dry run menampilkan perubahan tanpa menulis apa pun"""
+        from PIL import Image
+        
+        self.run_import()
+        old_logo = Club.objects.get(nama_klub='Arsenal').logo.name
+        Image.new('RGB', (20, 20), color='blue').save(self.logo_path)
+        self.write_csv('Arsenal,10,5,3\nChelsea,5,8,2\nFulham,1,1,1\n')
+        
+        output = self.run_import(dry_run=True)
+        self.assertIn(f'logo: {old_logo} → club_logos/Arsenal.', output)
+        self.assertIn('Baru: Fulham', output)
+        self.assertEqual(Club.objects.get(nama_klub='Arsenal').logo.name, old_logo)
+        self.assertFalse(Club.objects.filter(nama_klub='Fulham').exists())
+        
+        self.assertIn('1 baru, 1 berubah, 1 tidak berubah', self.run_import())
+        self.assertNotEqual(Club.objects.get(nama_klub='Arsenal').logo.name, old_logo)
+    
+    def test_standings_come_from_matches_not_csv(self):
+        """W/D/L di CSV tidak menimpa klasemen hasil Match"""
+        from django.utils import timezone
+        from matches.models import Match, StandingSnapshot
+        
+        Match.objects.create(home_team='Arsenal', away_team='Chelsea', home_score=2, away_score=0, week=1,
+                             match_date=timezone.now() - timezone.timedelta(days=1))
+        self.run_import()
+        arsenal = Club.objects.get(nama_klub='Arsenal')
+        self.assertEqual((arsenal.jumlah_win, arsenal.jumlah_draw, arsenal.jumlah_lose), (1, 0, 0))
+        self.assertEqual(StandingSnapshot.objects.filter(week=1).count(), 2)
+        
+        Club.objects.filter(pk=arsenal.pk).update(jumlah_win=1)
+        self.run_import()
+        self.assertEqual(Club.objects.get(nama_klub='Arsenal').jumlah_win, 1)
+
+
+class ClubDetailAssemblerTest(TestCase):
+    """Detail klub dirakit dengan query tetap, di-cache, dan di-invalidate"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from django.utils import timezone
+        from matches.models import Match
+        from players.models import Player
+
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.club = Club.objects.create(nama_klub='Man City')
+        Club.objects.create(nama_klub='Chelsea')
+        Club.objects.create(nama_klub='Everton')
+        for name in ('Haaland', 'Foden', 'Rodri'):
+            Player.objects.create(name=name, position='MF', team=self.club, citizenship='-')
+        start = timezone.now() - timezone.timedelta(days=30)
+        for week, (home, away, home_score, away_score) in enumerate([
+            ('Man City', 'Chelsea', 3, 1),
+            ('Everton', 'Man City', 1, 1),
+            ('Chelsea', 'Man City', 2, 0),
+        ], start=1):
+            Match.objects.create(week=week, match_date=start + timezone.timedelta(days=week),
+                                 home_team=home, away_team=away, home_score=home_score, away_score=away_score)
+        ClubComment.objects.create(user=self.user, club_name='Man City', comment='Juara lagi!')
+        self.url = reverse('clubs:club_detail', args=['Man City'])
+
+    def test_context_assembled_in_fixed_queries_then_cached(self):
+        # klub, pemain, pertandingan, komentar + user
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.context['players']), 3)
+        self.assertEqual((response.context['home_matches_count'], response.context['away_matches_count']), (1, 2))
+        self.assertEqual(response.context['form'], 'WDL')
+        chelsea = response.context['head_to_head'][0]
+        self.assertEqual((chelsea['opponent'], chelsea['W'], chelsea['L'], chelsea['goals_for']), ('Chelsea', 1, 1, 3))
+        self.assertContains(response, 'Juara lagi!')
+
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_cache_invalidated_by_comment_and_match(self):
+        from matches.models import Match
+
+        self.client.get(self.url)
+        ClubComment.objects.create(user=self.user, club_name='Man City', comment='Treble!')
+        self.assertContains(self.client.get(self.url), 'Treble!')
+
+        match = Match.objects.get(week=3)
+        match.away_score = 3
+        match.save()
+        self.assertEqual(self.client.get(self.url).context['form'], 'WDW')
@@ -2,12 +2,9 @@ from django.shortcuts import render
 from django.http import Http404, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required
-from players.models import Player
-from .models import ClubComment
-import csv
-import os
+from .models import Club, ClubComment
+from .detail import club_detail_context
 import json
-from django.conf import settings
 
 try:
     from matches.models import Match
@@ -24,36 +21,16 @@ def club_list(request):
 
 def club_list_api(request):
     """API endpoint untuk data clubs"""
-    clubs = []
-    csv_path = os.path.join(settings.BASE_DIR, 'data', 'clubs.csv')
-    
-    try:
-        with open(csv_path, 'r', encoding='utf-8') as file:
-            csv_reader = csv.DictReader(file)
-            
-            for idx, row in enumerate(csv_reader, start=1):
-                club_name = row['Club_name']
-                club_data = {
-                    'id': idx,
-                    'nama_klub': club_name,
-                    'logo_filename': club_name.replace(' ', '_'),
-                    'jumlah_win': int(row['Win_count']),
-                    'jumlah_draw': int(row['Draw_count']),
-                    'jumlah_lose': int(row['Lose_count']),
-                }
-                club_data['total_matches'] = (
-                    club_data['jumlah_win'] + 
-                    club_data['jumlah_draw'] + 
-                    club_data['jumlah_lose']
-                )
-                club_data['points'] = (club_data['jumlah_win'] * 3) + club_data['jumlah_draw']
-                
-                clubs.append(club_data)
-                
-    except FileNotFoundError:
-        return JsonResponse({'error': 'CSV file not found'}, status=404)
-    except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+    clubs = [{
+        'id': club.id,
+        'nama_klub': club.nama_klub,
+        'logo_filename': club.logo_filename,
+        'jumlah_win': club.jumlah_win,
+        'jumlah_draw': club.jumlah_draw,
+        'jumlah_lose': club.jumlah_lose,
+        'total_matches': club.total_matches,
+        'points': club.points,
+    } for club in Club.objects.standings()]
     
     return JsonResponse({'data': clubs}, safe=False)
 
@@ -167,56 +144,10 @@ def delete_comment_api(request, comment_id):
 
 def club_detail(request, nama_klub):
     """Display detail for a specific club"""
-    club = None
-    csv_path = os.path.join(settings.BASE_DIR, 'data', 'clubs.csv')
+    # Skuad, riwayat pertandingan, head-to-head dan komentar di-cache per klub (clubs.detail)
+    context = club_detail_context(nama_klub, Match if MATCH_AVAILABLE else None)
     
-    try:
-        with open(csv_path, 'r', encoding='utf-8') as file:
-            csv_reader = csv.DictReader(file)
-            
-            for idx, row in enumerate(csv_reader, start=1):
-                if row['Club_name'] == nama_klub:
-                    club = {
-                        'id': idx,
-                        'nama_klub': row['Club_name'],
-                        'logo_filename': row['Club_name'].replace(' ', '_'),
-                        'jumlah_win': int(row['Win_count']),
-                        'jumlah_draw': int(row['Draw_count']),
-                        'jumlah_lose': int(row['Lose_count']),
-                    }
-                    club['total_matches'] = (
-                        club['jumlah_win'] + 
-                        club['jumlah_draw'] + 
-                        club['jumlah_lose']
-                    )
-                    club['points'] = (club['jumlah_win'] * 3) + club['jumlah_draw']
-                    break
-                    
-    except Exception as e:
-        print(f"Error reading CSV: {e}")
-    
-    if not club:
+    if context is None:
         raise Http404("Club not found")
     
-    players = Player.objects.filter(team__nama_klub=nama_klub)
-    
-    if MATCH_AVAILABLE and Match is not None:
-        date_field = 'date' if hasattr(Match, 'date') else ('match_date' if hasattr(Match, 'match_date') else None)
-        
-        matches_ordered = []
-        home_matches_count = 0
-        away_matches_count = 0
-    else:
-        matches_ordered = []
-        home_matches_count = 0
-        away_matches_count = 0
-    
-    context = {
-        'club': club,
-        'players': players,
-        'matches': matches_ordered,
-        'home_matches_count': home_matches_count,
-        'away_matches_count': away_matches_count,
-    }
-    
     return render(request, 'club_detail.html', context)
\ No newline at end of file
@@ -162,9 +162,37 @@ if DEBUG:
 else:
     STATIC_ROOT = BASE_DIR / 'static' # merujuk ke /static root project pada mode production
 
+# Varian gambar responsif (main.image_pipeline): <nama>.<lebar>.<hash 12>.<format>
+WHITENOISE_IMMUTABLE_FILE_TEST = r'\.\d+\.[0-9a-f]{12}\.(?:avif|webp)$'
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Counter views berita: True = view dikumpulkan di memori lalu ditulis per batch
+# (view yang belum ditulis hilang jika worker dibunuh paksa, jadi default mati)
+NEWS_VIEWS_BUFFERED = os.getenv('NEWS_VIEWS_BUFFERED', 'False').lower() == 'true'
+NEWS_VIEWS_FLUSH_INTERVAL = 5  # detik
+
+# Cache disk proxy gambar thumbnail berita (news.image_proxy)
+IMAGE_PROXY_CACHE_DIR = BASE_DIR / 'cache' / 'image_proxy'
+IMAGE_PROXY_CACHE_MAX_BYTES = 200 * 1024 * 1024
+IMAGE_PROXY_MAX_IMAGE_BYTES = 5 * 1024 * 1024
+IMAGE_PROXY_TTL = 24 * 60 * 60  # detik
+# Host thumbnail yang boleh di-fetch; kosong = host mana pun yang IP-nya publik
+IMAGE_PROXY_ALLOWED_HOSTS = [
+    host for host in os.getenv('IMAGE_PROXY_ALLOWED_HOSTS', '').split(',') if host
+]
+
+# Default sama dengan bawaan Django (LocMemCache, per proses). Isi CACHE_BACKEND dan
+# CACHE_LOCATION (mis. Redis) agar invalidasi cache terlihat di semua worker dan
+# command import
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -0,0 +1,38 @@
+"""
+Cache hasil parse file di memori proses.
+
+File hanya di-parse sekali per proses lalu disimpan per path. Cache otomatis
+di-invalidate ketika mtime atau ukuran file berubah, sehingga perubahan file
+tetap terbaca tanpa restart server. Dipakai clubs.club_table (data/clubs.csv)
+dan main.image_pipeline (manifest gambar responsif).
+"""
+import os
+import threading
+
+
+class FileCache:
+    def __init__(self, parse):
+        # parse(path) -> nilai yang di-cache
+        self._parse = parse
+        self._lock = threading.Lock()
+        # path -> (mtime_ns, size, nilai)
+        self._entries = {}
+
+    def load(self, path):
+        """Nilai hasil parse ``path``; FileNotFoundError diteruskan seperti open() biasa."""
+        stat = os.stat(path)
+        entry = self._entries.get(path)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry[2]
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                return entry[2]
+            value = self._parse(path)
+            self._entries[path] = (stat.st_mtime_ns, stat.st_size, value)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,207 @@
+"""
+Pipeline gambar responsif untuk static/img/player, static/img/club dan
+static/img/club-matches.
+
+``build()`` (command ``build_images``) membuat varian WebP/AVIF di beberapa lebar
+ke ``static/img/responsive/``. Nama file memuat hash isi gambar sumber
+(``<nama>.<lebar>.<hash>.<format>``, hash dari ``main.media_files.content_hash``)
+sehingga WhiteNoise menyajikannya dengan cache jangka panjang
+(``WHITENOISE_IMMUTABLE_FILE_TEST`` di settings). Hasil build tidak di-commit;
+workflow deploy menjalankan ``build_images`` sebelum push. ``manifest.json``
+mencatat hash dan varian tiap sumber; gambar yang hash-nya tidak berubah
+dilewati pada build berikutnya.
+
+Saat runtime manifest dibaca sekali lalu di-cache di memori proses
+(``main.file_cache``), dan di-parse ulang ketika file manifest berubah (lihat
+template tag ``picture``).
+"""
+import json
+import os
+import tempfile
+
+from django.conf import settings
+from django.templatetags.static import static
+from PIL import Image, ImageOps
+
+from .file_cache import FileCache
+from .media_files import content_hash
+
+SOURCE_DIRS = ('img/player', 'img/club', 'img/club-matches')
+SOURCE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+OUTPUT_DIR = 'img/responsive'
+WIDTHS = (80, 160, 320, 640)
+# urutan = urutan <source> di <picture>, format paling hemat lebih dulu
+FORMATS = {
+    'avif': ('AVIF', 'image/avif', {'quality': 50, 'speed': 8}),
+    'webp': ('WEBP', 'image/webp', {'quality': 80, 'method': 4}),
+}
+
+
+
+def get_static_dir():
+    return os.path.join(settings.BASE_DIR, 'static')
+
+
+def get_manifest_path():
+    return os.path.join(get_static_dir(), OUTPUT_DIR, 'manifest.json')
+
+
+def read_manifest():
+    try:
+        with open(get_manifest_path(), 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_manifest(manifest):
+    path = get_manifest_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _outputs(entry):
+    return [path for variants in entry['variants'].values() for _, path in variants]
+
+
+def _outputs_exist(entry):
+    static_dir = get_static_dir()
+    return all(os.path.exists(os.path.join(static_dir, path)) for path in _outputs(entry))
+
+
+def _remove_outputs(entry):
+    static_dir = get_static_dir()
+    for path in _outputs(entry):
+        try:
+            os.remove(os.path.join(static_dir, path))
+        except OSError:
+            pass
+
+
+def _build_variants(source, digest):
+    static_dir = get_static_dir()
+    directory, name = os.path.split(source)
+    stem = os.path.splitext(name)[0]
+    output_dir = os.path.join(static_dir, OUTPUT_DIR, directory)
+    os.makedirs(output_dir, exist_ok=True)
+
+    with Image.open(os.path.join(static_dir, source)) as image:
+        image = ImageOps.exif_transpose(image)
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+        widths = sorted({w for w in WIDTHS if w < image.width} | {min(image.width, WIDTHS[-1])})
+
+        variants = {}
+        for width in widths:
+            resized = image.copy()
+            resized.thumbnail((width, image.height), Image.LANCZOS)
+            for fmt, (pil_format, _, options) in FORMATS.items():
+                path = f'{OUTPUT_DIR}/{directory}/{stem}.{width}.{digest}.{fmt}'
+                resized.save(os.path.join(static_dir, path), pil_format, **options)
+                variants.setdefault(fmt, []).append([width, path])
+
+        return {
+            'source': source,
+            'hash': digest,
+            'width': image.width,
+            'height': image.height,
+            'variants': variants,
+        }
+
+
+def iter_sources():
+    static_dir = get_static_dir()
+    for directory in SOURCE_DIRS:
+        absolute = os.path.join(static_dir, directory)
+        if not os.path.isdir(absolute):
+            continue
+        for name in sorted(os.listdir(absolute)):
+            if name.lower().endswith(SOURCE_EXTENSIONS):
+                yield f'{directory}/{name}'
+
+
+def build(force=False, log=None):
+    """Bangun varian yang belum ada/berubah. Mengembalikan (dibuat, dilewati, dihapus)."""
+    static_dir = get_static_dir()
+    manifest = read_manifest()
+    built = skipped = 0
+    seen = set()
+
+    for source in iter_sources():
+        seen.add(source)
+        digest = content_hash(os.path.join(static_dir, source))
+        entry = manifest.get(source)
+        if not force and entry and entry['hash'] == digest and _outputs_exist(entry):
+            skipped += 1
+            continue
+        if entry:
+            _remove_outputs(entry)
+        manifest[source] = _build_variants(source, digest)
+        built += 1
+        if log:
+            log(source)
+
+    removed = [source for source in manifest if source not in seen]
+    for source in removed:
+        _remove_outputs(manifest.pop(source))
+
+    _write_manifest(manifest)
+    _remove_orphans(manifest)
+    return built, skipped, len(removed)
+
+
+def _remove_orphans(manifest):
+    """Hapus file varian yang tidak tercatat di manifest (mis. sisa build yang terputus)."""
+    static_dir = get_static_dir()
+    known = {os.path.normpath(os.path.join(static_dir, path))
+             for entry in manifest.values() for path in _outputs(entry)}
+    known.add(os.path.normpath(get_manifest_path()))
+    for root, _, names in os.walk(os.path.join(static_dir, OUTPUT_DIR)):
+        for name in names:
+            path = os.path.normpath(os.path.join(root, name))
+            if path not in known:
+                os.remove(path)
+
+
+def _index_manifest(path):
+    entries = read_manifest()
+    return entries, {os.path.splitext(source)[0]: value for source, value in entries.items()}
+
+
+# (entries, entries_by_stem) per path manifest
+_cache = FileCache(_index_manifest)
+
+
+def _load():
+    try:
+        return _cache.load(get_manifest_path())
+    except OSError:
+        return None
+
+
+def lookup(source):
+    """Entry manifest untuk ``source`` (boleh tanpa ekstensi), None jika belum dibangun."""
+    loaded = _load()
+    if loaded is None or not source:
+        return None
+    return loaded[0].get(source) or loaded[1].get(source)
+
+
+def srcset(entry, fmt, base_url=''):
+    return ', '.join(f'{base_url}{static(path)} {width}w' for width, path in entry['variants'].get(fmt, []))
+
+
+def sources(source, base_url=''):
+    """``[{'type', 'srcset'}]`` untuk <picture> yang dirender JS, [] jika belum dibangun."""
+    entry = lookup(source)
+    if entry is None:
+        return []
+    return [{'type': content_type, 'srcset': srcset(entry, fmt, base_url)}
+            for fmt, (_, content_type, _) in FORMATS.items()]
+
+
+def clear_cache():
+    _cache.clear()
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from main import image_pipeline
+from stats import leaderboards
+
+
+class Command(BaseCommand):
+    help = 'Bangun varian WebP/AVIF responsif untuk gambar pemain dan logo klub di static/img/'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Bangun ulang semua gambar walau hash-nya sama')
+
+    def handle(self, *args, **options):
+        built, skipped, removed = image_pipeline.build(
+            force=options['force'],
+            log=lambda source: self.stdout.write(f"🖼️ {source}"),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {built} gambar dibangun, {skipped} tidak berubah, {removed} varian usang dihapus."
+        ))
+        if built or removed:
+            # payload statistics_api/favorit yang di-cache memuat srcset dengan hash lama
+            leaderboards.invalidate()
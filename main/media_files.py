@@ -0,0 +1,60 @@
+"""
+Helper bersama untuk command import: mencari gambar di static/img/ dan menyimpan
+salinannya ke media berdasarkan hash isi file.
+
+Nama file media memuat hash (``<upload_to><nama>.<hash><ext>``), sehingga file
+dengan isi sama cukup disimpan sekali dan perubahan gambar terdeteksi hanya dari
+nama file yang tersimpan di database, tanpa membaca ulang file media.
+"""
+import hashlib
+import os
+import re
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+HASH_LENGTH = 12
+
+
+def content_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(64 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def index_images(directory):
+    """Satu kali listdir: nama file (huruf kecil) -> path lengkap."""
+    if not os.path.isdir(directory):
+        return {}
+    return {
+        name.lower(): os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    }
+
+
+def find_image(images, name):
+    """Gambar untuk ``name`` (spasi -> underscore, huruf besar/kecil tidak masalah)."""
+    normalized = re.sub(r'\s+', '_', name).lower()
+    for ext in IMAGE_EXTENSIONS:
+        path = images.get(f'{normalized}{ext}')
+        if path:
+            return path
+    return None
+
+
+def media_name(path, upload_to, digest):
+    stem, ext = os.path.splitext(os.path.basename(path))
+    return f'{upload_to}{stem}.{digest}{ext.lower()}'
+
+
+def store_by_hash(path, upload_to, digest=None, storage=default_storage):
+    """Nama file media untuk ``path``; hanya disalin jika isi yang sama belum ada."""
+    name = media_name(path, upload_to, digest or content_hash(path))
+    if not storage.exists(name):
+        with open(path, 'rb') as file:
+            name = storage.save(name, File(file))
+    return name
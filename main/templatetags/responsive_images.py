@@ -0,0 +1,37 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from main import image_pipeline
+
+register = template.Library()
+
+
+@register.simple_tag
+def picture(source, sizes='100vw', fallback=None, **attrs):
+    """
+    ``<picture>`` dengan <source> AVIF/WebP dari build ``build_images`` untuk
+    gambar static ``source`` (mis. 'img/club/Arsenal.png'). Jika gambar belum
+    dibangun, hanya ``<img>`` ke ``fallback`` atau file static aslinya.
+    Atribut lain (alt, class, ...) diteruskan ke ``<img>``.
+    """
+    entry = image_pipeline.lookup(source)
+    attrs.setdefault('loading', 'lazy')
+    attrs.setdefault('decoding', 'async')
+
+    if entry is None:
+        attrs['src'] = fallback or static(source)
+        return format_html('<img {}>', format_html_join(' ', '{}="{}"', attrs.items()))
+
+    attrs['src'] = fallback or static(entry['source'])
+    attrs.setdefault('width', entry['width'])
+    attrs.setdefault('height', entry['height'])
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        ((content_type, image_pipeline.srcset(entry, fmt), sizes)
+         for fmt, (_, content_type, _) in image_pipeline.FORMATS.items()),
+    )
+    return format_html(
+        '<picture class="contents">{}<img {}></picture>',
+        sources, format_html_join(' ', '{}="{}"', attrs.items()),
+    )
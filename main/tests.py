@@ -1,15 +1,21 @@
 import os
-import csv
+import re
+import shutil
 import tempfile
 from datetime import datetime
 from unittest.mock import patch, MagicMock
 
-from django.test import TestCase, Client
+from PIL import Image
+
+from django.conf import settings
+from django.template import Context, Template
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 from django.contrib.auth.models import User
-from django.conf import settings
 from django.contrib.messages import get_messages
 
+from clubs.models import Club
+from main import image_pipeline
 from main.views import show_main, register, login_user, logout_user, read_clubs_for_home 
 
 
@@ -37,55 +43,37 @@ def mock_news_queryset():
         MockNews(3, 'Berita Lama 3', 'Konten berita tiga...', datetime(2025, 10, 23), 'GOL'),
     ]
 
-# Dummy CSV Content untuk pengujian read_clubs_for_home
-DUMMY_CSV_CONTENT = [
-    {'Club_name': 'Club A', 'Win_count': '10', 'Draw_count': '5', 'Lose_count': '3'},
-    {'Club_name': 'Club B', 'Win_count': '5', 'Draw_count': '5', 'Lose_count': '5'},
-    {'Club_name': 'Club C', 'Win_count': '1', 'Draw_count': '0', 'Lose_count': '10'},
-    {'Club_name': 'Club D', 'Win_count': '0', 'Draw_count': '0', 'Lose_count': '0'},
-    {'Club_name': 'Club E', 'Win_count': '100', 'Draw_count': '0', 'Lose_count': '0'},
+# Dummy data klub untuk pengujian read_clubs_for_home
+DUMMY_CLUBS = [
+    {'nama_klub': 'Club A', 'jumlah_win': 10, 'jumlah_draw': 5, 'jumlah_lose': 3},
+    {'nama_klub': 'Club B', 'jumlah_win': 5, 'jumlah_draw': 5, 'jumlah_lose': 5},
+    {'nama_klub': 'Club C', 'jumlah_win': 1, 'jumlah_draw': 0, 'jumlah_lose': 10},
+    {'nama_klub': 'Club D', 'jumlah_win': 0, 'jumlah_draw': 0, 'jumlah_lose': 0},
+    {'nama_klub': 'Club E', 'jumlah_win': 100, 'jumlah_draw': 0, 'jumlah_lose': 0},
 ]
 
 
 ## --- UNIT TEST CLASSES ---
 
 class ClubDataFunctionTest(TestCase):
-    """Menguji fungsi read_clubs_for_home (isolasi filesystem menggunakan tempfile)."""
+    """Menguji fungsi read_clubs_for_home (data diambil dari model Club)."""
     
     def setUp(self):
-        # 1. Buat direktori sementara
-        self.temp_dir = tempfile.TemporaryDirectory()
-        self.data_dir = os.path.join(self.temp_dir.name, 'data')
-        self.csv_path = os.path.join(self.data_dir, 'clubs.csv')
-
-        os.makedirs(self.data_dir, exist_ok=True)
-
-        # 2. Tulis dummy content ke file CSV sementara
-        fieldnames = ['Club_name', 'Win_count', 'Draw_count', 'Lose_count']
-        with open(self.csv_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(DUMMY_CSV_CONTENT)
-
-        # 3. Patch settings.BASE_DIR agar menunjuk ke direktori sementara
-        patcher_settings = patch.object(settings, 'BASE_DIR', self.temp_dir.name)
-        self.mock_base_dir = patcher_settings.start()
-        self.addCleanup(patcher_settings.stop)
-
-
-    def tearDown(self):
-        # Membersihkan direktori sementara
-        self.temp_dir.cleanup()
+        for data in DUMMY_CLUBS:
+            Club.objects.create(**data)
 
     def test_read_clubs_success(self):
         """Memastikan fungsi membaca dan mengolah data klub dengan benar."""
         clubs = read_clubs_for_home(limit=3)
         self.assertEqual(len(clubs), 3)
 
+        # Urut berdasarkan poin: Club E (300), Club A (35), Club B (20)
+        self.assertEqual([c['nama_klub'] for c in clubs], ['Club E', 'Club A', 'Club B'])
+
         # Check Club A: Points = 10*3 + 5 = 35
-        club_a = clubs[0]
-        self.assertEqual(club_a['nama_klub'], 'Club A')
+        club_a = clubs[1]
         self.assertEqual(club_a['points'], 35)
+        self.assertEqual(club_a['total_matches'], 18)
         self.assertIn('/static/img/club/Club_A.png', club_a['logo_url'])
 
     def test_read_clubs_limit(self):
@@ -93,15 +81,12 @@ class ClubDataFunctionTest(TestCase):
         clubs = read_clubs_for_home(limit=2)
         self.assertEqual(len(clubs), 2)
         
-    def test_read_clubs_no_file_error(self):
-        """Memastikan fungsi mengembalikan list kosong jika file tidak ditemukan."""
-        temp_csv_path = os.path.join(settings.BASE_DIR, 'data', 'clubs.csv')
-        os.remove(temp_csv_path)
+    def test_read_clubs_empty(self):
+        """Memastikan fungsi mengembalikan list kosong jika belum ada klub."""
+        Club.objects.all().delete()
         
-        with patch('main.views.print') as mock_print:
-            clubs = read_clubs_for_home(limit=5)
-            self.assertEqual(clubs, [])
-            mock_print.assert_called_once() 
+        clubs = read_clubs_for_home(limit=5)
+        self.assertEqual(clubs, [])
 
 # ---------------------------------------------------------------------------------------------------
 
@@ -267,4 +252,68 @@ class AuthenticationViewTest(TestCase):
 
         self.assertIn('last_login', response.cookies)
         self.assertEqual(response.cookies['last_login'].value, '')
-        self.assertTrue(response.cookies['last_login']['max-age'] <= 0)
\ No newline at end of file
+        self.assertTrue(response.cookies['last_login']['max-age'] <= 0)
+
+class ImagePipelineTest(TestCase):
+
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.base_dir, True)
+        settings_override = override_settings(BASE_DIR=self.base_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(image_pipeline.clear_cache)
+
+        club_dir = os.path.join(self.base_dir, 'static', 'img', 'club')
+        os.makedirs(club_dir)
+        self.source = os.path.join(club_dir, 'Club_A.png')
+        Image.new('RGBA', (400, 400), (10, 20, 200, 255)).save(self.source)
+
+    def render(self, source):
+        return Template("{% load responsive_images %}{% picture source sizes='80px' alt='Logo' %}").render(
+            Context({'source': source}))
+
+    def test_1_build_is_incremental(self):
+        """Build kedua melewati gambar yang hash-nya tidak berubah"""
+        self.assertEqual(image_pipeline.build(), (1, 0, 0))
+        entry = image_pipeline.read_manifest()['img/club/Club_A.png']
+        self.assertEqual([w for w, _ in entry['variants']['webp']], [80, 160, 320, 400])
+        for _, path in entry['variants']['avif']:
+            self.assertIn(f".{entry['hash']}.avif", path)
+        self.assertEqual(image_pipeline.build(), (0, 1, 0))
+
+        Image.new('RGB', (100, 100), (255, 0, 0)).save(self.source)
+        self.assertEqual(image_pipeline.build(), (1, 0, 0))
+        new_entry = image_pipeline.read_manifest()['img/club/Club_A.png']
+        self.assertNotEqual(new_entry['hash'], entry['hash'])
+        self.assertFalse(os.path.exists(os.path.join(self.base_dir, 'static', entry['variants']['webp'][0][1])))
+
+        os.remove(self.source)
+        self.assertEqual(image_pipeline.build(), (0, 0, 1))
+
+    def test_2_picture_tag(self):
+        """Tag picture memakai varian jika sudah dibangun, selain itu <img> biasa"""
+        html = self.render('img/club/Club_A.png')
+        self.assertNotIn('<picture', html)
+        self.assertIn('src="/static/img/club/Club_A.png"', html)
+
+        image_pipeline.build()
+        html = self.render('img/club/Club_A')
+        self.assertIn('<source type="image/avif"', html)
+        self.assertIn('80w', html)
+        self.assertIn('alt="Logo"', html)
+        self.assertIn('src="/static/img/club/Club_A.png"', html)
+
+    def test_3_sources_for_script_and_immutable_names(self):
+        """sources() untuk <picture> di JS, dan nama varian dianggap immutable oleh WhiteNoise"""
+        self.assertEqual(image_pipeline.sources('img/club/Club_A'), [])
+
+        image_pipeline.build()
+        avif, webp = image_pipeline.sources('img/club/Club_A', 'http://testserver')
+        self.assertEqual((avif['type'], webp['type']), ('image/avif', 'image/webp'))
+        self.assertTrue(webp['srcset'].startswith('http://testserver/static/img/responsive/img/club/Club_A.80.'))
+
+        immutable = re.compile(settings.WHITENOISE_IMMUTABLE_FILE_TEST)
+        for _, path in image_pipeline.read_manifest()['img/club/Club_A.png']['variants']['webp']:
+            self.assertTrue(immutable.search('/static/' + path))
+        self.assertFalse(immutable.search('/static/img/club/Club_A.png'))
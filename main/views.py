@@ -9,8 +9,6 @@ from news.models import News
 from clubs.models import Club 
 from matches.models import Match
 from django.templatetags.static import static
-import csv, os
-from django.conf import settings
 from django.db.models import Max
 
 # Create your views here.
@@ -63,36 +61,22 @@ def logout_user(request):
 
 def read_clubs_for_home(limit=4):
     clubs = []
-    csv_path = os.path.join(settings.BASE_DIR, 'data', 'clubs.csv')
 
-    try:
-        with open(csv_path, 'r', encoding='utf-8') as file:
-            csv_reader = csv.DictReader(file)
-            for idx, row in enumerate(csv_reader, start=1):
-                club_name = row['Club_name']
-                logo_filename = club_name.replace(' ', '_')
-                logo_url = static(f'img/club/{logo_filename}.png')
+    # ORDER BY points LIMIT n di SQL, cukup baca n baris teratas
+    for club in Club.objects.standings()[:limit]:
+        clubs.append({
+            'id': club.id,
+            'nama_klub': club.nama_klub,
+            'logo_filename': club.logo_filename,
+            'logo_url': static(f'img/club/{club.logo_filename}.png'),
+            'jumlah_win': club.jumlah_win,
+            'jumlah_draw': club.jumlah_draw,
+            'jumlah_lose': club.jumlah_lose,
+            'points': club.points,
+            'total_matches': club.total_matches,
+        })
 
-                win = int(row['Win_count'])
-                draw = int(row['Draw_count'])
-                lose = int(row['Lose_count'])
-                points = win * 3 + draw
-
-                clubs.append({
-                    'id': idx,
-                    'nama_klub': club_name,
-                    'logo_filename': logo_filename,
-                    'logo_url': logo_url,
-                    'jumlah_win': win,
-                    'jumlah_draw': draw,
-                    'jumlah_lose': lose,
-                    'points': points,
-                    'total_matches': win + draw + lose
-                })
-    except Exception as e:
-        print("Error reading clubs for home:", e)
-
-    return clubs[:limit]
+    return clubs
 
 def read_matches_for_home():
     latest_week_value = Match.objects.aggregate(Max('week'))['week__max']
@@ -0,0 +1,121 @@
+import csv
+import os
+from datetime import datetime
+from itertools import islice
+from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from matches.models import Match, MatchStats
+from matches.match_stats import STAT_FIELDS, has_stats, stats_from_row
+from matches.scoring import rescore_match
+from matches.standings import recompute_standings, refresh_snapshots
+from clubs import detail as club_detail
+from stats import analytics
+
+BATCH_SIZE = 500
+NATURAL_KEY = ['week', 'home_team', 'away_team']
+UPDATE_FIELDS = ['match_date', 'home_score', 'away_score']
+
+
+def read_matches(csv_path):
+    """
+    Baris CSV -> (Match belum disimpan, nilai MatchStats atau None), dibaca
+    bertahap tanpa memuat seluruh file.
+    """
+    with open(csv_path, newline='', encoding='utf-8') as csvfile:
+        for row in csv.DictReader(csvfile):
+            match = Match(
+                week=int(row['Week']),
+                match_date=timezone.make_aware(datetime.strptime(row['Date'], "%d-%m-%Y")),
+                home_team=row['Home_Team'].strip(),
+                away_team=row['Away_Team'].strip(),
+                home_score=int(row['Home_Team_Score']),
+                away_score=int(row['Away_Team_Score']),
+            )
+            yield match, stats_from_row(row) if has_stats(row) else None
+
+
+def batches(rows, size):
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        # Baris ganda dalam satu batch tidak boleh masuk satu INSERT ... ON CONFLICT
+        yield list({(m.week, m.home_team, m.away_team): (m, stats) for m, stats in batch}.values())
+
+
+class Command(BaseCommand):
+    help = 'Import/upsert pertandingan dan statistiknya dari CSV (kunci: week, home_team, away_team) lalu hitung ulang klasemen'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_paths', nargs='*', help='File CSV pertandingan (default: data/matches.csv)')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        csv_paths = options['csv_paths'] or [os.path.join(settings.BASE_DIR, 'data', 'matches.csv')]
+        for csv_path in csv_paths:
+            if not os.path.exists(csv_path):
+                self.stderr.write(self.style.ERROR(f"❌ File {csv_path} tidak ditemukan."))
+                return
+
+        # Hasil lama dimuat sekali untuk mendeteksi pertandingan yang berubah
+        existing = {
+            (week, home, away): (match_id, match_date, home_score, away_score)
+            for match_id, week, home, away, match_date, home_score, away_score in Match.objects.values_list(
+                'id', 'week', 'home_team', 'away_team', 'match_date', 'home_score', 'away_score'
+            )
+        }
+        created = updated = unchanged = 0
+        changed_ids, changed_weeks = [], set()
+
+        with transaction.atomic():
+            for csv_path in csv_paths:
+                for batch in batches(read_matches(csv_path), options['batch_size']):
+                    to_write = []
+                    for match, _ in batch:
+                        old = existing.get((match.week, match.home_team, match.away_team))
+                        if old is None:
+                            created += 1
+                        elif old[1:] != (match.match_date, match.home_score, match.away_score):
+                            updated += 1
+                            changed_ids.append(old[0])
+                        else:
+                            unchanged += 1
+                            continue
+                        changed_weeks.add(match.week)
+                        to_write.append(match)
+
+                    # update_conflicts mengisi pk (RETURNING) juga untuk baris yang di-update
+                    Match.objects.bulk_create(
+                        to_write,
+                        update_conflicts=True,
+                        unique_fields=NATURAL_KEY,
+                        update_fields=UPDATE_FIELDS,
+                    )
+                    for match in to_write:
+                        existing[(match.week, match.home_team, match.away_team)] = (
+                            match.pk, match.match_date, match.home_score, match.away_score,
+                        )
+
+                    MatchStats.objects.bulk_create(
+                        [MatchStats(match_id=existing[(m.week, m.home_team, m.away_team)][0], **stats)
+                         for m, stats in batch if stats is not None],
+                        update_conflicts=True,
+                        unique_fields=['match'],
+                        update_fields=STAT_FIELDS,
+                    )
+
+            # bulk_create tidak memicu signal: klasemen dan snapshot dihitung ulang sekali di akhir
+            if changed_weeks:
+                recompute_standings()
+                refresh_snapshots(from_week=min(changed_weeks))
+                for match in Match.objects.filter(id__in=changed_ids, scoreprediction__isnull=False).distinct():
+                    rescore_match(match)
+        # bulk_create juga tidak memicu invalidasi cache analitik dan detail klub
+        analytics.invalidate()
+        club_detail.invalidate()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Import pertandingan selesai! {created} dibuat, {updated} diperbarui, {unchanged} tidak berubah."
+        ))
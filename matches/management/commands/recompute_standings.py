@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from clubs import detail as club_detail
+from matches.models import StandingSnapshot
+from matches.standings import recompute_standings, refresh_snapshots
+
+
+class Command(BaseCommand):
+    help = 'Hitung ulang klasemen (W/D/L, gol, poin) dan snapshot per pekan dari data Match'
+
+    def handle(self, *args, **options):
+        recompute_standings()
+        StandingSnapshot.objects.all().delete()
+        refresh_snapshots()
+        # klasemen ditulis dengan update(), tanpa signal
+        club_detail.invalidate()
+        self.stdout.write(self.style.SUCCESS("✅ Klasemen berhasil dihitung ulang!"))
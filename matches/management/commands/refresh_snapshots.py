@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from matches.models import StandingSnapshot
+from matches.standings import refresh_snapshots
+
+
+class Command(BaseCommand):
+    help = ('Bangun snapshot klasemen untuk pekan yang sudah selesai tapi belum punya snapshot '
+            '(jadwalkan mis. tiap 15 menit; pekan bisa selesai karena waktu berjalan tanpa save Match)')
+
+    def handle(self, *args, **options):
+        before = set(StandingSnapshot.objects.values_list('week', flat=True).distinct())
+        refresh_snapshots()
+        after = set(StandingSnapshot.objects.values_list('week', flat=True).distinct())
+        self.stdout.write(self.style.SUCCESS(f"✅ Snapshot klasemen diperbarui! Pekan baru: {sorted(after - before) or '-'}"))
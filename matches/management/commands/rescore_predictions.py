@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from matches.models import LeaderboardEntry, Match, ScorePrediction
+from matches.scoring import rescore_match
+
+
+class Command(BaseCommand):
+    help = 'Nilai ulang semua prediksi dan bangun ulang leaderboard dari awal'
+
+    def handle(self, *args, **options):
+        LeaderboardEntry.objects.all().delete()
+        ScorePrediction.objects.update(points=0)
+
+        count = 0
+        for match in Match.objects.iterator():
+            rescore_match(match)
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Prediksi untuk {count} pertandingan berhasil dinilai ulang!"))
@@ -0,0 +1,91 @@
+"""
+Statistik per pertandingan (``MatchStats``) dan agregat musim per klub.
+
+Agregat dihitung di database: satu GROUP BY untuk sisi kandang (lewat index
+``match_home_team_idx``) dan satu untuk sisi tandang, lalu keduanya dijumlahkan.
+Rata-rata per laga diturunkan dari total tersebut (tidak ada data menit bermain,
+jadi tidak ada rate per 90 menit).
+"""
+from django.db.models import Count, F, Sum
+
+from .models import MatchStats
+
+# nama stat -> kolom CSV (tanpa awalan Home_Team_/Away_Team_)
+CSV_COLUMNS = {
+    'yellow_cards': 'Yellowcard',
+    'red_cards': 'Redcard',
+    'shots': 'Shots',
+    'shots_on_target': 'ShotsonTarget',
+    'possession': 'Possession',
+    'passes': 'Passes',
+    'fouls': 'Fouls',
+    'offsides': 'Offside',
+    'corners': 'Corner',
+}
+STAT_FIELDS = [f'{side}_{stat}' for stat in CSV_COLUMNS for side in ('home', 'away')]
+PER_MATCH_STATS = ('shots', 'shots_on_target', 'passes', 'fouls', 'offsides', 'corners')
+
+
+def has_stats(row):
+    return all(f'Home_Team_{column}' in row for column in CSV_COLUMNS.values())
+
+
+def stats_from_row(row):
+    """Nilai field MatchStats dari satu baris data/matches.csv."""
+    values = {}
+    for stat, column in CSV_COLUMNS.items():
+        values[f'home_{stat}'] = int(row[f'Home_Team_{column}'] or 0)
+        values[f'away_{stat}'] = int(row[f'Away_Team_{column}'] or 0)
+    return values
+
+
+def _side_totals(side, other, week, club):
+    stats = MatchStats.objects.all()
+    if week is not None:
+        stats = stats.filter(match__week__lte=week)
+    if club:
+        stats = stats.filter(**{f'match__{side}_team': club})
+    return stats.values(club=F(f'match__{side}_team')).annotate(
+        matches=Count('match'),
+        goals=Sum(f'match__{side}_score'),
+        conceded=Sum(f'match__{other}_score'),
+        **{stat: Sum(f'{side}_{stat}') for stat in CSV_COLUMNS},
+    ).order_by()
+
+
+def club_season_stats(week=None, club=None):
+    """
+    Agregat per klub sampai pekan ``week`` (None = seluruh musim), urut nama klub.
+    ``club`` membatasi hasil ke satu klub.
+    """
+    totals = {}
+    for side, other in (('home', 'away'), ('away', 'home')):
+        for row in _side_totals(side, other, week, club):
+            name = row.pop('club')
+            if name in totals:
+                for key, value in row.items():
+                    totals[name][key] += value or 0
+            else:
+                totals[name] = {key: value or 0 for key, value in row.items()}
+
+    result = []
+    for name in sorted(totals):
+        total = totals[name]
+        matches = total['matches']
+        row = {
+            'club': name,
+            'matches': matches,
+            'goals': total['goals'],
+            'conceded': total['conceded'],
+            'yellow_cards': total['yellow_cards'],
+            'red_cards': total['red_cards'],
+            'avg_possession': round(total['possession'] / matches, 1),
+            # akurasi tembakan dan konversi gol (proporsi 0..1)
+            'shot_accuracy': round(total['shots_on_target'] / total['shots'], 3) if total['shots'] else 0.0,
+            'conversion_rate': round(total['goals'] / total['shots'], 3) if total['shots'] else 0.0,
+            'cards_per_match': round((total['yellow_cards'] + total['red_cards']) / matches, 2),
+        }
+        for stat in PER_MATCH_STATS:
+            row[f'{stat}_per_match'] = round(total[stat] / matches, 2)
+        result.append(row)
+    return result
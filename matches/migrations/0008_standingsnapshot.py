@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0004_club_goals_standings_index'),
+        ('matches', '0007_match_team_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StandingSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week', models.PositiveIntegerField()),
+                ('position', models.PositiveIntegerField()),
+                ('movement', models.IntegerField(default=0)),
+                ('jumlah_win', models.PositiveIntegerField(default=0)),
+                ('jumlah_draw', models.PositiveIntegerField(default=0)),
+                ('jumlah_lose', models.PositiveIntegerField(default=0)),
+                ('jumlah_gol', models.PositiveIntegerField(default=0)),
+                ('jumlah_kebobolan', models.PositiveIntegerField(default=0)),
+                ('points', models.PositiveIntegerField(default=0)),
+                ('club', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='clubs.club')),
+            ],
+            options={
+                'ordering': ['week', 'position'],
+                'indexes': [models.Index(fields=['week', 'position'], name='snapshot_week_position_idx')],
+                'constraints': [models.UniqueConstraint(fields=('week', 'club'), name='unique_snapshot_week_club')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0008_standingsnapshot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['match_date', 'id'], name='match_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scoreprediction',
+            index=models.Index(fields=['created_at', 'id'], name='prediction_created_id_idx'),
+        ),
+    ]
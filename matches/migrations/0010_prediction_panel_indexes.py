@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0009_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['week', 'match_date'], name='match_week_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scoreprediction',
+            index=models.Index(fields=['user', 'match'], name='prediction_user_match_idx'),
+        ),
+    ]
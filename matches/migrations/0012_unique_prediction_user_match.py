@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:08
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def remove_duplicate_predictions(apps, schema_editor):
+    # Simpan prediksi terbaru untuk tiap (user, match), sisanya dihapus
+    ScorePrediction = apps.get_model('matches', 'ScorePrediction')
+    latest_ids = ScorePrediction.objects.values('user', 'match').annotate(latest=Max('id')).values('latest')
+    ScorePrediction.objects.exclude(id__in=latest_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0011_prediction_points_leaderboard'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_predictions, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='scoreprediction',
+            name='prediction_user_match_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='scoreprediction',
+            constraint=models.UniqueConstraint(fields=('user', 'match'), name='unique_prediction_user_match'),
+        ),
+    ]
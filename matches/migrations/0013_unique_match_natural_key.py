@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:26
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def merge_duplicate_matches(apps, schema_editor):
+    # extract_club_stats.py lama membuat Match ganda jika dijalankan dua kali.
+    # Simpan yang pertama, pindahkan prediksinya, lalu hapus duplikatnya.
+    Match = apps.get_model('matches', 'Match')
+    ScorePrediction = apps.get_model('matches', 'ScorePrediction')
+    groups = (
+        Match.objects.values('week', 'home_team', 'away_team')
+        .annotate(total=Count('id'), keep=Min('id'))
+        .filter(total__gt=1)
+    )
+    for group in groups:
+        duplicates = Match.objects.filter(
+            week=group['week'], home_team=group['home_team'], away_team=group['away_team'],
+        ).exclude(id=group['keep'])
+        for duplicate in duplicates:
+            predicted = ScorePrediction.objects.filter(match_id=group['keep']).values('user_id')
+            ScorePrediction.objects.filter(match=duplicate, user_id__in=predicted).delete()
+            ScorePrediction.objects.filter(match=duplicate).update(match_id=group['keep'])
+            duplicate.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0012_unique_prediction_user_match'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_matches, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='match',
+            constraint=models.UniqueConstraint(fields=('week', 'home_team', 'away_team'), name='unique_match_week_teams'),
+        ),
+    ]
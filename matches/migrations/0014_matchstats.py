@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0013_unique_match_natural_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchStats',
+            fields=[
+                ('match', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='matches.match')),
+                ('home_yellow_cards', models.PositiveSmallIntegerField(default=0)),
+                ('away_yellow_cards', models.PositiveSmallIntegerField(default=0)),
+                ('home_red_cards', models.PositiveSmallIntegerField(default=0)),
+                ('away_red_cards', models.PositiveSmallIntegerField(default=0)),
+                ('home_shots', models.PositiveSmallIntegerField(default=0)),
+                ('away_shots', models.PositiveSmallIntegerField(default=0)),
+                ('home_shots_on_target', models.PositiveSmallIntegerField(default=0)),
+                ('away_shots_on_target', models.PositiveSmallIntegerField(default=0)),
+                ('home_possession', models.PositiveSmallIntegerField(default=0)),
+                ('away_possession', models.PositiveSmallIntegerField(default=0)),
+                ('home_passes', models.PositiveSmallIntegerField(default=0)),
+                ('away_passes', models.PositiveSmallIntegerField(default=0)),
+                ('home_fouls', models.PositiveSmallIntegerField(default=0)),
+                ('away_fouls', models.PositiveSmallIntegerField(default=0)),
+                ('home_offsides', models.PositiveSmallIntegerField(default=0)),
+                ('away_offsides', models.PositiveSmallIntegerField(default=0)),
+                ('home_corners', models.PositiveSmallIntegerField(default=0)),
+                ('away_corners', models.PositiveSmallIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -12,10 +12,107 @@ class Match(models.Model):
 
      class Meta:
          ordering = ['match_date']
+         constraints = [
+             # natural key untuk upsert import_matches
+             models.UniqueConstraint(fields=['week', 'home_team', 'away_team'], name='unique_match_week_teams'),
+         ]
+         indexes = [
+             # cursor pagination show_matches_api / show_json_match
+             models.Index(fields=['match_date', 'id'], name='match_date_id_idx'),
+             models.Index(fields=['week', 'match_date'], name='match_week_date_idx'),
+             # dipakai engine klasemen untuk mengambil pertandingan satu klub
+             models.Index(fields=['home_team', 'match_date'], name='match_home_team_idx'),
+             models.Index(fields=['away_team', 'match_date'], name='match_away_team_idx'),
+         ]
+
+class MatchStats(models.Model):
+    """Statistik lengkap satu pertandingan dari data/matches.csv (satu baris per match)."""
+    match = models.OneToOneField(Match, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    home_yellow_cards = models.PositiveSmallIntegerField(default=0)
+    away_yellow_cards = models.PositiveSmallIntegerField(default=0)
+    home_red_cards = models.PositiveSmallIntegerField(default=0)
+    away_red_cards = models.PositiveSmallIntegerField(default=0)
+    home_shots = models.PositiveSmallIntegerField(default=0)
+    away_shots = models.PositiveSmallIntegerField(default=0)
+    home_shots_on_target = models.PositiveSmallIntegerField(default=0)
+    away_shots_on_target = models.PositiveSmallIntegerField(default=0)
+    home_possession = models.PositiveSmallIntegerField(default=0)
+    away_possession = models.PositiveSmallIntegerField(default=0)
+    home_passes = models.PositiveSmallIntegerField(default=0)
+    away_passes = models.PositiveSmallIntegerField(default=0)
+    home_fouls = models.PositiveSmallIntegerField(default=0)
+    away_fouls = models.PositiveSmallIntegerField(default=0)
+    home_offsides = models.PositiveSmallIntegerField(default=0)
+    away_offsides = models.PositiveSmallIntegerField(default=0)
+    home_corners = models.PositiveSmallIntegerField(default=0)
+    away_corners = models.PositiveSmallIntegerField(default=0)
 
 class ScorePrediction(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     match = models.ForeignKey(Match, on_delete=models.CASCADE)
     home_score_prediction = models.PositiveIntegerField()
     away_score_prediction = models.PositiveIntegerField()
-    created_at = models.DateTimeField(auto_now_add=True)
\ No newline at end of file
+    created_at = models.DateTimeField(auto_now_add=True)
+    # diisi engine scoring (matches.scoring) setelah hasil match masuk
+    points = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # satu prediksi per user per match; index-nya juga dipakai panel prediksi
+            models.UniqueConstraint(fields=['user', 'match'], name='unique_prediction_user_match'),
+        ]
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='prediction_created_id_idx'),
+        ]
+
+class StandingSnapshot(models.Model):
+    """Posisi klasemen satu klub per akhir pekan (dibangun saat pekan selesai)."""
+    week = models.PositiveIntegerField()
+    club = models.ForeignKey('clubs.Club', on_delete=models.CASCADE, related_name='snapshots')
+    position = models.PositiveIntegerField()
+    # selisih posisi dibanding pekan sebelumnya, positif = naik
+    movement = models.IntegerField(default=0)
+    jumlah_win = models.PositiveIntegerField(default=0)
+    jumlah_draw = models.PositiveIntegerField(default=0)
+    jumlah_lose = models.PositiveIntegerField(default=0)
+    jumlah_gol = models.PositiveIntegerField(default=0)
+    jumlah_kebobolan = models.PositiveIntegerField(default=0)
+    points = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['week', 'position']
+        constraints = [
+            models.UniqueConstraint(fields=['week', 'club'], name='unique_snapshot_week_club'),
+        ]
+        indexes = [
+            models.Index(fields=['week', 'position'], name='snapshot_week_position_idx'),
+        ]
+
+    @property
+    def nama_klub(self):
+        return self.club.nama_klub
+
+    @property
+    def total_matches(self):
+        return self.jumlah_win + self.jumlah_draw + self.jumlah_lose
+
+    @property
+    def selisih_gol(self):
+        return self.jumlah_gol - self.jumlah_kebobolan
+
+
+class LeaderboardEntry(models.Model):
+    """Total poin prediksi per user; week=0 untuk klasemen seluruh musim."""
+    SEASON = 0
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='leaderboard_entries')
+    week = models.PositiveIntegerField(default=SEASON)
+    points = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'week'], name='unique_leaderboard_user_week'),
+        ]
+        indexes = [
+            models.Index(fields=['week', '-points', 'user'], name='leaderboard_rank_idx'),
+        ]
@@ -0,0 +1,93 @@
+"""
+Helper pagination berbasis cursor dan streaming JSON untuk endpoint matches.
+
+Cursor bersifat opaque (base64 dari ``<nilai urut>|<id>``) sehingga halaman
+berikutnya cukup ``WHERE (field, id) > (nilai, id) LIMIT n`` tanpa OFFSET.
+"""
+import base64
+import json
+from itertools import islice
+
+from django.core import serializers
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+STREAM_CHUNK_SIZE = 500
+
+
+def encode_cursor(value, pk):
+    raw = f"{value.isoformat()}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        value, pk = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit('|', 1)
+        value = parse_datetime(value)
+        pk = int(pk)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError('cursor tidak valid')
+    if value is None:
+        raise ValueError('cursor tidak valid')
+    return value, pk
+
+
+def wants_page(request):
+    return 'cursor' in request.GET or 'limit' in request.GET
+
+
+def paginate(queryset, request, field):
+    """
+    Ambil satu halaman ``queryset`` urut (field, id) sesuai ``?cursor=&limit=``.
+    Mengembalikan (rows, next_cursor); ValueError jika parameter tidak valid.
+    """
+    limit = int(request.GET.get('limit', DEFAULT_PAGE_SIZE))
+    if limit < 1:
+        raise ValueError('limit harus lebih dari 0')
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    queryset = queryset.order_by(field, 'id')
+    cursor = request.GET.get('cursor')
+    if cursor:
+        value, pk = decode_cursor(cursor)
+        queryset = queryset.filter(Q(**{f'{field}__gt': value}) | Q(**{field: value, 'id__gt': pk}))
+
+    rows = list(queryset[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(getattr(rows[-1], field), rows[-1].pk)
+    return rows, next_cursor
+
+
+def stream_json_array(items):
+    """StreamingHttpResponse berisi JSON array, ditulis per chunk dari generator ``items``."""
+    items = iter(items)
+
+    def generate():
+        yield '['
+        first = True
+        while True:
+            chunk = list(islice(items, STREAM_CHUNK_SIZE))
+            if not chunk:
+                break
+            body = ','.join(json.dumps(item, cls=DjangoJSONEncoder) for item in chunk)
+            yield body if first else ',' + body
+            first = False
+        yield ']'
+
+    return StreamingHttpResponse(generate(), content_type='application/json')
+
+
+def serialized_objects(queryset):
+    """Sama seperti ``serializers.serialize('json', qs)`` tapi per chunk dari ``.iterator()``."""
+    iterator = queryset.iterator(chunk_size=STREAM_CHUNK_SIZE)
+    while True:
+        chunk = list(islice(iterator, STREAM_CHUNK_SIZE))
+        if not chunk:
+            return
+        yield from serializers.serialize('python', chunk)
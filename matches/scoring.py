@@ -0,0 +1,134 @@
+"""
+Engine scoring prediksi dan leaderboard.
+
+Saat hasil sebuah match masuk/dikoreksi, hanya prediksi untuk match itu yang
+dinilai ulang dalam satu UPDATE massal. Leaderboard (``LeaderboardEntry``)
+lalu disesuaikan dengan selisih poin per user, tanpa memindai ulang semua
+prediksi.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, F, Sum, Value, When
+from django.db.models.functions import Sign
+from django.db.models.lookups import Exact
+from django.utils import timezone
+
+from .models import LeaderboardEntry, ScorePrediction
+
+POINTS_EXACT = 5
+POINTS_OUTCOME = 2
+POINTS_GOAL_DIFFERENCE = 1
+
+
+def _sign(value):
+    return (value > 0) - (value < 0)
+
+
+def is_played(match, now=None):
+    return match.match_date <= (now or timezone.now())
+
+
+def calculate_points(home_prediction, away_prediction, home_score, away_score):
+    """Skor tepat, atau hasil (menang/seri/kalah) benar + bonus selisih gol."""
+    if (home_prediction, away_prediction) == (home_score, away_score):
+        return POINTS_EXACT
+    predicted_diff = home_prediction - away_prediction
+    actual_diff = home_score - away_score
+    if _sign(predicted_diff) != _sign(actual_diff):
+        return 0
+    if predicted_diff == actual_diff:
+        return POINTS_OUTCOME + POINTS_GOAL_DIFFERENCE
+    return POINTS_OUTCOME
+
+
+def points_expression(match):
+    """Versi SQL dari ``calculate_points`` untuk satu match."""
+    predicted_diff = F('home_score_prediction') - F('away_score_prediction')
+    actual_diff = match.home_score - match.away_score
+    return Case(
+        When(home_score_prediction=match.home_score, away_score_prediction=match.away_score, then=Value(POINTS_EXACT)),
+        When(Exact(predicted_diff, actual_diff), then=Value(POINTS_OUTCOME + POINTS_GOAL_DIFFERENCE)),
+        When(Exact(Sign(predicted_diff), _sign(actual_diff)), then=Value(POINTS_OUTCOME)),
+        default=Value(0),
+    )
+
+
+def _points_by_user(predictions):
+    return dict(predictions.values('user').annotate(total=Sum('points')).values_list('user', 'total'))
+
+
+def apply_deltas(deltas, week):
+    """Tambahkan selisih poin per user ke leaderboard musim dan pekan ``week``."""
+    deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    weeks = {LeaderboardEntry.SEASON, week}
+    LeaderboardEntry.objects.bulk_create(
+        [LeaderboardEntry(user_id=user_id, week=w) for user_id in deltas for w in weeks],
+        ignore_conflicts=True,
+    )
+
+    # Satu UPDATE per nilai delta (paling banyak beberapa), bukan per user
+    users_by_delta = defaultdict(list)
+    for user_id, delta in deltas.items():
+        users_by_delta[delta].append(user_id)
+    for delta, user_ids in users_by_delta.items():
+        LeaderboardEntry.objects.filter(user_id__in=user_ids, week__in=weeks).update(points=F('points') + delta)
+
+
+def rescore_match(match, played=None, week=None):
+    """
+    Nilai ulang semua prediksi untuk ``match`` lalu sesuaikan leaderboard.
+    ``played=False`` mengosongkan poin (mis. match dihapus), ``week`` menimpa
+    pekan leaderboard yang disesuaikan.
+    """
+    predictions = ScorePrediction.objects.filter(match=match)
+    if played is None:
+        played = is_played(match)
+
+    with transaction.atomic():
+        before = _points_by_user(predictions)
+        if not before:
+            return
+        predictions.update(points=points_expression(match) if played else 0)
+        after = _points_by_user(predictions)
+        apply_deltas({user_id: after[user_id] - before[user_id] for user_id in before}, match.week if week is None else week)
+
+
+def rescore_prediction(prediction):
+    """Nilai satu prediksi yang baru dibuat/diubah (untuk match yang sudah dimainkan)."""
+    match = prediction.match
+    if not is_played(match):
+        return
+
+    points = calculate_points(
+        int(prediction.home_score_prediction), int(prediction.away_score_prediction),
+        match.home_score, match.away_score,
+    )
+    with transaction.atomic():
+        current = ScorePrediction.objects.filter(pk=prediction.pk).values_list('points', flat=True).first() or 0
+        if points != current:
+            ScorePrediction.objects.filter(pk=prediction.pk).update(points=points)
+            apply_deltas({prediction.user_id: points - current}, match.week)
+    prediction.points = points
+
+
+def ranking(week=LeaderboardEntry.SEASON, limit=10):
+    """Top-N leaderboard; user dengan poin sama mendapat peringkat sama."""
+    entries = LeaderboardEntry.objects.filter(week=week).select_related('user').order_by('-points', 'user_id')[:limit]
+    result = []
+    for index, entry in enumerate(entries):
+        rank = result[-1]['rank'] if result and result[-1]['points'] == entry.points else index + 1
+        result.append({'rank': rank, 'username': entry.user.username, 'points': entry.points})
+    return result
+
+
+def user_rank(user, week=LeaderboardEntry.SEASON):
+    """Peringkat satu user = jumlah user dengan poin lebih tinggi + 1 (range scan di index)."""
+    entry = LeaderboardEntry.objects.filter(user=user, week=week).first()
+    if entry is None:
+        return None
+    higher = LeaderboardEntry.objects.filter(week=week, points__gt=entry.points).count()
+    return {'rank': higher + 1, 'username': user.username, 'points': entry.points}
@@ -0,0 +1,69 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .models import Match, ScorePrediction
+from .scoring import apply_deltas, rescore_match, rescore_prediction
+from .standings import recompute_clubs, refresh_snapshots
+
+
+@receiver(pre_save, sender=Match)
+def remember_previous_state(sender, instance, raw=False, **kwargs):
+    # Jika tim/pekan sebuah match diganti, klub dan pekan lama juga perlu dihitung ulang
+    instance._previous_state = None
+    if instance.pk and not raw:
+        instance._previous_state = Match.objects.filter(pk=instance.pk).values_list(
+            'home_team', 'away_team', 'week', 'home_score', 'away_score', 'match_date'
+        ).first()
+
+
+@receiver(post_save, sender=Match)
+def update_standings_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    teams = [instance.home_team, instance.away_team]
+    week = instance.week
+    previous = getattr(instance, '_previous_state', None)
+    if previous:
+        teams += previous[:2]
+        week = min(week, previous[2])
+    recompute_clubs(teams)
+    refresh_snapshots(from_week=week)
+
+    # Prediksi hanya dinilai ulang jika hasil/jadwal/pekan match berubah
+    if previous is None or previous[2:] != (instance.week, instance.home_score, instance.away_score, instance.match_date):
+        if previous and previous[2] != instance.week:
+            # poin pindah dari leaderboard pekan lama ke pekan baru
+            rescore_match(instance, played=False, week=previous[2])
+        rescore_match(instance)
+
+
+@receiver(pre_delete, sender=Match)
+def reset_prediction_points(sender, instance, **kwargs):
+    # Kurangi poin leaderboard sebelum prediksi ikut terhapus (cascade)
+    rescore_match(instance, played=False)
+
+
+@receiver(post_delete, sender=Match)
+def update_standings_on_delete(sender, instance, **kwargs):
+    recompute_clubs((instance.home_team, instance.away_team))
+    refresh_snapshots(from_week=instance.week)
+
+
+@receiver(post_save, sender=ScorePrediction)
+def score_saved_prediction(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    rescore_prediction(instance)
+
+
+@receiver(pre_delete, sender=ScorePrediction)
+def remove_deleted_prediction(sender, instance, origin=None, **kwargs):
+    # Cascade dari Match/User sudah ditangani (atau leaderboard-nya ikut terhapus)
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is not ScorePrediction:
+        return
+    # Poin di instance bisa basi, ambil nilai terbaru dari database
+    current = ScorePrediction.objects.filter(pk=instance.pk).values_list('points', 'match__week').first()
+    if current and current[0]:
+        apply_deltas({instance.user_id: -current[0]}, current[1])
@@ -0,0 +1,152 @@
+"""
+Engine klasemen.
+
+Kolom W/D/L dan gol di ``Club`` diturunkan dari hasil ``Match``. Saat satu
+pertandingan disimpan, hanya dua klub yang bermain yang dihitung ulang
+(satu agregat per klub atas pertandingan klub itu saja), bukan seluruh musim.
+
+Snapshot per pekan (``StandingSnapshot``) dibangun dari snapshot pekan
+sebelumnya ditambah hasil pekan itu, jadi tidak perlu memutar ulang semua
+pertandingan sejak awal musim. Jika pekan sebelumnya belum selesai (ada laga
+ditunda) snapshot dihitung dari semua laga yang sudah dimainkan.
+
+Snapshot dibangun di sisi tulis: signal save ``Match``, command import, dan
+command ``refresh_snapshots`` yang dijadwalkan untuk pekan yang selesai karena
+waktu berjalan. ``standings_as_of`` hanya membaca.
+"""
+from django.db import transaction
+from django.db.models import Case, Count, F, Q, Subquery, Sum, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from clubs.models import Club
+from .models import Match, StandingSnapshot
+
+SNAPSHOT_STATS = ('jumlah_win', 'jumlah_draw', 'jumlah_lose', 'jumlah_gol', 'jumlah_kebobolan', 'points')
+
+
+def _club_totals(nama_klub, now):
+    home = Q(home_team=nama_klub)
+    away = Q(away_team=nama_klub)
+    return Match.objects.filter(home | away, match_date__lte=now).aggregate(
+        jumlah_win=Count('id', filter=(home & Q(home_score__gt=F('away_score'))) | (away & Q(away_score__gt=F('home_score')))),
+        jumlah_draw=Count('id', filter=Q(home_score=F('away_score'))),
+        jumlah_lose=Count('id', filter=(home & Q(home_score__lt=F('away_score'))) | (away & Q(away_score__lt=F('home_score')))),
+        jumlah_gol=Coalesce(Sum(Case(When(home, then='home_score'), default='away_score')), 0),
+        jumlah_kebobolan=Coalesce(Sum(Case(When(home, then='away_score'), default='home_score')), 0),
+    )
+
+
+def recompute_clubs(club_names):
+    """Hitung ulang baris klasemen untuk klub-klub yang disebutkan saja."""
+    now = timezone.now()
+    for nama_klub in set(club_names):
+        Club.objects.filter(nama_klub=nama_klub).update(**_club_totals(nama_klub, now))
+
+
+def recompute_standings():
+    """Bangun ulang seluruh klasemen, dipakai setelah import massal."""
+    recompute_clubs(Club.objects.values_list('nama_klub', flat=True))
+
+
+def completed_weeks(now=None):
+    """Pekan yang semua pertandingannya sudah dimainkan, urut naik."""
+    now = now or timezone.now()
+    return list(
+        Match.objects.values('week')
+        .annotate(upcoming=Count('id', filter=Q(match_date__gt=now)))
+        .filter(upcoming=0)
+        .order_by('week')
+        .values_list('week', flat=True)
+    )
+
+
+def build_week_snapshot(week):
+    """
+    Snapshot pekan ``week`` = snapshot pekan ``week - 1`` + hasil pekan ini. Jika
+    pekan ``week - 1`` tidak punya snapshot (belum selesai), hitung dari semua laga
+    yang sudah dimainkan sampai pekan ini agar hasil pekan itu tidak hilang.
+    """
+    prev_rows = StandingSnapshot.objects.filter(
+        week=Subquery(StandingSnapshot.objects.filter(week__lt=week).values('week').order_by('-week')[:1])
+    )
+    # Snapshot terakhir sebelumnya tetap dipakai untuk pergerakan posisi
+    prev = {row.club_id: row for row in prev_rows}
+    chained = any(row.week == week - 1 for row in prev.values())
+    clubs = {club.nama_klub: club for club in Club.objects.all()}
+
+    table = {}
+    for club in clubs.values():
+        row = prev.get(club.id) if chained else None
+        table[club.id] = {stat: getattr(row, stat) if row else 0 for stat in SNAPSHOT_STATS}
+
+    if chained:
+        matches = Match.objects.filter(week=week)
+    else:
+        matches = Match.objects.filter(week__lte=week, match_date__lte=timezone.now())
+    for match in matches:
+        home, away = clubs.get(match.home_team), clubs.get(match.away_team)
+        for club, scored, conceded in ((home, match.home_score, match.away_score), (away, match.away_score, match.home_score)):
+            if club is None:
+                continue
+            stats = table[club.id]
+            stats['jumlah_gol'] += scored
+            stats['jumlah_kebobolan'] += conceded
+            if scored > conceded:
+                stats['jumlah_win'] += 1
+                stats['points'] += 3
+            elif scored == conceded:
+                stats['jumlah_draw'] += 1
+                stats['points'] += 1
+            else:
+                stats['jumlah_lose'] += 1
+
+    names = {club.id: club.nama_klub for club in clubs.values()}
+    ranked = sorted(table, key=lambda club_id: (
+        -table[club_id]['points'],
+        -(table[club_id]['jumlah_gol'] - table[club_id]['jumlah_kebobolan']),
+        -table[club_id]['jumlah_gol'],
+        names[club_id],
+    ))
+
+    snapshots = []
+    for position, club_id in enumerate(ranked, start=1):
+        row = prev.get(club_id)
+        snapshots.append(StandingSnapshot(
+            week=week,
+            club_id=club_id,
+            position=position,
+            movement=row.position - position if row else 0,
+            **table[club_id],
+        ))
+
+    with transaction.atomic():
+        StandingSnapshot.objects.filter(week=week).delete()
+        StandingSnapshot.objects.bulk_create(snapshots)
+
+
+def refresh_snapshots(from_week=None):
+    """
+    Bangun ulang snapshot mulai ``from_week``. Snapshot pekan sebelumnya tetap
+    dipakai; pekan setelahnya ikut dibangun ulang karena sifatnya kumulatif.
+    """
+    weeks = completed_weeks()
+    existing = set(StandingSnapshot.objects.values_list('week', flat=True).distinct())
+    # Pekan yang belum punya snapshot (mis. baru selesai) juga perlu dibangun
+    missing = [w for w in weeks if w not in existing]
+    starts = [w for w in (from_week, *missing[:1]) if w is not None]
+    start = min(starts) if starts else None
+    if start is None:
+        return
+
+    # Pekan yang belum selesai (lagi) tidak boleh punya snapshot
+    StandingSnapshot.objects.filter(week__gte=start).exclude(week__in=weeks).delete()
+    for week in weeks:
+        if week >= start:
+            build_week_snapshot(week)
+
+
+def standings_as_of(week):
+    """Klasemen per akhir pekan ``week`` (snapshot terakhir <= week) dalam satu query."""
+    latest_week = StandingSnapshot.objects.filter(week__lte=week).values('week').order_by('-week')[:1]
+    return StandingSnapshot.objects.filter(week=Subquery(latest_week)).select_related('club').order_by('position')
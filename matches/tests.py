@@ -1,8 +1,22 @@
-from django.test import TestCase
+import io
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
 from django.urls import reverse
 from django.utils import timezone
-from .models import Match
+from django.contrib.auth.models import User
+from .models import LeaderboardEntry, Match, MatchStats, ScorePrediction, StandingSnapshot
+from .match_stats import club_season_stats
+from .standings import standings_as_of
+from .scoring import POINTS_EXACT, POINTS_GOAL_DIFFERENCE, POINTS_OUTCOME, calculate_points
 from clubs.models import Club
+from players.models import Player
+from stats import analytics
 from .views import show_matches
 
 class MatchViewTest(TestCase):
@@ -13,8 +27,8 @@ class MatchViewTest(TestCase):
         self.klub_3 = Club.objects.create(nama_klub='klub3', jumlah_win=2)
         self.klub_4 = Club.objects.create(nama_klub='klub4', jumlah_win=0)
         
-        # Membuat data match sebanyak 3 pekan
-        self.match_week1 = Match.objects.create(home_team='klub1', away_team='klub2', week=1, match_date=timezone.now() - timezone.timedelta(days=7))
+        # Membuat data match sebanyak 3 pekan (klasemen dihitung dari hasil match)
+        self.match_week1 = Match.objects.create(home_team='klub1', away_team='klub2', home_score=0, away_score=2, week=1, match_date=timezone.now() - timezone.timedelta(days=7))
         self.match_week2_a = Match.objects.create(home_team='klub3', away_team='klub1', week=2, match_date=timezone.now() - timezone.timedelta(days=3))
         self.match_week2_b = Match.objects.create(home_team='klub4', away_team='klub1', week=2, match_date=timezone.now() - timezone.timedelta(days=3))
         self.match_week3 = Match.objects.create(home_team='klub2', away_team='klub3', week=3, match_date=timezone.now() + timezone.timedelta(days=3))
@@ -73,4 +87,569 @@ class MatchViewTest(TestCase):
                 
         # Menguji apakah filter tetap bekerja
         self.assertEqual(response.context['current_week'], 2)
-        self.assertEqual(response.context['matches'][0].home_team, 'klub3')
\ No newline at end of file
+        self.assertEqual(response.context['matches'][0].home_team, 'klub3')
+
+class StandingsEngineTest(TestCase):
+    def setUp(self):
+        self.arsenal = Club.objects.create(nama_klub='Arsenal')
+        self.chelsea = Club.objects.create(nama_klub='Chelsea')
+        self.spurs = Club.objects.create(nama_klub='Spurs')
+        self.kickoff = timezone.now() - timezone.timedelta(days=1)
+
+    def test_standings_follow_match_results(self):
+        match = Match.objects.create(home_team='Arsenal', away_team='Chelsea', home_score=3, away_score=1, week=1, match_date=self.kickoff)
+
+        self.arsenal.refresh_from_db()
+        self.chelsea.refresh_from_db()
+        self.assertEqual((self.arsenal.jumlah_win, self.arsenal.points, self.arsenal.selisih_gol), (1, 3, 2))
+        self.assertEqual((self.chelsea.jumlah_lose, self.chelsea.jumlah_gol, self.chelsea.jumlah_kebobolan), (1, 1, 3))
+
+        # Koreksi skor menghitung ulang kedua klub
+        match.away_score = 3
+        match.save()
+        self.arsenal.refresh_from_db()
+        self.chelsea.refresh_from_db()
+        self.assertEqual((self.arsenal.jumlah_win, self.arsenal.jumlah_draw, self.arsenal.points), (0, 1, 1))
+        self.assertEqual(self.chelsea.points, 1)
+
+        match.delete()
+        self.arsenal.refresh_from_db()
+        self.assertEqual(self.arsenal.total_matches, 0)
+
+    def test_only_affected_clubs_are_recomputed(self):
+        Club.objects.filter(pk=self.spurs.pk).update(jumlah_win=5)
+        Match.objects.create(home_team='Arsenal', away_team='Chelsea', home_score=1, away_score=0, week=1, match_date=self.kickoff)
+
+        self.spurs.refresh_from_db()
+        self.assertEqual(self.spurs.jumlah_win, 5)
+
+    def test_future_matches_are_ignored(self):
+        Match.objects.create(home_team='Arsenal', away_team='Chelsea', week=2, match_date=timezone.now() + timezone.timedelta(days=3))
+
+        self.arsenal.refresh_from_db()
+        self.assertEqual(self.arsenal.total_matches, 0)
+
+    def test_klasemen_api_breaks_ties_by_goal_difference(self):
+        Match.objects.create(home_team='Arsenal', away_team='Spurs', home_score=1, away_score=0, week=1, match_date=self.kickoff)
+        Match.objects.create(home_team='Chelsea', away_team='Spurs', home_score=4, away_score=0, week=2, match_date=self.kickoff)
+
+        response = self.client.get(reverse('matches:show_klasemen_api'))
+        data = response.json()
+
+        self.assertEqual([c['nama_klub'] for c in data], ['Chelsea', 'Arsenal', 'Spurs'])
+        self.assertEqual(data[0]['selisih_gol'], 4)
+        self.assertEqual(data[0]['poin'], 3)
+
+
+class StandingSnapshotTest(TestCase):
+    def setUp(self):
+        for name in ('Arsenal', 'Chelsea', 'Spurs'):
+            Club.objects.create(nama_klub=name)
+        kickoff = timezone.now() - timezone.timedelta(days=14)
+        Match.objects.create(home_team='Arsenal', away_team='Chelsea', home_score=2, away_score=0, week=1, match_date=kickoff)
+        Match.objects.create(home_team='Spurs', away_team='Chelsea', home_score=0, away_score=3, week=2, match_date=kickoff + timezone.timedelta(days=7))
+        Match.objects.create(home_team='Chelsea', away_team='Arsenal', home_score=1, away_score=0, week=3, match_date=kickoff + timezone.timedelta(days=7))
+
+    def test_snapshot_built_per_completed_week(self):
+        self.assertEqual(sorted(set(StandingSnapshot.objects.values_list('week', flat=True))), [1, 2, 3])
+
+        week1 = {s.club.nama_klub: s for s in StandingSnapshot.objects.filter(week=1)}
+        self.assertEqual(week1['Arsenal'].position, 1)
+        self.assertEqual(week1['Chelsea'].position, 3)
+
+        week3 = {s.club.nama_klub: s for s in StandingSnapshot.objects.filter(week=3)}
+        self.assertEqual(week3['Chelsea'].points, 6)
+        self.assertEqual(week3['Chelsea'].position, 1)
+        self.assertEqual(week3['Chelsea'].movement, 1)
+        self.assertEqual(week3['Arsenal'].movement, -1)
+
+    def test_klasemen_api_as_of_week(self):
+        response = self.client.get(reverse('matches:show_klasemen_api') + '?week=1')
+        data = response.json()
+
+        self.assertEqual(data[0]['nama_klub'], 'Arsenal')
+        self.assertEqual(data[0]['posisi'], 1)
+        self.assertEqual(data[0]['poin'], 3)
+
+    def test_incomplete_week_uses_previous_snapshot(self):
+        Match.objects.create(home_team='Arsenal', away_team='Spurs', week=4, match_date=timezone.now() + timezone.timedelta(days=3))
+
+        response = self.client.get(reverse('matches:show_klasemen_api') + '?week=4')
+        self.assertEqual(response.json()[0]['week'], 3)
+
+    def test_week_finished_by_clock_built_by_command_not_on_read(self):
+        kickoff = timezone.now() + timezone.timedelta(days=3)
+        Match.objects.create(home_team='Arsenal', away_team='Spurs', home_score=1, away_score=0, week=4, match_date=kickoff)
+
+        # pekan 4 selesai karena waktu berjalan, tanpa save Match
+        with mock.patch('django.utils.timezone.now', return_value=kickoff + timezone.timedelta(hours=3)):
+            with self.assertNumQueries(1):
+                self.assertEqual(list(standings_as_of(4))[0].week, 3)
+            response = self.client.get(reverse('matches:show_matches') + '?week=4')
+            self.assertEqual(response.context['standings_week'], 3)
+            self.assertContains(response, 'Per akhir pekan 3')
+
+            call_command('refresh_snapshots', stdout=io.StringIO())
+            response = self.client.get(reverse('matches:show_matches') + '?week=4')
+        self.assertEqual(response.context['standings_week'], 4)
+        self.assertEqual(StandingSnapshot.objects.get(week=4, club__nama_klub='Arsenal').points, 6)
+
+    def test_postponed_match_does_not_drop_previous_week(self):
+        now = timezone.now()
+        # pekan 4: satu laga dimainkan, satu ditunda; pekan 5 selesai
+        Match.objects.create(home_team='Spurs', away_team='Arsenal', home_score=2, away_score=0, week=4, match_date=now - timezone.timedelta(days=2))
+        Match.objects.create(home_team='Chelsea', away_team='Spurs', week=4, match_date=now + timezone.timedelta(days=20))
+        Match.objects.create(home_team='Arsenal', away_team='Chelsea', home_score=1, away_score=1, week=5, match_date=now - timezone.timedelta(days=1))
+
+        self.assertFalse(StandingSnapshot.objects.filter(week=4).exists())
+        week5 = {s.club.nama_klub: s for s in StandingSnapshot.objects.filter(week=5)}
+        # kemenangan Spurs di pekan 4 tetap terhitung
+        self.assertEqual((week5['Spurs'].points, week5['Spurs'].jumlah_gol), (3, 2))
+        self.assertEqual(week5['Arsenal'].points, 4)
+        self.assertEqual(week5['Chelsea'].points, 7)
+
+    def test_result_correction_rebuilds_later_weeks(self):
+        match = Match.objects.get(week=2)
+        match.home_score = 5
+        match.save()
+
+        spurs = StandingSnapshot.objects.get(week=3, club__nama_klub='Spurs')
+        self.assertEqual(spurs.points, 3)
+        self.assertEqual(spurs.jumlah_gol, 5)
+
+
+class MatchApiPaginationTest(TestCase):
+    def setUp(self):
+        kickoff = timezone.now() - timezone.timedelta(days=30)
+        for i in range(5):
+            Match.objects.create(home_team=f'home{i}', away_team=f'away{i}', week=1, match_date=kickoff + timezone.timedelta(days=i))
+
+    def test_stream_returns_full_list(self):
+        response = self.client.get(reverse('matches:show_matches_api'))
+
+        self.assertTrue(response.streaming)
+        data = json.loads(b''.join(response.streaming_content))
+        self.assertEqual([m['home_team'] for m in data], [f'home{i}' for i in range(5)])
+
+    def test_cursor_pagination_walks_all_rows(self):
+        url = reverse('matches:show_matches_api')
+        seen = []
+        response = self.client.get(url, {'limit': 2}).json()
+        while True:
+            seen += [m['home_team'] for m in response['data']]
+            if not response['next_cursor']:
+                break
+            response = self.client.get(url, {'limit': 2, 'cursor': response['next_cursor']}).json()
+
+        self.assertEqual(seen, [f'home{i}' for i in range(5)])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('matches:show_json'), {'cursor': 'bukan-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_json_match_keeps_serializer_format(self):
+        response = self.client.get(reverse('matches:show_json'))
+        data = json.loads(b''.join(response.streaming_content))
+
+        self.assertEqual(len(data), 5)
+        self.assertEqual(data[0]['model'], 'matches.match')
+        self.assertEqual(data[0]['fields']['home_team'], 'home0')
+
+        page = self.client.get(reverse('matches:show_json'), {'limit': 3}).json()
+        self.assertEqual(len(page['data']), 3)
+        self.assertEqual(page['data'][0]['pk'], data[0]['pk'])
+
+
+class PredictionPanelTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='user1', password='password123')
+        self.other = User.objects.create_user(username='user2', password='password123')
+        kickoff = timezone.now() + timezone.timedelta(days=3)
+        self.match_week1 = Match.objects.create(home_team='klub1', away_team='klub2', week=1, match_date=kickoff)
+        self.match_week2 = Match.objects.create(home_team='klub3', away_team='klub4', week=2, match_date=kickoff)
+        ScorePrediction.objects.create(user=self.user, match=self.match_week1, home_score_prediction=1, away_score_prediction=0)
+        ScorePrediction.objects.create(user=self.user, match=self.match_week2, home_score_prediction=2, away_score_prediction=2)
+        ScorePrediction.objects.create(user=self.other, match=self.match_week1, home_score_prediction=0, away_score_prediction=3)
+        self.url = reverse('matches:show_matches')
+
+    def test_anonymous_user_sees_no_predictions(self):
+        response = self.client.get(self.url + '?week=1')
+        self.assertIsNone(response.context['predictions'])
+
+    def test_predictions_scoped_to_user_and_week(self):
+        self.client.login(username='user1', password='password123')
+        response = self.client.get(self.url + '?week=1')
+
+        predictions = list(response.context['predictions'])
+        self.assertEqual(len(predictions), 1)
+        self.assertEqual(predictions[0].user, self.user)
+        self.assertEqual(predictions[0].match, self.match_week1)
+
+    def test_predictions_panel_ajax(self):
+        self.client.login(username='user1', password='password123')
+        response = self.client.get(self.url + '?week=2&panel=predictions', HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+        self.assertTemplateUsed(response, 'predictions_panel.html')
+        self.assertContains(response, 'klub3')
+        self.assertNotContains(response, 'klub1')
+
+    def test_my_predictions_api(self):
+        self.client.login(username='user1', password='password123')
+        response = self.client.get(reverse('matches:show_my_predictions_api'), {'week': 1})
+
+        data = response.json()
+        self.assertEqual(len(data['data']), 1)
+        self.assertEqual(data['data'][0]['home_score_prediction'], 1)
+        self.assertFalse(data['has_next'])
+
+
+class PredictionScoringTest(TestCase):
+    def setUp(self):
+        self.user1 = User.objects.create_user(username='user1', password='password123')
+        self.user2 = User.objects.create_user(username='user2', password='password123')
+        self.user3 = User.objects.create_user(username='user3', password='password123')
+        self.match = Match.objects.create(home_team='klub1', away_team='klub2', week=1, match_date=timezone.now() + timezone.timedelta(days=1))
+        self.exact = ScorePrediction.objects.create(user=self.user1, match=self.match, home_score_prediction=2, away_score_prediction=1)
+        self.goal_diff = ScorePrediction.objects.create(user=self.user2, match=self.match, home_score_prediction=1, away_score_prediction=0)
+        self.wrong = ScorePrediction.objects.create(user=self.user3, match=self.match, home_score_prediction=0, away_score_prediction=0)
+
+    def enter_result(self, home_score, away_score):
+        self.match.home_score = home_score
+        self.match.away_score = away_score
+        self.match.match_date = timezone.now() - timezone.timedelta(hours=2)
+        self.match.save()
+
+    def leaderboard_points(self, user, week=LeaderboardEntry.SEASON):
+        return LeaderboardEntry.objects.filter(user=user, week=week).values_list('points', flat=True).first()
+
+    def test_calculate_points(self):
+        self.assertEqual(calculate_points(2, 1, 2, 1), POINTS_EXACT)
+        self.assertEqual(calculate_points(1, 0, 2, 1), POINTS_OUTCOME + POINTS_GOAL_DIFFERENCE)
+        self.assertEqual(calculate_points(3, 0, 2, 1), POINTS_OUTCOME)
+        self.assertEqual(calculate_points(0, 0, 2, 1), 0)
+
+    def test_result_scores_predictions_and_leaderboard(self):
+        self.assertIsNone(self.leaderboard_points(self.user1))
+
+        self.enter_result(2, 1)
+
+        self.exact.refresh_from_db()
+        self.assertEqual(self.exact.points, POINTS_EXACT)
+        self.assertEqual(self.leaderboard_points(self.user1), POINTS_EXACT)
+        self.assertEqual(self.leaderboard_points(self.user1, week=1), POINTS_EXACT)
+        self.assertEqual(self.leaderboard_points(self.user2), POINTS_OUTCOME + POINTS_GOAL_DIFFERENCE)
+        self.assertIsNone(self.leaderboard_points(self.user3))
+
+    def test_corrected_result_applies_deltas(self):
+        self.enter_result(2, 1)
+        self.enter_result(0, 0)
+
+        self.assertEqual(self.leaderboard_points(self.user1), 0)
+        self.assertEqual(self.leaderboard_points(self.user3), POINTS_EXACT)
+
+    def test_deleting_prediction_or_match_updates_leaderboard(self):
+        self.enter_result(2, 1)
+
+        self.exact.delete()
+        self.assertEqual(self.leaderboard_points(self.user1), 0)
+
+        self.match.delete()
+        self.assertEqual(self.leaderboard_points(self.user2), 0)
+
+    def test_leaderboard_api(self):
+        self.enter_result(1, 0)
+        self.client.login(username='user1', password='password123')
+
+        data = self.client.get(reverse('matches:show_leaderboard_api')).json()
+
+        self.assertEqual([row['username'] for row in data['data']], ['user2', 'user1'])
+        self.assertEqual(data['data'][0]['points'], POINTS_EXACT)
+        self.assertEqual(data['me']['rank'], 2)
+        self.assertEqual(data['me']['points'], POINTS_OUTCOME + POINTS_GOAL_DIFFERENCE)
+
+
+class PredictionUpsertTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='user1', password='password123')
+        kickoff = timezone.now() + timezone.timedelta(days=2)
+        self.match1 = Match.objects.create(home_team='klub1', away_team='klub2', week=5, match_date=kickoff)
+        self.match2 = Match.objects.create(home_team='klub3', away_team='klub4', week=5, match_date=kickoff)
+        self.other_week = Match.objects.create(home_team='klub1', away_team='klub3', week=6, match_date=kickoff)
+        self.client.login(username='user1', password='password123')
+
+    def post_bulk(self, payload):
+        return self.client.post(reverse('matches:bulk_prediction_api'), data=json.dumps(payload), content_type='application/json')
+
+    def test_duplicate_prediction_returns_conflict(self):
+        url = reverse('matches:add_prediction_ajax')
+        data = {'match_id': self.match1.id, 'home_score_prediction': 1, 'away_score_prediction': 0}
+
+        self.assertEqual(self.client.post(url, data).status_code, 200)
+        self.assertEqual(self.client.post(url, data).status_code, 409)
+        self.assertEqual(ScorePrediction.objects.filter(user=self.user, match=self.match1).count(), 1)
+
+    def test_invalid_score_rejected(self):
+        response = self.client.post(reverse('matches:add_prediction_ajax'), {
+            'match_id': self.match1.id, 'home_score_prediction': 'dua', 'away_score_prediction': 0,
+        })
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_upsert_creates_and_updates(self):
+        ScorePrediction.objects.create(user=self.user, match=self.match1, home_score_prediction=0, away_score_prediction=0)
+
+        response = self.post_bulk({'week': 5, 'predictions': [
+            {'match_id': self.match1.id, 'home_score_prediction': 2, 'away_score_prediction': 1},
+            {'match_id': self.match2.id, 'home_score_prediction': 1, 'away_score_prediction': 1},
+        ]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ScorePrediction.objects.filter(user=self.user).count(), 2)
+        updated = ScorePrediction.objects.get(user=self.user, match=self.match1)
+        self.assertEqual((updated.home_score_prediction, updated.away_score_prediction), (2, 1))
+
+    def test_bulk_rejects_match_from_other_week(self):
+        response = self.post_bulk({'week': 5, 'predictions': [
+            {'match_id': self.other_week.id, 'home_score_prediction': 2, 'away_score_prediction': 1},
+        ]})
+
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(ScorePrediction.objects.exists())
+
+    def test_bulk_rejects_boolean_values(self):
+        """JSON true bukan id match atau skor, walau bool turunan int di Python"""
+        for item in (
+            {'match_id': True, 'home_score_prediction': 2, 'away_score_prediction': 1},
+            {'match_id': self.match1.id, 'home_score_prediction': True, 'away_score_prediction': 1},
+        ):
+            response = self.post_bulk({'week': 5, 'predictions': [item]})
+            self.assertEqual(response.status_code, 400)
+        self.assertFalse(ScorePrediction.objects.exists())
+
+    def test_bulk_rejects_repeated_match(self):
+        item = {'match_id': self.match1.id, 'home_score_prediction': 2, 'away_score_prediction': 1}
+        response = self.post_bulk({'week': 5, 'predictions': [item, item]})
+
+        self.assertEqual(response.status_code, 409)
+
+    def test_bulk_requires_csrf_token(self):
+        client = Client(enforce_csrf_checks=True)
+        client.login(username='user1', password='password123')
+        response = client.post(reverse('matches:bulk_prediction_api'), content_type='application/json', data=json.dumps(
+            {'week': 5, 'predictions': [{'match_id': self.match1.id, 'home_score_prediction': 1, 'away_score_prediction': 0}]}
+        ))
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(ScorePrediction.objects.exists())
+
+    def started_match(self):
+        return Match.objects.create(home_team='klub2', away_team='klub4', week=5, home_score=2, away_score=1,
+                                    match_date=timezone.now() - timezone.timedelta(hours=1))
+
+    def test_add_rejected_after_kickoff(self):
+        started = self.started_match()
+        response = self.client.post(reverse('matches:add_prediction_ajax'), {
+            'match_id': started.id, 'home_score_prediction': 2, 'away_score_prediction': 1,
+        })
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(ScorePrediction.objects.exists())
+
+    def test_update_rejected_after_kickoff(self):
+        prediction = ScorePrediction.objects.create(user=self.user, match=self.match1, home_score_prediction=0, away_score_prediction=0)
+        Match.objects.filter(pk=self.match1.pk).update(match_date=timezone.now() - timezone.timedelta(hours=1))
+        response = self.client.post(reverse('matches:update_prediction_ajax', args=[prediction.id]), {
+            'home_score_prediction': 2, 'away_score_prediction': 1,
+        })
+        self.assertEqual(response.status_code, 409)
+        prediction.refresh_from_db()
+        self.assertEqual((prediction.home_score_prediction, prediction.away_score_prediction), (0, 0))
+
+    def test_bulk_rejected_if_any_match_started(self):
+        started = self.started_match()
+        response = self.post_bulk({'week': 5, 'predictions': [
+            {'match_id': self.match1.id, 'home_score_prediction': 1, 'away_score_prediction': 0},
+            {'match_id': started.id, 'home_score_prediction': 2, 'away_score_prediction': 1},
+        ]})
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(ScorePrediction.objects.exists())
+
+
+class ImportMatchesCommandTest(TestCase):
+    HEADER = 'Week,Date,Home_Team,Away_Team,Home_Team_Score,Away_Team_Score\n'
+
+    def setUp(self):
+        self.arsenal = Club.objects.create(nama_klub='Arsenal')
+        self.chelsea = Club.objects.create(nama_klub='Chelsea')
+        self.user = User.objects.create_user(username='penebak', password='password123')
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, True)
+        self.csv_path = os.path.join(self.tmp_dir, 'matches.csv')
+
+    def write_csv(self, rows):
+        with open(self.csv_path, 'w', encoding='utf-8') as f:
+            f.write(self.HEADER + rows)
+
+    def run_import(self):
+        out = io.StringIO()
+        call_command('import_matches', self.csv_path, stdout=out)
+        return out.getvalue()
+
+    def test_rerun_upserts_instead_of_duplicating(self):
+        self.write_csv('1,01-08-2025,Arsenal,Chelsea,2,0\n2,08-08-2025,Chelsea,Arsenal,1,1\n')
+        self.assertIn('2 dibuat, 0 diperbarui, 0 tidak berubah', self.run_import())
+        self.assertIn('0 dibuat, 0 diperbarui, 2 tidak berubah', self.run_import())
+        self.assertEqual(Match.objects.count(), 2)
+
+        # bulk_create tidak memicu signal, klasemen dihitung ulang di akhir import
+        self.arsenal.refresh_from_db()
+        self.assertEqual((self.arsenal.jumlah_win, self.arsenal.jumlah_draw, self.arsenal.points), (1, 1, 4))
+        self.assertEqual(StandingSnapshot.objects.filter(week=2).count(), 2)
+
+    def test_corrected_score_rescores_predictions(self):
+        self.write_csv('1,01-08-2025,Arsenal,Chelsea,2,0\n')
+        self.run_import()
+        match = Match.objects.get()
+        ScorePrediction.objects.create(user=self.user, match=match, home_score_prediction=1, away_score_prediction=1)
+        self.assertEqual(ScorePrediction.objects.get().points, 0)
+
+        self.write_csv('1,01-08-2025,Arsenal,Chelsea,1,1\n')
+        self.assertIn('0 dibuat, 1 diperbarui', self.run_import())
+        self.assertEqual(Match.objects.get().pk, match.pk)
+        self.assertEqual(ScorePrediction.objects.get().points, POINTS_EXACT)
+        self.chelsea.refresh_from_db()
+        self.assertEqual(self.chelsea.jumlah_draw, 1)
+
+
+class MatchStatsImportTest(TestCase):
+    HEADER = (
+        'Week,Date,Home_Team,Away_Team,Home_Team_Score,Away_Team_Score,'
+        'Home_Team_Yellowcard,Away_Team_Yellowcard,Home_Team_Redcard,Away_Team_Redcard,'
+        'Home_Team_Shots,Away_Team_Shots,Home_Team_ShotsonTarget,Away_Team_ShotsonTarget,'
+        'Home_Team_Possession,Away_Team_Possession,Home_Team_Passes,Away_Team_Passes,'
+        'Home_Team_Fouls,Away_Team_Fouls,Home_Team_Offside,Away_Team_Offside,'
+        'Home_Team_Corner,Away_Team_Corner,League\n'
+    )
+
+    def setUp(self):
+        Club.objects.create(nama_klub='Arsenal')
+        Club.objects.create(nama_klub='Chelsea')
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, True)
+        self.csv_path = os.path.join(self.tmp_dir, 'matches.csv')
+
+    def run_import(self, rows):
+        with open(self.csv_path, 'w', encoding='utf-8') as f:
+            f.write(self.HEADER + rows)
+        call_command('import_matches', self.csv_path, stdout=io.StringIO())
+
+    def test_import_stores_stats_and_updates_them(self):
+        self.run_import(
+            '1,01-08-2025,Arsenal,Chelsea,2,0,1,3,0,1,10,4,5,1,60,40,500,300,8,12,2,1,6,2,Premier League\n'
+            '2,08-08-2025,Chelsea,Arsenal,1,1,2,0,0,0,8,10,4,5,45,55,400,450,10,9,1,3,4,5,Premier League\n'
+        )
+        self.assertEqual(MatchStats.objects.count(), 2)
+        stats = Match.objects.get(week=1).stats
+        self.assertEqual((stats.home_shots, stats.away_red_cards, stats.home_possession), (10, 1, 60))
+
+        # Skor sama, statistik dikoreksi: tetap di-upsert tanpa baris ganda
+        self.run_import('1,01-08-2025,Arsenal,Chelsea,2,0,1,3,0,1,11,4,5,1,60,40,500,300,8,12,2,1,6,2,Premier League\n')
+        self.assertEqual(MatchStats.objects.count(), 2)
+        self.assertEqual(Match.objects.get(week=1).stats.home_shots, 11)
+
+    def test_club_season_aggregates(self):
+        self.run_import(
+            '1,01-08-2025,Arsenal,Chelsea,2,0,1,3,0,1,10,4,5,1,60,40,500,300,8,12,2,1,6,2,Premier League\n'
+            '2,08-08-2025,Chelsea,Arsenal,1,1,2,0,0,0,8,10,4,5,45,55,400,450,10,9,1,3,4,5,Premier League\n'
+        )
+        arsenal = club_season_stats(club='Arsenal')
+        self.assertEqual(len(arsenal), 1)
+        arsenal = arsenal[0]
+        self.assertEqual((arsenal['matches'], arsenal['goals'], arsenal['conceded']), (2, 3, 1))
+        self.assertEqual(arsenal['avg_possession'], 57.5)
+        self.assertEqual(arsenal['shot_accuracy'], 0.5)
+        self.assertEqual(arsenal['corners_per_match'], 5.5)
+
+        chelsea = club_season_stats(week=1)[1]
+        self.assertEqual((chelsea['club'], chelsea['matches'], chelsea['red_cards']), ('Chelsea', 1, 1))
+
+        response = self.client.get(reverse('stats:club_match_stats_api'), {'week': 'x'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(reverse('stats:club_match_stats_api'), {'club': 'Chelsea'})
+        self.assertEqual(response.json()['clubs'][0]['cards_per_match'], 3.0)
+
+
+class ClubAnalyticsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.arsenal = Club.objects.create(nama_klub='Arsenal')
+        self.chelsea = Club.objects.create(nama_klub='Chelsea')
+        Player.objects.create(name='Saka', position='FW', team=self.arsenal, citizenship='England', curr_goals=4, curr_assists=2)
+        start = timezone.now() - timezone.timedelta(days=30)
+        for week, (home, away, home_score, away_score) in enumerate([
+            ('Arsenal', 'Chelsea', 2, 0),
+            ('Chelsea', 'Arsenal', 1, 1),
+            ('Arsenal', 'Chelsea', 0, 1),
+        ], start=1):
+            Match.objects.create(week=week, match_date=start + timezone.timedelta(days=week),
+                                 home_team=home, away_team=away, home_score=home_score, away_score=away_score)
+        match = Match.objects.get(week=1)
+        MatchStats.objects.create(match=match, home_shots=8, away_shots=5, home_shots_on_target=4, away_shots_on_target=1)
+
+    def test_derived_metrics(self):
+        arsenal = {row['club']: row for row in analytics.club_analytics()}['Arsenal']
+        self.assertEqual((arsenal['played'], arsenal['points'], arsenal['form'], arsenal['form_points']), (3, 4, 'WDL', 4))
+        self.assertEqual(arsenal['home'], {'played': 2, 'points': 3, 'goals_for': 2, 'goals_against': 1})
+        self.assertEqual(arsenal['away']['points'], 1)
+        # konversi hanya dari laga yang punya statistik tembakan
+        self.assertEqual((arsenal['shot_conversion'], arsenal['shot_accuracy']), (0.25, 0.5))
+        self.assertEqual((arsenal['points_per_match'], arsenal['projected_points']), (1.33, 3))
+        self.assertEqual((arsenal['total_goals'], arsenal['total_assists']), (4, 2))
+
+    def test_cache_invalidated_when_match_changes(self):
+        analytics.club_analytics()
+        with self.assertNumQueries(0):
+            analytics.club_analytics()
+
+        match = Match.objects.get(week=3)
+        match.home_score = 3
+        match.save()
+        arsenal = {row['club']: row for row in analytics.club_analytics()}['Arsenal']
+        self.assertEqual(arsenal['form'], 'WDW')
+
+        response = self.client.get(reverse('stats:statistics_api'))
+        self.assertEqual(response.json()['club']['top_scorer'][0]['total_goals'], 4)
+
+    def test_cache_expires_at_next_kickoff(self):
+        now = timezone.now()
+        self.assertEqual(analytics.cache_timeout(now), analytics.MAX_TIMEOUT)
+        Match.objects.create(week=4, match_date=now + timezone.timedelta(minutes=30),
+                             home_team='Chelsea', away_team='Arsenal', home_score=0, away_score=0)
+        self.assertEqual(analytics.cache_timeout(now), 30 * 60)
+        response = self.client.get(reverse('stats:club_analytics_api'))
+        self.assertEqual(response.json()['clubs'][0]['club'], 'Arsenal')
+
+
+class StatisticsApiCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.arsenal = Club.objects.create(nama_klub='Arsenal')
+        self.saka = Player.objects.create(name='Saka', position='FW', team=self.arsenal, citizenship='England', curr_goals=4)
+        self.url = reverse('stats:statistics_api')
+
+    def test_payload_cached_with_etag(self):
+        response = self.client.get(self.url)
+        etag = response['ETag']
+        self.assertEqual(response.json()['player']['top_scorer'][0]['name'], 'Saka')
+        self.assertEqual(response.json()['club']['top_scorer'][0]['total_goals'], 4)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # Simpan pemain -> payload dan ETag baru
+        self.saka.curr_goals = 5
+        self.saka.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['player']['top_scorer'][0]['goals'], 5)
@@ -6,10 +6,13 @@ app_name = 'matches'
 urlpatterns = [
     path('', show_matches, name='show_matches'),
     path('add-prediction-ajax/', add_prediction_ajax, name='add_prediction_ajax'),
+    path('bulk-prediction-api/', bulk_prediction_api, name='bulk_prediction_api'),
     path('update-prediction-ajax/<int:prediction_id>/', update_prediction_ajax, name='update_prediction_ajax'),
     path('delete-prediction-ajax/<int:prediction_id>/', delete_prediction_ajax, name='delete_prediction_ajax'),
     path('show-klasemen-api/', show_klasemen_api, name='show_klasemen_api' ),
     path('show-matches-api/', show_matches_api, name='show_matches_api'),
     path('json-match/', show_json_match, name='show_json'),
+    path('my-predictions-api/', show_my_predictions_api, name='show_my_predictions_api'),
+    path('leaderboard-api/', show_leaderboard_api, name='show_leaderboard_api'),
     path('json-prediction/', show_json_prediction, name='show_json_prediction'),
 ]
\ No newline at end of file
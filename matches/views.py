@@ -3,13 +3,19 @@ from django.db.models import Max, Min
 from django.utils import timezone
 from django.http import JsonResponse, HttpResponse
 from django.core import serializers
-from .models import Match, ScorePrediction
+from django.core.paginator import Paginator
+from django.db import IntegrityError, transaction
+from .models import LeaderboardEntry, Match, ScorePrediction
+from .standings import standings_as_of
+from .scoring import is_played, ranking, user_rank
+from .pagination import STREAM_CHUNK_SIZE, paginate, serialized_objects, stream_json_array, wants_page
 from clubs.models import Club
-from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST, require_http_methods
 from django.contrib.auth.decorators import login_required
 import json
 
+PREDICTIONS_PER_PAGE = 9
+
 def show_matches(request):
     week_stats = Match.objects.aggregate(Min('week'), Max('week'))
     min_week = week_stats['week__min'] or 1
@@ -30,16 +36,14 @@ def show_matches(request):
         
     matches_in_week = Match.objects.filter(week=current_week).order_by('match_date')
 
-    clubs = []
     request_ajax = request.headers.get('x-requested-with') == 'XMLHttpRequest'
     
-    all_predictions = ScorePrediction.objects.all().select_related('match', 'user').order_by('-created_at')
-    
-    clubs = sorted(
-        Club.objects.all(), 
-        key=lambda x: x.points, 
-        reverse=True
-    )
+    # Panel prediksi di-refresh terpisah saat user ganti pekan
+    if request_ajax and request.GET.get('panel') == 'predictions':
+        return render(request, 'predictions_panel.html', {
+            'current_week': current_week,
+            'predictions': get_user_predictions(request, current_week),
+        })
     
     context = {
         'current_week': current_week,
@@ -51,51 +55,144 @@ def show_matches(request):
         'week_range': week_range, 
         
         'matches': matches_in_week,
-        'clubs': clubs,
-        'predictions': all_predictions,
     }
     
     if request_ajax:
         return render(request, 'show_matches_ajax.html', context)
-    else:
-        return render(request, 'show_matches.html', context)
+    
+    # Klasemen per akhir pekan selesai terakhir (<= pekan yang dipilih), dengan label pekannya;
+    # sebelum ada pekan yang selesai pakai klasemen sementara
+    snapshot = list(standings_as_of(current_week))
+    context['standings_week'] = snapshot[0].week if snapshot else None
+    context['clubs'] = snapshot or Club.objects.standings()
+    context['predictions'] = get_user_predictions(request, current_week)
+    return render(request, 'show_matches.html', context)
+
+def get_user_predictions(request, week):
+    """Prediksi milik user yang login untuk satu pekan, dipaginasi lewat ?page=."""
+    if not request.user.is_authenticated:
+        return None
+    
+    predictions = ScorePrediction.objects.filter(
+        user=request.user, match__week=week
+    ).select_related('match', 'user').order_by('match__match_date', 'id')
+    return Paginator(predictions, PREDICTIONS_PER_PAGE).get_page(request.GET.get('page'))
+
+def parse_score(value):
+    """Skor prediksi harus bilangan bulat >= 0, selain itu None."""
+    if isinstance(value, bool):
+        return None
+    try:
+        score = int(value)
+    except (TypeError, ValueError):
+        return None
+    return score if score >= 0 else None
+
+KICKOFF_MESSAGE = 'Pertandingan sudah dimulai, prediksi sudah ditutup!'
 
 @login_required
 @require_POST
 def add_prediction_ajax(request):
     match_id = request.POST.get('match_id')
-    home_score = request.POST.get('home_score_prediction')
-    away_score = request.POST.get('away_score_prediction')
+    home_score = parse_score(request.POST.get('home_score_prediction'))
+    away_score = parse_score(request.POST.get('away_score_prediction'))
+    
+    if home_score is None or away_score is None:
+        return JsonResponse({'message': 'Skor prediksi tidak valid!'}, status=400)
     
     try:
         match = Match.objects.get(id=match_id)
-    except Match.DoesNotExist:
+    except (Match.DoesNotExist, ValueError):
         return JsonResponse({'message': 'Pertandingan tidak ditemukan!'}, status=404)
+    if is_played(match):
+        return JsonResponse({'message': KICKOFF_MESSAGE}, status=409)
     
-    # Cek apakah user sudah pernah prediksi match ini
-    if ScorePrediction.objects.filter(user=request.user, match=match).exists():
-        return JsonResponse({'message': 'Kamu sudah membuat prediksi untuk pertandingan ini!'}, status=400)
-    
-    prediction = ScorePrediction.objects.create(
-        user=request.user,
-        match=match,
-        home_score_prediction=home_score,
-        away_score_prediction=away_score,
-    )
+    # Unique constraint (user, match) yang menjaga duplikat, tanpa cek exists() terpisah
+    try:
+        with transaction.atomic():
+            ScorePrediction.objects.create(
+                user=request.user,
+                match=match,
+                home_score_prediction=home_score,
+                away_score_prediction=away_score,
+            )
+    except IntegrityError:
+        return JsonResponse({'message': 'Kamu sudah membuat prediksi untuk pertandingan ini!'}, status=409)
     
     return JsonResponse({'message': 'Prediksi skor berhasil disimpan!'})
 
+@login_required
+@require_POST
+def bulk_prediction_api(request):
+    """
+    Simpan/ubah prediksi satu pekan sekaligus dalam satu INSERT ... ON CONFLICT.
+    Autentikasi lewat cookie sesi, jadi wajib header X-CSRFToken.
+    Body: {"week": 5, "predictions": [{"match_id", "home_score_prediction", "away_score_prediction"}, ...]}
+    """
+    try:
+        body = json.loads(request.body)
+        week = int(body['week'])
+        items = body['predictions']
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({'message': 'Format data tidak valid!'}, status=400)
+    
+    if not isinstance(items, list) or not items:
+        return JsonResponse({'message': 'Daftar prediksi kosong!'}, status=400)
+    
+    scores = {}
+    for item in items:
+        if not isinstance(item, dict):
+            return JsonResponse({'message': 'Format data tidak valid!'}, status=400)
+        home_score = parse_score(item.get('home_score_prediction'))
+        away_score = parse_score(item.get('away_score_prediction'))
+        match_id = item.get('match_id')
+        if home_score is None or away_score is None or type(match_id) is not int:
+            return JsonResponse({'message': 'Skor prediksi tidak valid!'}, status=400)
+        if match_id in scores:
+            return JsonResponse({'message': f'Match {match_id} dikirim lebih dari sekali!'}, status=409)
+        scores[match_id] = (home_score, away_score)
+    
+    matches = {match.id: match for match in Match.objects.filter(id__in=scores, week=week)}
+    missing = sorted(set(scores) - set(matches))
+    if missing:
+        return JsonResponse({'message': f'Pertandingan {missing} tidak ada di pekan ke-{week}!'}, status=404)
+    started = sorted(match_id for match_id, match in matches.items() if is_played(match))
+    if started:
+        return JsonResponse({'message': f'Pertandingan {started} sudah dimulai, prediksi sudah ditutup!'}, status=409)
+    
+    with transaction.atomic():
+        ScorePrediction.objects.bulk_create(
+            [ScorePrediction(
+                user=request.user,
+                match_id=match_id,
+                home_score_prediction=home_score,
+                away_score_prediction=away_score,
+            ) for match_id, (home_score, away_score) in scores.items()],
+            update_conflicts=True,
+            unique_fields=['user', 'match'],
+            update_fields=['home_score_prediction', 'away_score_prediction'],
+        )
+    
+    return JsonResponse({'message': f'{len(scores)} prediksi berhasil disimpan!', 'count': len(scores)})
+
 @login_required
 @require_POST
 def update_prediction_ajax(request, prediction_id):
     try:
-        prediction = ScorePrediction.objects.get(id=prediction_id, user=request.user)
+        prediction = ScorePrediction.objects.select_related('match').get(id=prediction_id, user=request.user)
     except ScorePrediction.DoesNotExist:
         return JsonResponse({'message': 'Prediksi tidak ditemukan!'}, status=404)
+    if is_played(prediction.match):
+        return JsonResponse({'message': KICKOFF_MESSAGE}, status=409)
+    
+    home_score = parse_score(request.POST.get('home_score_prediction'))
+    away_score = parse_score(request.POST.get('away_score_prediction'))
+    if home_score is None or away_score is None:
+        return JsonResponse({'message': 'Skor prediksi tidak valid!'}, status=400)
     
-    prediction.home_score_prediction = request.POST.get('home_score_prediction')
-    prediction.away_score_prediction = request.POST.get('away_score_prediction')
-    prediction.save()
+    prediction.home_score_prediction = home_score
+    prediction.away_score_prediction = away_score
+    prediction.save(update_fields=['home_score_prediction', 'away_score_prediction'])
     
     return JsonResponse({'message': 'Prediksi berhasil diupdate!'})
 
@@ -110,54 +207,119 @@ def delete_prediction_ajax(request, prediction_id):
     prediction.delete()
     return JsonResponse({'message': 'Prediksi berhasil dihapus!'})
 
-def show_matches_api(request):
-    matches = Match.objects.all().order_by('match_date')
-    data = []
-    for match in matches:
-        match_date = match.match_date
-        home_team = match.home_team
-        home_score = match.home_score
-        away_team = match.away_team
-        away_score = match.away_score
-        week = match.week
-        data.append({
-             'match_date': match_date,
-             'home_team': home_team,
-             'home_score': home_score,
-             'away_team': away_team,
-             'away_score': away_score,
-             'week': week,
-         })
+@login_required
+def show_my_predictions_api(request):
+    try:
+        week = int(request.GET.get('week', ''))
+    except ValueError:
+        return JsonResponse({'message': 'Parameter week wajib diisi!'}, status=400)
+    
+    page = get_user_predictions(request, week)
+    data = [{
+        'id': prediction.id,
+        'match_id': prediction.match.id,
+        'home_team': prediction.match.home_team,
+        'away_team': prediction.match.away_team,
+        'match_date': prediction.match.match_date,
+        'home_score_prediction': prediction.home_score_prediction,
+        'away_score_prediction': prediction.away_score_prediction,
+    } for prediction in page]
+    
+    return JsonResponse({
+        'data': data,
+        'page': page.number,
+        'num_pages': page.paginator.num_pages,
+        'has_next': page.has_next(),
+    }, status=200)
 
-    return JsonResponse(data, status=200, safe=False)
+def show_leaderboard_api(request):
+    try:
+        week = int(request.GET.get('week', LeaderboardEntry.SEASON))
+        limit = min(max(int(request.GET.get('limit', 10)), 1), 100)
+    except ValueError:
+        return JsonResponse({'message': 'Parameter week/limit tidak valid!'}, status=400)
+    
+    return JsonResponse({
+        'week': week,
+        'data': ranking(week, limit),
+        'me': user_rank(request.user, week) if request.user.is_authenticated else None,
+    }, status=200)
+
+def serialize_match(match):
+    return {
+        'match_date': match.match_date,
+        'home_team': match.home_team,
+        'home_score': match.home_score,
+        'away_team': match.away_team,
+        'away_score': match.away_score,
+        'week': match.week,
+    }
+
+def show_matches_api(request):
+    matches = Match.objects.all()
+    
+    # ?cursor=&limit= -> satu halaman, selain itu seluruh musim di-stream
+    if wants_page(request):
+        try:
+            rows, next_cursor = paginate(matches, request, 'match_date')
+        except ValueError:
+            return JsonResponse({'message': 'Parameter cursor/limit tidak valid!'}, status=400)
+        return JsonResponse({
+            'data': [serialize_match(match) for match in rows],
+            'next_cursor': next_cursor,
+        }, status=200)
+    
+    matches = matches.order_by('match_date', 'id').iterator(chunk_size=STREAM_CHUNK_SIZE)
+    return stream_json_array(serialize_match(match) for match in matches)
 
 def show_klasemen_api(request):
-    clubs = []
-    clubs = sorted(
-        Club.objects.all(), 
-        key=lambda x: x.points, 
-        reverse=True
-    )
+    week_param = request.GET.get('week')
+    
+    if week_param:
+        try:
+            week = int(week_param)
+        except ValueError:
+            return JsonResponse({'message': 'Parameter week tidak valid!'}, status=400)
+        clubs = standings_as_of(week)
+    else:
+        clubs = Club.objects.standings()
     
     data = []
     
     for club in clubs:
-        data.append({
+        row = {
             'nama_klub': club.nama_klub,
             'jumlah_win': club.jumlah_win,
             'jumlah_draw': club.jumlah_draw,
             'jumlah_lose': club.jumlah_lose,
+            'jumlah_gol': club.jumlah_gol,
+            'jumlah_kebobolan': club.jumlah_kebobolan,
+            'selisih_gol': club.selisih_gol,
             'poin': club.points
-        })
+        }
+        if week_param:
+            row['week'] = club.week
+            row['posisi'] = club.position
+            row['pergerakan'] = club.movement
+        data.append(row)
     
     return JsonResponse(data, status=200, safe=False)
 
+def show_json_serialized(request, queryset, field):
+    if wants_page(request):
+        try:
+            rows, next_cursor = paginate(queryset, request, field)
+        except ValueError:
+            return JsonResponse({'message': 'Parameter cursor/limit tidak valid!'}, status=400)
+        return JsonResponse({
+            'data': serializers.serialize('python', rows),
+            'next_cursor': next_cursor,
+        }, status=200)
+    
+    return stream_json_array(serialized_objects(queryset.order_by(field, 'id')))
+
 def show_json_match(request):
-    matches = Match.objects.all()
-    json_data = serializers.serialize("json", matches)
-    return HttpResponse(json_data, content_type="application/json")
+    return show_json_serialized(request, Match.objects.all(), 'match_date')
 
 def show_json_prediction(request):
-    prediction = ScorePrediction.objects.all()
-    json_data = serializers.serialize("json", prediction)
-    return HttpResponse(json_data, content_type="application/json")
\ No newline at end of file
+    return show_json_serialized(request, ScorePrediction.objects.all(), 'created_at')
@@ -10,6 +10,7 @@ class NewsAdmin(admin.ModelAdmin):
         'news_views',
         'is_featured',
         'is_news_hot',
+        'trending_score',
         'created_at',
     )
     list_filter = ('category', 'is_featured', 'created_at')
@@ -24,6 +25,7 @@ class NewsAdmin(admin.ModelAdmin):
         'is_featured',
         'created_at',
         'is_news_hot',
+        'trending_score',
     )
     ordering = ('-created_at',)
 
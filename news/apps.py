@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class NewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'news'
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+
+        from . import signals
+        post_migrate.connect(signals.fill_search_index, sender=self)
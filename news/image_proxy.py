@@ -0,0 +1,417 @@
+"""
+Cache disk untuk proxy gambar thumbnail berita.
+
+Gambar dari origin diunduh secara streaming lewat ``requests.Session`` bersama
+(koneksi di-pool), dibatasi ``IMAGE_PROXY_MAX_IMAGE_BYTES``, lalu disimpan di
+``IMAGE_PROXY_CACHE_DIR`` sebagai ``<key>.body`` + ``<key>.json`` (metadata).
+Entry yang lebih tua dari ``IMAGE_PROXY_TTL`` divalidasi ulang ke origin dengan
+If-None-Match/If-Modified-Since. Total ukuran cache dijaga di bawah
+``IMAGE_PROXY_CACHE_MAX_BYTES`` dengan membuang entry yang paling lama tidak
+dipakai (LRU berdasarkan mtime metadata).
+
+Proxy ini bisa dipanggil tanpa login, jadi setiap hop (termasuk redirect, yang
+diikuti manual) hanya boleh ke host di ``IMAGE_PROXY_ALLOWED_HOSTS`` atau, jika
+daftar itu kosong, ke host yang semua alamat IP-nya publik (bukan loopback,
+jaringan privat, link-local seperti 169.254.169.254, dsb). Alamat dicek dua kali:
+lewat DNS sebelum request, dan pada socket yang benar-benar tersambung (koneksi
+``_GuardedAdapter``), sehingga DNS rebinding di antara keduanya tidak bisa
+mengarahkan ke alamat internal. Hanya respons gambar raster yang disimpan dan
+diteruskan.
+
+Varian hasil resize/transcode (Pillow) disimpan di cache yang sama dengan key
+(url, lebar, format) dan dibuat ulang jika ETag gambar aslinya berubah.
+"""
+import hashlib
+import io
+import json
+import ipaddress
+import os
+import socket
+import tempfile
+import threading
+import time
+from urllib.parse import urljoin, urlparse
+
+import requests
+from django.conf import settings
+from PIL import Image, ImageOps, UnidentifiedImageError
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+CHUNK_SIZE = 64 * 1024
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+MAX_REDIRECTS = 3
+# SVG/HTML dsb. tidak pernah diteruskan: bisa berisi script yang jalan di origin kita
+RASTER_TYPES = frozenset(('image/jpeg', 'image/png', 'image/gif', 'image/webp', 'image/avif', 'image/bmp'))
+
+# Lebar dibulatkan ke atas ke salah satu bucket agar jumlah varian terbatas
+WIDTHS = (160, 320, 480, 640, 960, 1280, 1600)
+# fmt= -> (format Pillow, content type, opsi encoder); urutan = preferensi negosiasi
+FORMATS = {
+    'avif': ('AVIF', 'image/avif', {'quality': 55}),
+    'webp': ('WEBP', 'image/webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'image/jpeg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+_session = None
+_session_lock = threading.Lock()
+_evict_lock = threading.Lock()
+
+
+class ImageProxyError(Exception):
+    """Gambar tidak bisa diambil dari origin (dan tidak ada salinan di cache)."""
+
+
+class ImageTooLarge(ImageProxyError):
+    pass
+
+
+class ImageTooManyPixels(ImageProxyError):
+    """Dimensi gambar melewati ``Image.MAX_IMAGE_PIXELS`` (decompression bomb), tidak di-decode."""
+
+
+def placeholder_path():
+    return os.path.join(settings.BASE_DIR, 'static', 'img', 'no-image.png')
+
+
+def get_cache_dir():
+    return getattr(settings, 'IMAGE_PROXY_CACHE_DIR', os.path.join(settings.BASE_DIR, 'cache', 'image_proxy'))
+
+
+def max_cache_bytes():
+    return getattr(settings, 'IMAGE_PROXY_CACHE_MAX_BYTES', 200 * 1024 * 1024)
+
+
+def max_image_bytes():
+    return getattr(settings, 'IMAGE_PROXY_MAX_IMAGE_BYTES', 5 * 1024 * 1024)
+
+
+def ttl():
+    return getattr(settings, 'IMAGE_PROXY_TTL', 24 * 60 * 60)
+
+
+def allowed_hosts():
+    return {host.lower() for host in getattr(settings, 'IMAGE_PROXY_ALLOWED_HOSTS', ())}
+
+
+def _is_public(address):
+    return ipaddress.ip_address(address.split('%')[0]).is_global
+
+
+class ForbiddenAddress(OSError):
+    """Socket tersambung ke alamat non-publik (mis. DNS rebinding setelah _check_destination)."""
+
+
+class _PeerCheckMixin:
+    def _new_conn(self):
+        sock = super()._new_conn()
+        if self.host.lower() not in allowed_hosts() and not _is_public(sock.getpeername()[0]):
+            sock.close()
+            raise ForbiddenAddress('Alamat origin tidak diizinkan')
+        return sock
+
+
+class _GuardedHTTPConnection(_PeerCheckMixin, HTTPConnection):
+    pass
+
+
+class _GuardedHTTPSConnection(_PeerCheckMixin, HTTPSConnection):
+    pass
+
+
+class _GuardedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _GuardedHTTPConnection
+
+
+class _GuardedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _GuardedHTTPSConnection
+
+
+class _GuardedAdapter(HTTPAdapter):
+    """Adapter yang mengecek alamat peer setiap koneksi baru."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _GuardedHTTPConnectionPool,
+            'https': _GuardedHTTPSConnectionPool,
+        }
+
+
+def get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                # proxy dari environment akan membuat cek alamat peer tidak berarti
+                session.trust_env = False
+                adapter = _GuardedAdapter(pool_connections=10, pool_maxsize=20)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
+
+def is_allowed_url(url):
+    """Cek sintaks + allowlist (tanpa DNS); alamat IP dicek saat benar-benar fetch."""
+    parsed = urlparse(url)
+    if parsed.scheme not in ('http', 'https') or not parsed.hostname:
+        return False
+    hosts = allowed_hosts()
+    return not hosts or parsed.hostname.lower() in hosts
+
+
+def _check_destination(url):
+    """Tolak URL yang tidak diizinkan atau host yang resolve ke alamat non-publik."""
+    if not is_allowed_url(url):
+        raise ImageProxyError('URL tidak diizinkan')
+    parsed = urlparse(url)
+    if parsed.hostname.lower() in allowed_hosts():
+        return
+    try:
+        infos = socket.getaddrinfo(parsed.hostname, parsed.port or (443 if parsed.scheme == 'https' else 80),
+                                   proto=socket.IPPROTO_TCP)
+    except (socket.gaierror, UnicodeError) as e:
+        raise ImageProxyError(f'Host tidak bisa di-resolve: {e}')
+    for info in infos:
+        if not _is_public(info[4][0]):
+            raise ImageProxyError('Alamat origin tidak diizinkan')
+
+
+def _content_type(response):
+    return response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+
+
+def _fetch(url, headers):
+    """GET streaming; redirect diikuti manual supaya setiap hop ikut dicek."""
+    for _ in range(MAX_REDIRECTS + 1):
+        _check_destination(url)
+        response = get_session().get(url, headers=headers, stream=True, allow_redirects=False,
+                                     timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+        if response.is_redirect and response.headers.get('Location'):
+            url = urljoin(url, response.headers['Location'])
+            response.close()
+            continue
+        return response
+    raise ImageProxyError('Terlalu banyak redirect')
+
+
+def cache_key(url, *variant):
+    raw = '|'.join([url, *(str(part) for part in variant)])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _paths(key):
+    cache_dir = get_cache_dir()
+    return os.path.join(cache_dir, f'{key}.body'), os.path.join(cache_dir, f'{key}.json')
+
+
+def read_entry(key):
+    """Metadata entry (dengan ``path`` ke body) atau None jika tidak ada di cache."""
+    body_path, meta_path = _paths(key)
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as file:
+            meta = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if not os.path.exists(body_path):
+        return None
+    meta['path'] = body_path
+    return meta
+
+
+def touch(key):
+    """Tandai entry baru dipakai (urutan LRU)."""
+    try:
+        os.utime(_paths(key)[1])
+    except OSError:
+        pass
+
+
+def _write_atomic(path, data):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def store_entry(key, body, meta):
+    """Simpan body + metadata, lalu pangkas cache jika melebihi batas."""
+    os.makedirs(get_cache_dir(), exist_ok=True)
+    body_path, meta_path = _paths(key)
+    meta = dict(meta, size=len(body), etag='"%s"' % hashlib.sha256(body).hexdigest()[:32])
+    _write_atomic(body_path, body)
+    _write_atomic(meta_path, json.dumps(meta).encode())
+    evict()
+    meta['path'] = body_path
+    return meta
+
+
+def _save_meta(key, meta):
+    meta = {name: value for name, value in meta.items() if name != 'path'}
+    _write_atomic(_paths(key)[1], json.dumps(meta).encode())
+
+
+def evict():
+    """Buang entry paling lama tidak dipakai sampai total ukuran <= batas."""
+    cache_dir = get_cache_dir()
+    with _evict_lock:
+        entries, total = [], 0
+        for name in os.listdir(cache_dir):
+            if not name.endswith('.json'):
+                continue
+            key = name[:-len('.json')]
+            body_path, meta_path = _paths(key)
+            try:
+                size = os.path.getsize(body_path)
+                used = os.path.getmtime(meta_path)
+            except OSError:
+                continue
+            entries.append((used, key, size))
+            total += size
+
+        limit = max_cache_bytes()
+        for _, key, size in sorted(entries):
+            if total <= limit:
+                break
+            for path in _paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+
+
+def _download(response):
+    limit = max_image_bytes()
+    length = response.headers.get('Content-Length')
+    if length and length.isdigit() and int(length) > limit:
+        raise ImageTooLarge(f'Gambar lebih dari {limit} byte')
+
+    chunks, size = [], 0
+    for chunk in response.iter_content(CHUNK_SIZE):
+        size += len(chunk)
+        if size > limit:
+            raise ImageTooLarge(f'Gambar lebih dari {limit} byte')
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+
+def get_original(url):
+    """
+    Entry cache untuk gambar asli di ``url``, diunduh/divalidasi ulang bila perlu.
+    Jika origin gagal tapi ada salinan lama, salinan lama yang dipakai.
+    """
+    key = cache_key(url)
+    entry = read_entry(key)
+    if entry and time.time() - entry['fetched_at'] < ttl():
+        touch(key)
+        return entry
+
+    headers = {}
+    if entry:
+        if entry.get('origin_etag'):
+            headers['If-None-Match'] = entry['origin_etag']
+        if entry.get('origin_last_modified'):
+            headers['If-Modified-Since'] = entry['origin_last_modified']
+
+    try:
+        with _fetch(url, headers) as response:
+            if entry and response.status_code == 304:
+                entry['fetched_at'] = time.time()
+                _save_meta(key, entry)
+                return entry
+            response.raise_for_status()
+            content_type = _content_type(response)
+            if content_type not in RASTER_TYPES:
+                raise ImageProxyError(f'Bukan gambar raster: {content_type or "tanpa Content-Type"}')
+            body = _download(response)
+            origin_etag = response.headers.get('ETag')
+            origin_last_modified = response.headers.get('Last-Modified')
+    except ImageTooLarge:
+        raise
+    except requests.RequestException as e:
+        if entry:
+            touch(key)
+            return entry
+        raise ImageProxyError(str(e))
+
+    return store_entry(key, body, {
+        'url': url,
+        'content_type': content_type,
+        'origin_etag': origin_etag,
+        'origin_last_modified': origin_last_modified,
+        'fetched_at': time.time(),
+    })
+
+
+def snap_width(width):
+    return next((bucket for bucket in WIDTHS if bucket >= width), WIDTHS[-1])
+
+
+def negotiate_format(accept):
+    """Format terbaik yang didukung browser menurut header Accept (fallback JPEG)."""
+    accept = accept or ''
+    for fmt, (_, content_type, _) in FORMATS.items():
+        if content_type in accept:
+            return fmt
+    return 'jpeg'
+
+
+def _transcode(path, width, fmt):
+    pil_format, _, options = FORMATS[fmt]
+    with Image.open(path) as image:
+        if width:
+            # JPEG di-decode langsung di skala kecil, jauh lebih hemat memori
+            image.draft('RGB', (width, width))
+        image = ImageOps.exif_transpose(image)
+        if width and image.width > width:
+            image.thumbnail((width, image.height), Image.LANCZOS)
+
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        if has_alpha and pil_format == 'JPEG':
+            # JPEG tidak punya alpha: tempel di atas latar putih
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel('A'))
+            image = background
+        elif image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if has_alpha else 'RGB')
+
+        output = io.BytesIO()
+        image.save(output, pil_format, **options)
+    return output.getvalue()
+
+
+def get_variant(url, width=None, fmt='jpeg'):
+    """Entry cache gambar ``url`` yang sudah di-resize ke ``width`` dan di-encode ke ``fmt``."""
+    original = get_original(url)
+    width = snap_width(width) if width else None
+    key = cache_key(url, width or '', fmt)
+
+    entry = read_entry(key)
+    if entry and entry.get('source_etag') == original['etag']:
+        touch(key)
+        return entry
+
+    try:
+        body = _transcode(original['path'], width, fmt)
+    except Image.DecompressionBombError as e:
+        raise ImageTooManyPixels(str(e)) from e
+    except (UnidentifiedImageError, OSError, ValueError) as e:
+        raise ImageProxyError(f'Gambar tidak bisa diproses: {e}')
+
+    return store_entry(key, body, {
+        'url': url,
+        'content_type': FORMATS[fmt][1],
+        'source_etag': original['etag'],
+        'fetched_at': time.time(),
+    })
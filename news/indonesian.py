@@ -0,0 +1,119 @@
+"""
+Tokenizer, stopword, dan stemmer ringan Bahasa Indonesia untuk pencarian berita.
+
+Stemmer berbasis aturan (partikel, kata ganti milik, akhiran, lalu awalan)
+sehingga "pertandingan", "bertanding", dan "tanding" menjadi token yang sama.
+Sebuah imbuhan hanya dibuang bila sisanya ada di ``KATA_DASAR``; kata di luar
+kamus (nama pemain/klub seperti "Dimarco" atau "Lukaku") dan kata yang sudah
+berupa kata dasar ("menang") dibiarkan utuh. Dokumen dan query melewati fungsi
+yang sama; setelah kamus diubah, jalankan ``rebuild_news_search``.
+"""
+import re
+import unicodedata
+
+STOPWORDS = frozenset("""
+ada adalah agar akan aku anda antara apa atau bagi bahwa banyak baru belum
+bila bisa dalam dan dapat dari dengan di dia hanya harus hingga ia ini itu
+jadi jika juga kalau kami kamu karena ke kita lagi lebih maka masih mereka
+namun oleh pada para per pun saat saja sangat saya sebagai sebuah secara
+sedang sejak seorang seperti setelah sudah tak telah tersebut tetapi tidak
+untuk yaitu yakni yang
+""".split())
+
+# Kata dasar yang sering muncul di berita sepak bola. Stem hanya diterima
+# bila ada di sini, sehingga "menang" tidak menjadi "tang".
+KATA_DASAR = frozenset("""
+ajar aman ambil amuk andal angkat angkut asuh atur awal bagi bahas baik
+balas bangkit bangun banding batal bawa bayar bela beli benah bentur berat
+beri besar bidik bina bobol buang buat buka bukti bulan bungkam buru catat
+cedera cegah cemerlang cetak cipta coba cukup curi dapat datang daftar dekat
+dengar depak desak dobrak dorong duduk dukung gabung gagal gagas gali gaji
+ganti gelar gempur gerak gebrak geser gilas gulung hadap hadang hadir hajar
+hambat hancur harap hasil henti hitung hukum hubung ikat ikut imbang incar
+ingin injak inti jadwal jaga jalan jamu jatuh jawab jebol juara jual kalah
+kejar kembali kenal kendali kerja kirim kontrak kuasa kuat kukuh kumpul
+kunci kurang lahir laku lanjut lapor latih lawan lepas lewat lindung lolos
+luncur lupa main maju makan malu mandek manfaat mantap masuk menang milik
+minat minta mulai mundur murah nilai nyata olah pakai pancing pantau pasang
+pecah pecat pegang peluk pensiun pikir pilih pimpin pindah pinjam
+puas pukul pulang pulih puncak putus raih rajai ramai rancang rangkai rebut
+rekrut rencana resmi ringan rugi runtuh rusak salip saing sambut samai sapu
+saring segar sekap selamat selesai sepak serang sesal siap siar simpan
+singkir sukses sumbang susul tahan tahu takluk tambah tampil tanding tangan
+tangkap tangkis tantang tanya tarik tawar tekan tembak tembus temu tendang
+tentu terang terima terus tiba timpa tinggal tolak tonton tukar tumbang
+tunda tunggu tunjuk turun tutup ubah ucap ujung ukir ulang umum unggul
+untung upaya usaha usir utama wakil
+""".split())
+
+MIN_STEM_LENGTH = 3
+
+PARTICLES = ('lah', 'kah', 'tah', 'pun')
+POSSESSIVES = ('nya', 'ku', 'mu')
+SUFFIXES = ('kan', 'an', 'i')
+VOWELS = 'aiueo'
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def fold(text):
+    """Huruf kecil tanpa diakritik ("Pogba" == "pógba")."""
+    text = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def _strip_suffix(word, suffixes):
+    for suffix in suffixes:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM_LENGTH:
+            return word[:-len(suffix)]
+    return word
+
+
+def _without_prefix(word):
+    """Semua kemungkinan sisa kata setelah satu awalan dibuang."""
+    # (awalan, pengganti huruf awal jika kata dasar diawali vokal)
+    for prefix, before_vowel in (
+        ('meny', 's'), ('peny', 's'), ('meng', 'k'), ('peng', 'k'),
+        ('mem', 'p'), ('pem', 'p'), ('men', 't'), ('pen', 't'),
+        ('ber', ''), ('ter', ''), ('per', ''), ('me', ''), ('pe', ''),
+        ('di', ''), ('ke', ''), ('se', ''),
+    ):
+        if not word.startswith(prefix):
+            continue
+        rest = word[len(prefix):]
+        if len(rest) < MIN_STEM_LENGTH:
+            continue
+        yield rest
+        if before_vowel and rest[0] in VOWELS:
+            yield before_vowel + rest
+
+
+def _candidates(word):
+    """Calon kata dasar, dari yang paling sedikit imbuhannya dibuang."""
+    word = _strip_suffix(word, PARTICLES)
+    word = _strip_suffix(word, POSSESSIVES)
+    bases = [word] + [
+        word[:-len(suffix)] for suffix in SUFFIXES
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM_LENGTH
+    ]
+    # Paling banyak dua awalan, mis. "diper-", "keber-"
+    for _ in range(3):
+        yield from bases
+        bases = [rest for base in bases for rest in _without_prefix(base)]
+
+
+def stem(word):
+    if len(word) <= MIN_STEM_LENGTH or word.isdigit() or word in KATA_DASAR:
+        return word
+    return next((base for base in _candidates(word) if base in KATA_DASAR), word)
+
+
+def tokens(text):
+    """Token mentah (sudah di-fold) beserta posisinya di ``text``."""
+    for match in _TOKEN_RE.finditer(text or ''):
+        yield fold(match.group()), match.start(), match.end()
+
+
+def terms(text):
+    """Daftar stem untuk diindeks/dicari, stopword dibuang."""
+    return [stem(token) for token, _, _ in tokens(text) if token not in STOPWORDS]
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from news.models import News
+from news.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Bangun ulang index pencarian berita (mis. setelah stemmer/stopword diubah)'
+
+    def handle(self, *args, **options):
+        count = rebuild_index(News)
+        self.stdout.write(self.style.SUCCESS(f"✅ {count} berita berhasil diindeks ulang!"))
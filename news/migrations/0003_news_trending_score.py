@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:10
+
+from django.conf import settings
+import math
+from datetime import datetime, timedelta, timezone
+
+from django.db import migrations, models
+
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+HALF_LIFE = timedelta(hours=24)
+
+
+def backfill_trending_score(apps, schema_editor):
+    # Salinan news.trending.initial_score; view lama dianggap terjadi saat berita terbit
+    News = apps.get_model('news', 'News')
+    tau = HALF_LIFE.total_seconds() / math.log(2)
+    for news in News.objects.only('id', 'created_at', 'news_views').iterator():
+        news.trending_score = (news.created_at - EPOCH).total_seconds() / tau + math.log1p(news.news_views)
+        news.save(update_fields=['trending_score'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0002_news_user'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='trending_score',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['-trending_score', '-id'], name='news_trending_idx'),
+        ),
+        migrations.RunPython(backfill_trending_score, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+# Hanya DDL; isi index dibangun dengan stemmer terbaru setelah migrate
+# (news.signals.fill_search_index) atau lewat command rebuild_news_search
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE TABLE news_search ('
+            ' news_id bigint PRIMARY KEY REFERENCES news_news (id) ON DELETE CASCADE,'
+            ' document tsvector NOT NULL)'
+        )
+        schema_editor.execute('CREATE INDEX news_search_document_gin ON news_search USING GIN (document)')
+    else:
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE news_search USING fts5(title, content, tokenize='unicode61')"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    schema_editor.execute('DROP TABLE IF EXISTS news_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0004_news_list_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
+from . import trending, view_counter
 
 class News(models.Model):
     CATEGORY_CHOICES = [
@@ -18,6 +20,24 @@ class News(models.Model):
     news_views = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     is_featured = models.BooleanField(default=False)
+    # log-skor trending (lihat news.trending), bertambah setiap view ditulis
+    trending_score = models.FloatField(default=0.0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-trending_score', '-id'], name='news_trending_idx'),
+            # keyset pagination news_list; index yang sama dipindai mundur untuk urutan descending
+            models.Index(fields=['created_at', 'id'], name='news_created_id_idx'),
+            models.Index(fields=['news_views', 'id'], name='news_views_id_idx'),
+            models.Index(fields=['category', 'created_at', 'id'], name='news_cat_created_idx'),
+            models.Index(fields=['category', 'news_views', 'id'], name='news_cat_views_idx'),
+            models.Index(fields=['category', '-trending_score', '-id'], name='news_cat_trending_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and not self.trending_score:
+            self.trending_score = trending.initial_score(timezone.now(), self.news_views)
+        super().save(*args, **kwargs)
     
     def __str__(self):
         return self.title
@@ -27,5 +47,6 @@ class News(models.Model):
         return self.news_views > 20
         
     def increment_views(self):
-        self.news_views += 1
-        self.save()
\ No newline at end of file
+        # Hanya kolom news_views yang di-update secara atomik (lihat news.view_counter)
+        view_counter.record_view(self.pk)
+        self.news_views += 1
\ No newline at end of file
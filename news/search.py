@@ -0,0 +1,154 @@
+"""
+Full-text search berita (judul + isi) dengan inverted index di database.
+
+Dokumen di-tokenize, dibuang stopword-nya, dan di-stem (news.indonesian) di
+Python, lalu disimpan di tabel ``news_search``:
+
+* PostgreSQL (``PRODUCTION``): kolom ``tsvector`` dengan GIN index, judul
+  berbobot A dan isi berbobot B, diurutkan dengan ``ts_rank``.
+* SQLite (development): virtual table FTS5, diurutkan dengan ``bm25``.
+
+Tabel index dibuat oleh migrasi 0005. Isinya disinkronkan lewat signal
+save/delete News (news.signals) dan diisi penuh setelah ``migrate`` bila masih
+kosong (``fill_if_empty``), sehingga migrasi tidak perlu memanggil stemmer.
+Highlight dibuat di Python dari teks asli agar sama di kedua backend.
+"""
+from django.db import connection
+from django.utils.html import escape
+
+from .indonesian import stem, terms, tokens
+
+TITLE_WEIGHT = 10.0
+CONTENT_WEIGHT = 1.0
+SNIPPET_LENGTH = 160
+
+
+def _is_postgresql(conn=None):
+    return (conn or connection).vendor == 'postgresql'
+
+
+def index_news(news_id, title, content, conn=None):
+    """Tambah/ganti dokumen satu berita di index."""
+    conn = conn or connection
+    title_terms = ' '.join(terms(title))
+    content_terms = ' '.join(terms(content))
+    with conn.cursor() as cursor:
+        if _is_postgresql(conn):
+            cursor.execute(
+                "INSERT INTO news_search (news_id, document) VALUES (%s,"
+                " setweight(to_tsvector('simple', %s), 'A') || setweight(to_tsvector('simple', %s), 'B'))"
+                " ON CONFLICT (news_id) DO UPDATE SET document = EXCLUDED.document",
+                [news_id, title_terms, content_terms],
+            )
+        else:
+            cursor.execute('DELETE FROM news_search WHERE rowid = %s', [news_id])
+            cursor.execute(
+                'INSERT INTO news_search (rowid, title, content) VALUES (%s, %s, %s)',
+                [news_id, title_terms, content_terms],
+            )
+
+
+def unindex_news(news_id, conn=None):
+    conn = conn or connection
+    column = 'news_id' if _is_postgresql(conn) else 'rowid'
+    with conn.cursor() as cursor:
+        cursor.execute(f'DELETE FROM news_search WHERE {column} = %s', [news_id])
+
+
+def rebuild_index(news_model, conn=None):
+    """Index ulang semua berita (dipakai migrasi dan command rebuild_news_search)."""
+    conn = conn or connection
+    with conn.cursor() as cursor:
+        cursor.execute('DELETE FROM news_search')
+    count = 0
+    for news_id, title, content in news_model.objects.values_list('id', 'title', 'content').iterator():
+        index_news(news_id, title, content, conn)
+        count += 1
+    return count
+
+
+def fill_if_empty(news_model, conn=None):
+    """Index semua berita jika tabel index ada tapi masih kosong (dipanggil setelah migrate)."""
+    conn = conn or connection
+    if 'news_search' not in conn.introspection.table_names():
+        return 0
+    with conn.cursor() as cursor:
+        cursor.execute('SELECT 1 FROM news_search LIMIT 1')
+        if cursor.fetchone() is not None:
+            return 0
+    if not news_model.objects.using(conn.alias).exists():
+        return 0
+    return rebuild_index(news_model, conn)
+
+
+def _ranked_ids(query_terms, limit):
+    with connection.cursor() as cursor:
+        if _is_postgresql():
+            # Term hanya berisi huruf/angka (hasil tokenizer), aman digabung ke tsquery
+            cursor.execute(
+                "SELECT news_id, ts_rank(document, query) AS rank"
+                " FROM news_search, to_tsquery('simple', %s) AS query"
+                " WHERE document @@ query ORDER BY rank DESC, news_id DESC LIMIT %s",
+                [' & '.join(query_terms), limit],
+            )
+        else:
+            # bm25 FTS5: makin kecil makin relevan, dibalik agar sama dengan ts_rank
+            cursor.execute(
+                "SELECT rowid, -bm25(news_search, %s, %s) AS rank FROM news_search"
+                " WHERE news_search MATCH %s ORDER BY rank DESC, rowid DESC LIMIT %s",
+                [TITLE_WEIGHT, CONTENT_WEIGHT, ' '.join(f'"{term}"' for term in query_terms), limit],
+            )
+        return cursor.fetchall()
+
+
+def highlight(text, query_terms):
+    """Escape ``text`` dan bungkus kata yang stem-nya cocok dengan <mark>."""
+    parts, last = [], 0
+    for token, start, end in tokens(text):
+        if stem(token) in query_terms:
+            parts.append(escape(text[last:start]))
+            parts.append(f'<mark>{escape(text[start:end])}</mark>')
+            last = end
+    parts.append(escape(text[last:]))
+    return ''.join(parts)
+
+
+def snippet(text, query_terms, length=SNIPPET_LENGTH):
+    """Potongan ``text`` sekitar kata pertama yang cocok, sudah di-highlight."""
+    first = next((start for token, start, _ in tokens(text) if stem(token) in query_terms), 0)
+    begin = max(0, first - length // 4)
+    end = min(len(text), begin + length)
+    prefix = '…' if begin > 0 else ''
+    suffix = '…' if end < len(text) else ''
+    return prefix + highlight(text[begin:end], query_terms) + suffix
+
+
+def search_news(query, limit=10):
+    """Berita yang cocok dengan semua kata di ``query``, urut relevansi."""
+    from .models import News
+
+    query_terms = list(dict.fromkeys(terms(query)))
+    if not query_terms:
+        return []
+
+    ranked = _ranked_ids(query_terms, limit)
+    news_by_id = News.objects.in_bulk(
+        [news_id for news_id, _ in ranked],
+    )
+    wanted = set(query_terms)
+    results = []
+    for news_id, rank in ranked:
+        news = news_by_id.get(news_id)
+        if news is None:
+            continue
+        results.append({
+            'id': news.id,
+            'title': news.title,
+            'title_highlight': highlight(news.title, wanted),
+            'snippet': snippet(news.content, wanted),
+            'category': news.category,
+            'thumbnail': news.thumbnail,
+            'created_at': news.created_at.strftime("%d %b %Y"),
+            'rank': rank,
+        })
+    return results
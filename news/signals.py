@@ -0,0 +1,25 @@
+from django.db import connections
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import search
+from .models import News
+
+SEARCH_FIELDS = {'title', 'content'}
+
+
+@receiver(post_save, sender=News)
+def index_news_on_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not SEARCH_FIELDS & set(update_fields):
+        return
+    search.index_news(instance.pk, instance.title, instance.content)
+
+
+@receiver(post_delete, sender=News)
+def unindex_news_on_delete(sender, instance, **kwargs):
+    search.unindex_news(instance.pk)
+
+
+def fill_search_index(sender, using, **kwargs):
+    # post_migrate (didaftarkan di NewsConfig.ready): isi index yang baru dibuat migrasi 0005
+    search.fill_if_empty(News, connections[using])
@@ -1,7 +1,23 @@
-from django.test import TestCase, Client
+import io
+import math
+import os
+import shutil
+import tempfile
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from PIL import Image
+from django.core.management.sql import emit_post_migrate_signal
+from django.db import DatabaseError, connection
+from django.test import TestCase, Client, override_settings
 from django.contrib.auth.models import User
 from django.urls import reverse
+from django.utils import timezone
 from .models import News
+from . import image_proxy, search, trending, view_counter, views
+from .indonesian import stem, terms
 
 
 class NewsFunctionalTest(TestCase):
@@ -117,3 +133,414 @@ class NewsFunctionalTest(TestCase):
         self.assertFalse(News.objects.filter(pk=news_pk).exists())
 
 
+
+
+class NewsViewCounterTest(TestCase):
+
+    def setUp(self):
+        self.news = News.objects.create(title="Berita Counter", content="Konten.", news_views=5)
+        view_counter.flush()
+
+    def test_1_increment_only_touches_views(self):
+        """increment_views tidak menimpa kolom lain yang diubah di tempat lain"""
+        stale = News.objects.get(pk=self.news.pk)
+        News.objects.filter(pk=self.news.pk).update(title="Judul Baru")
+
+        stale.increment_views()
+        self.news.refresh_from_db()
+        self.assertEqual(self.news.news_views, 6)
+        self.assertEqual(self.news.title, "Judul Baru")
+
+    @override_settings(NEWS_VIEWS_BUFFERED=True, NEWS_VIEWS_FLUSH_INTERVAL=3600)
+    def test_2_buffered_views_flushed_in_batch(self):
+        """Mode buffered menunda UPDATE sampai flush"""
+        for _ in range(3):
+            self.client.get(reverse('news:news_detail', args=[self.news.pk]))
+
+        self.news.refresh_from_db()
+        self.assertEqual(self.news.news_views, 5)
+        self.assertEqual(view_counter.pending_views(self.news.pk), 3)
+
+        view_counter.flush()
+        self.news.refresh_from_db()
+        self.assertEqual(self.news.news_views, 8)
+        self.assertEqual(view_counter.pending_views(self.news.pk), 0)
+
+    @override_settings(NEWS_VIEWS_BUFFERED=True, NEWS_VIEWS_FLUSH_INTERVAL=3600)
+    def test_3_failed_flush_keeps_views_buffered(self):
+        for _ in range(2):
+            view_counter.record_view(self.news.pk)
+
+        with mock.patch.object(view_counter, 'increment', side_effect=DatabaseError('down')):
+            with self.assertRaises(DatabaseError):
+                view_counter.flush()
+        self.assertEqual(view_counter.pending_views(self.news.pk), 2)
+
+        view_counter.flush()
+        self.news.refresh_from_db()
+        self.assertEqual(self.news.news_views, 7)
+
+
+class NewsTrendingTest(TestCase):
+
+    def setUp(self):
+        self.old = News.objects.create(title="Berita Lama", content="Konten.", news_views=50)
+        self.fresh = News.objects.create(title="Berita Baru", content="Konten.")
+        # Berita lama terbit seminggu lalu, view-nya juga sudah lama
+        week_ago = timezone.now() - timedelta(days=7)
+        News.objects.filter(pk=self.old.pk).update(trending_score=trending.initial_score(week_ago, 50))
+
+    def test_1_recent_views_beat_old_views(self):
+        """Beberapa view baru mengalahkan banyak view yang sudah meluruh"""
+        for _ in range(3):
+            self.client.get(reverse('news:news_detail', args=[self.fresh.pk]))
+
+        response = self.client.get(reverse('news:news_list'), {'sort': 'trending'},
+                                   HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        titles = [item['title'] for item in response.json()['news_items']]
+        self.assertEqual(titles, ["Berita Baru", "Berita Lama"])
+
+    def test_2_score_matches_decayed_sum(self):
+        """Skor log-sum bertambah sesuai bobot view saat ini"""
+        now = timezone.now()
+        before = News.objects.get(pk=self.fresh.pk).trending_score
+        view_counter.increment([self.fresh.pk], 4)
+        after = News.objects.get(pk=self.fresh.pk).trending_score
+
+        expected = math.log(math.exp(before - trending.decay_weight(now)) + 4) + trending.decay_weight(now)
+        self.assertAlmostEqual(after, expected, places=3)
+
+    def test_3_hot_feed_is_limited(self):
+        response = self.client.get(reverse('news:hot_news'), {'limit': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['id'] for item in response.json()['news_items']], [self.fresh.pk])
+
+        response = self.client.get(reverse('news:hot_news'), {'limit': 'x'})
+        self.assertEqual(response.status_code, 400)
+
+
+class NewsListPaginationTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='penulis', password='password123')
+        cls.news = [
+            News.objects.create(user=cls.user, title=f"Berita {i}", content="Isi panjang. " * 50,
+                                category='match' if i % 2 else 'transfer', news_views=i % 3)
+            for i in range(7)
+        ]
+
+    def fetch(self, **params):
+        return self.client.get(reverse('news:news_list'), params, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+    def collect(self, **params):
+        ids, cursor = [], None
+        while True:
+            page = dict(params, limit=3)
+            if cursor:
+                page['cursor'] = cursor
+            data = self.fetch(**page).json()
+            ids += [item['id'] for item in data['news_items']]
+            cursor = data['next_cursor']
+            if not cursor:
+                return ids
+
+    def test_1_cursor_walks_every_sort_without_gaps(self):
+        """Tiap mode sort dipaginasi lengkap tanpa duplikat, termasuk nilai views yang sama"""
+        by_views = sorted(self.news, key=lambda n: (n.news_views, n.id))
+        self.assertEqual(self.collect(sort='views_asc'), [n.id for n in by_views])
+        self.assertEqual(self.collect(sort='views_desc'), [n.id for n in reversed(by_views)])
+        self.assertEqual(self.collect(sort='-created_at'), [n.id for n in reversed(self.news)])
+        self.assertEqual(self.collect(sort='-created_at', category='match'),
+                         [n.id for n in reversed(self.news) if n.category == 'match'])
+
+    def test_2_items_are_projected(self):
+        """Response hanya berisi cuplikan content, user diambil lewat join"""
+        with self.assertNumQueries(1):
+            data = self.fetch(limit=5).json()
+        item = data['news_items'][0]
+        self.assertNotIn('content', item)
+        self.assertLessEqual(len(item['excerpt']), 120)
+        self.assertEqual(item['username'], 'penulis')
+
+    def test_3_invalid_cursor(self):
+        self.assertEqual(self.fetch(cursor='bukan-cursor').status_code, 400)
+        self.assertEqual(self.fetch(limit=0).status_code, 400)
+        # Nilai cursor yang bukan angka untuk sort trending
+        for value in (['x'], {'a': 1}, 'abc'):
+            cursor = views.encode_cursor(value, 1)
+            self.assertEqual(self.fetch(sort='trending', cursor=cursor).status_code, 400)
+
+    def test_4_json_detail_has_full_content(self):
+        response = self.client.get(reverse('news:show_json_detail', args=[self.news[0].pk]))
+        self.assertEqual(response.json()['content'], self.news[0].content)
+
+
+class NewsSearchTest(TestCase):
+
+    def setUp(self):
+        self.match = News.objects.create(
+            title="Liverpool menang di Anfield",
+            content="Pertandingan berjalan sengit, Salah mencetak dua gol untuk kemenangan tuan rumah.",
+            category='match',
+        )
+        self.transfer = News.objects.create(
+            title="Rumor transfer musim panas",
+            content="Klub papan atas bertanding memperebutkan pemain muda berbakat.",
+            category='transfer',
+        )
+
+    def search(self, q):
+        return self.client.get(reverse('news:search_news'), {'q': q}).json()['results']
+
+    def test_1_stemmed_match_and_ranking(self):
+        """"tanding" menemukan "Pertandingan" dan "bertanding"; judul berbobot lebih tinggi"""
+        self.assertEqual({r['id'] for r in self.search('tanding')}, {self.match.id, self.transfer.id})
+        results = self.search('kemenangan liverpool')
+        self.assertEqual([r['id'] for r in results], [self.match.id])
+        self.assertIn('<mark>Liverpool</mark>', results[0]['title_highlight'])
+        self.assertIn('<mark>kemenangan</mark>', results[0]['snippet'])
+
+    def test_2_stopwords_ignored(self):
+        self.assertEqual(self.search('yang dan di'), [])
+        self.assertEqual(self.client.get(reverse('news:search_news')).status_code, 400)
+
+    def test_3_index_follows_save_and_delete(self):
+        self.transfer.title = "Arsenal resmi datangkan penyerang"
+        self.transfer.save()
+        self.assertEqual([r['id'] for r in self.search('arsenal')], [self.transfer.id])
+        self.assertEqual(self.search('rumor'), [])
+
+        self.transfer.delete()
+        self.assertEqual(self.search('arsenal'), [])
+
+    def test_4_empty_index_filled_after_migrate(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM news_search')
+        self.assertEqual(self.search('liverpool'), [])
+
+        emit_post_migrate_signal(verbosity=0, interactive=False, db=connection.alias)
+        self.assertEqual([r['id'] for r in self.search('liverpool')], [self.match.id])
+        # index yang sudah berisi tidak dibangun ulang
+        self.assertEqual(search.fill_if_empty(News), 0)
+
+    def test_5_root_words_and_names_not_over_stemmed(self):
+        """Kata dasar dan nama tidak dipotong: "menang" bukan "tang", "Dimarco" bukan "marco"."""
+        for word, expected in (
+            ('menang', 'menang'), ('kemenangannya', 'menang'), ('pertandingan', 'tanding'),
+            ('memperebutkan', 'rebut'), ('pemain', 'main'), ('dimarco', 'dimarco'), ('lukaku', 'lukaku'),
+        ):
+            self.assertEqual(stem(word), expected)
+        self.assertEqual(terms('Dimarco menang'), ['dimarco', 'menang'])
+
+        inter = News.objects.create(title="Dimarco bawa Inter menang", content="Gol tunggal.", category='match')
+        self.assertEqual([r['id'] for r in self.search('marco')], [])
+        self.assertEqual([r['id'] for r in self.search('tang')], [])
+        self.assertEqual({r['id'] for r in self.search('menang')}, {self.match.id, inter.id})
+
+
+class OriginHandler(BaseHTTPRequestHandler):
+    """Origin gambar palsu: /img.jpg dengan ETag, /big.jpg melebihi batas ukuran."""
+    body = b'\xff\xd8' + b'x' * 2000
+    photo = b''
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append((self.path, self.headers.get('If-None-Match')))
+        if self.path == '/img.jpg':
+            if self.headers.get('If-None-Match') == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = self.body
+        elif self.path == '/big.jpg':
+            body = b'x' * 5000
+        elif self.path == '/photo.png':
+            body = self.photo
+        elif self.path == '/page.html':
+            body = b'<script>alert(1)</script>'
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        elif self.path == '/redirect':
+            self.send_response(302)
+            self.send_header('Location', '/img.jpg')
+            self.end_headers()
+            return
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class OriginServerTestCase(TestCase):
+    """Menjalankan OriginHandler di port acak dan cache proxy di direktori sementara."""
+    max_image_bytes = 4000
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), OriginHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.origin = f'http://127.0.0.1:{cls.server.server_port}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, True)
+        # origin palsu ada di loopback, jadi harus masuk allowlist
+        settings_override = override_settings(IMAGE_PROXY_CACHE_DIR=self.cache_dir,
+                                              IMAGE_PROXY_MAX_IMAGE_BYTES=self.max_image_bytes, IMAGE_PROXY_TTL=60,
+                                              IMAGE_PROXY_ALLOWED_HOSTS=['127.0.0.1'])
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        OriginHandler.requests_seen = []
+
+    def proxy(self, path, **headers):
+        return self.client.get(reverse('news:proxy_image'), {'url': self.origin + path}, **headers)
+
+
+class ImageProxyTest(OriginServerTestCase):
+
+    def test_1_cached_with_browser_headers(self):
+        """Request kedua dilayani dari cache disk tanpa menghubungi origin"""
+        first = self.proxy('/img.jpg')
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(b''.join(first.streaming_content), OriginHandler.body)
+        self.assertEqual(first['Cache-Control'], 'public, max-age=60')
+
+        second = self.proxy('/img.jpg', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(len(OriginHandler.requests_seen), 1)
+
+    @override_settings(IMAGE_PROXY_TTL=0)
+    def test_2_stale_entry_revalidated(self):
+        """Entry kedaluwarsa divalidasi ulang dengan If-None-Match dari origin"""
+        self.proxy('/img.jpg')
+        response = self.proxy('/img.jpg')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), OriginHandler.body)
+        self.assertEqual(OriginHandler.requests_seen, [('/img.jpg', None), ('/img.jpg', '"v1"')])
+
+    def test_3_limits_and_errors(self):
+        self.assertEqual(self.proxy('/big.jpg').status_code, 413)
+        self.assertEqual(self.proxy('/missing.jpg').status_code, 502)
+        self.assertEqual(self.client.get(reverse('news:proxy_image'), {'url': 'file:///etc/passwd'}).status_code, 400)
+
+    @override_settings(IMAGE_PROXY_CACHE_MAX_BYTES=3000)
+    def test_4_lru_eviction(self):
+        """Cache dipangkas ke batas ukuran dengan membuang entry terlama"""
+        old_key = image_proxy.cache_key('http://contoh/lama.jpg')
+        image_proxy.store_entry(old_key, b'a' * 1500, {'fetched_at': 0, 'content_type': 'image/jpeg'})
+        self.proxy('/img.jpg')
+        self.assertIsNone(image_proxy.read_entry(old_key))
+        self.assertIsNotNone(image_proxy.read_entry(image_proxy.cache_key(self.origin + '/img.jpg')))
+
+    def test_6_body_evicted_between_lookup_and_open(self):
+        """Body yang dihapus evict() proses lain dianggap cache miss, bukan 500"""
+        get_original = image_proxy.get_original
+        evicted = []
+
+        def racing_get_original(url):
+            entry = get_original(url)
+            if not evicted:
+                os.remove(entry['path'])
+                evicted.append(entry['path'])
+            return entry
+
+        with mock.patch.object(image_proxy, 'get_original', side_effect=racing_get_original):
+            response = self.proxy('/img.jpg')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), OriginHandler.body)
+        self.assertEqual(len(OriginHandler.requests_seen), 2)
+
+
+    def test_5_rejects_private_hosts_and_non_raster(self):
+        """Origin non-publik (termasuk lewat redirect) dan respons bukan gambar ditolak"""
+        with override_settings(IMAGE_PROXY_ALLOWED_HOSTS=[]):
+            self.assertEqual(self.proxy('/img.jpg').status_code, 502)
+            self.assertEqual(self.client.get(reverse('news:proxy_image'),
+                                             {'url': 'http://169.254.169.254/latest/meta-data/'}).status_code, 502)
+        self.assertEqual(OriginHandler.requests_seen, [])
+
+        with override_settings(IMAGE_PROXY_ALLOWED_HOSTS=['cdn.contoh.com']):
+            self.assertEqual(self.proxy('/img.jpg').status_code, 400)
+
+        # DNS rebinding: cek DNS lolos, tapi socket tersambung ke loopback
+        with override_settings(IMAGE_PROXY_ALLOWED_HOSTS=[]), \
+                mock.patch.object(image_proxy, '_check_destination'):
+            self.assertEqual(self.proxy('/img.jpg').status_code, 502)
+        self.assertEqual(OriginHandler.requests_seen, [])
+
+        self.assertEqual(self.proxy('/page.html').status_code, 502)
+        response = self.proxy('/redirect')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Content-Type-Options'], 'nosniff')
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+
+
+class ImageProxyVariantTest(OriginServerTestCase):
+    max_image_bytes = 1024 * 1024
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        output = io.BytesIO()
+        Image.new('RGBA', (1200, 800), (200, 30, 30, 255)).save(output, 'PNG')
+        OriginHandler.photo = output.getvalue()
+
+    def open_image(self, response):
+        return Image.open(io.BytesIO(b''.join(response.streaming_content)))
+
+    def test_1_resized_and_transcoded(self):
+        """w= dibulatkan ke bucket lebar, fmt= menentukan encoder"""
+        response = self.client.get(reverse('news:proxy_image'),
+                                   {'url': self.origin + '/photo.png', 'w': 300, 'fmt': 'jpeg'})
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        image = self.open_image(response)
+        self.assertEqual((image.format, image.size), ('JPEG', (320, 213)))
+
+    def test_2_format_negotiated_from_accept(self):
+        response = self.client.get(reverse('news:proxy_image'), {'url': self.origin + '/photo.png', 'w': 640},
+                                   HTTP_ACCEPT='image/webp,image/*,*/*;q=0.8')
+        self.assertEqual(response['Content-Type'], 'image/webp')
+        self.assertIn('Accept', response['Vary'])
+        self.assertEqual(self.open_image(response).format, 'WEBP')
+
+    def test_3_variants_cached_per_size_and_format(self):
+        url = self.origin + '/photo.png'
+        for _ in range(2):
+            self.client.get(reverse('news:proxy_image'), {'url': url, 'w': 160, 'fmt': 'webp'})
+        self.client.get(reverse('news:proxy_image'), {'url': url, 'w': 160, 'fmt': 'jpeg'})
+        self.assertEqual(len(OriginHandler.requests_seen), 1)
+        self.assertIsNotNone(image_proxy.read_entry(image_proxy.cache_key(url, 160, 'webp')))
+        self.assertIsNotNone(image_proxy.read_entry(image_proxy.cache_key(url, 160, 'jpeg')))
+
+        bad = self.client.get(reverse('news:proxy_image'), {'url': url, 'fmt': 'gif'})
+        self.assertEqual(bad.status_code, 400)
+
+    def test_4_decompression_bomb_served_as_placeholder(self):
+        with mock.patch.object(Image, 'MAX_IMAGE_PIXELS', 1000):
+            response = self.client.get(reverse('news:proxy_image'),
+                                       {'url': self.origin + '/photo.png', 'w': 320, 'fmt': 'webp'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/png')
+        with open(image_proxy.placeholder_path(), 'rb') as placeholder:
+            self.assertEqual(b''.join(response.streaming_content), placeholder.read())
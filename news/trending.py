@@ -0,0 +1,37 @@
+"""
+Skor trending berita dengan peluruhan waktu (forward decay).
+
+Setiap view bernilai ``exp((t_view - EPOCH) / tau)``; skor yang disimpan adalah
+log dari jumlahnya. Karena semua berita memakai EPOCH yang sama, urutan skor ini
+sama dengan urutan skor yang sudah "meluruh" ke waktu sekarang, sehingga skor
+tidak perlu dihitung ulang berkala: cukup ditambah saat view ditulis.
+View yang baru (velocity tinggi) dan berita yang baru terbit bernilai lebih besar.
+"""
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db.models import F, Value
+from django.db.models.functions import Exp, Greatest, Least, Ln
+from django.utils import timezone
+
+EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+# Mengubah half-life berarti skor lama harus dihitung ulang (lihat migrasi 0003)
+HALF_LIFE = timedelta(hours=24)
+_TAU = HALF_LIFE.total_seconds() / math.log(2)
+
+
+def decay_weight(at):
+    return (at - EPOCH).total_seconds() / _TAU
+
+
+def initial_score(created_at, views=0):
+    """Skor awal: terbitnya berita dihitung sebagai satu view, ditambah view lama."""
+    return decay_weight(created_at) + math.log1p(views)
+
+
+def add_views_expression(amount, at=None):
+    """Ekspresi SQL ``log(exp(score) + amount * exp(weight))`` yang stabil secara numerik."""
+    contribution = Value(math.log(amount) + decay_weight(at or timezone.now()))
+    high = Greatest(F('trending_score'), contribution)
+    low = Least(F('trending_score'), contribution)
+    return high + Ln(Value(1.0) + Exp(low - high))
@@ -5,11 +5,15 @@ app_name = 'news'
 
 urlpatterns = [
     path('', views.news_list, name='news_list'),
+    path('hot/', views.hot_news, name='hot_news'),
+    path('search/', views.search_news, name='search_news'),
+    path('proxy-image/', views.proxy_image, name='proxy_image'),
     path('<int:pk>/', views.news_detail, name='news_detail'),
     path('add-news-ajax/', views.add_news_ajax, name='add_news_entry_ajax'),
     path('update-news-ajax/<int:pk>/', views.update_news_ajax, name='update_news_ajax'),
     path('delete-news-ajax/<int:pk>/', views.delete_news_ajax, name='delete_news_ajax'),
     path('create-news-flutter', views.create_news_flutter,name="create_news_flutter"),
     path('json/news_list', views.show_json, name="show_json_list"),
+    path('json/<int:pk>/', views.news_json_detail, name="show_json_detail"),
     
 ]
\ No newline at end of file
@@ -0,0 +1,138 @@
+"""
+Counter views berita.
+
+Mode default: setiap view langsung ``UPDATE ... SET news_views = news_views + 1``
+(bersama ``trending_score``, lihat news.trending) tanpa menyentuh kolom lain. Jika ``NEWS_VIEWS_BUFFERED = True``, view dikumpulkan di
+memori proses dan ditulis per batch setiap ``NEWS_VIEWS_FLUSH_INTERVAL`` detik
+(oleh request yang datang setelah interval lewat, thread latar, dan ``atexit``
+saat worker berhenti normal), sehingga artikel yang ramai tidak memicu satu
+UPDATE per pembaca. Batch yang gagal ditulis dikembalikan ke buffer dan dicoba
+lagi di flush berikutnya. View yang belum ditulis tetap hilang jika proses
+dibunuh paksa (SIGKILL/OOM), karena itu mode ini default mati.
+"""
+import atexit
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.db.models import F
+
+from .trending import add_views_expression
+
+_lock = threading.Lock()
+_pending = Counter()
+_last_flush = time.monotonic()
+# (pid, thread) flusher latar; pid dicek agar proses hasil fork membuat thread sendiri
+_flusher = None
+
+
+def is_buffered():
+    return getattr(settings, 'NEWS_VIEWS_BUFFERED', False)
+
+
+def flush_interval():
+    return getattr(settings, 'NEWS_VIEWS_FLUSH_INTERVAL', 5)
+
+
+def increment(news_ids, amount=1):
+    """Satu UPDATE untuk news_views dan trending_score sekaligus."""
+    from .models import News
+    News.objects.filter(pk__in=news_ids).update(
+        news_views=F('news_views') + amount,
+        trending_score=add_views_expression(amount),
+    )
+
+
+def record_view(news_id):
+    if not is_buffered():
+        increment([news_id])
+        return
+
+    _ensure_flusher()
+    with _lock:
+        _pending[news_id] += 1
+        due = time.monotonic() - _last_flush >= flush_interval()
+    if due:
+        try:
+            flush()
+        except DatabaseError:
+            # View sudah dikembalikan ke buffer; request pembaca tidak ikut gagal
+            pass
+
+
+def pending_views(news_id):
+    """View yang sudah tercatat tapi belum ditulis ke database."""
+    with _lock:
+        return _pending.get(news_id, 0)
+
+
+def flush():
+    """
+    Tulis semua view yang tertunda; satu UPDATE per jumlah view yang sama.
+    Jika UPDATE gagal, view yang belum tertulis dikembalikan ke buffer lalu
+    error-nya diteruskan.
+    """
+    global _last_flush
+    with _lock:
+        pending = dict(_pending)
+        _pending.clear()
+        _last_flush = time.monotonic()
+
+    ids_by_amount = defaultdict(list)
+    for news_id, amount in pending.items():
+        ids_by_amount[amount].append(news_id)
+
+    batches = list(ids_by_amount.items())
+    for index, (amount, news_ids) in enumerate(batches):
+        try:
+            increment(news_ids, amount)
+        except Exception:
+            with _lock:
+                for unwritten_amount, unwritten_ids in batches[index:]:
+                    for news_id in unwritten_ids:
+                        _pending[news_id] += unwritten_amount
+            raise
+    return pending
+
+
+def _flush_loop():
+    while True:
+        time.sleep(flush_interval())
+        with _lock:
+            idle = not _pending
+        if idle:
+            continue
+        try:
+            flush()
+        except Exception:
+            # sudah dikembalikan ke buffer, dicoba lagi di putaran berikutnya
+            pass
+        finally:
+            connection.close()
+
+
+def _ensure_flusher():
+    global _flusher
+    pid = os.getpid()
+    if _flusher and _flusher[0] == pid and _flusher[1].is_alive():
+        return
+    with _lock:
+        if _flusher and _flusher[0] == pid and _flusher[1].is_alive():
+            return
+        thread = threading.Thread(target=_flush_loop, name='news-view-flusher', daemon=True)
+        thread.start()
+        _flusher = (pid, thread)
+
+
+def _flush_on_exit():
+    try:
+        flush()
+    except Exception:
+        # Database bisa sudah tidak tersedia saat proses dimatikan
+        pass
+
+
+atexit.register(_flush_on_exit)
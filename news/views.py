@@ -1,13 +1,76 @@
+import base64
 import json
-from django.http import JsonResponse
+from datetime import datetime
+from django.db.models import Q
+from django.db.models.functions import Substr
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, JsonResponse
 from django.shortcuts import get_object_or_404, render
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST, require_http_methods
 from django.contrib.auth.decorators import login_required
 from .models import News
-import requests
+from . import image_proxy, search
+from django.utils.cache import parse_etags, patch_vary_headers
+from django.utils.dateparse import parse_datetime
 from django.utils.html import strip_tags
 
+HOT_FEED_SIZE = 5
+SEARCH_RESULTS_SIZE = 10
+NEWS_PAGE_SIZE = 12
+MAX_NEWS_PAGE_SIZE = 60
+EXCERPT_LENGTH = 120
+
+# sort -> (kolom urut, descending); tiap kombinasi punya index (category, kolom, id)
+SORT_FIELDS = {
+    '-created_at': ('created_at', True),
+    'views_desc': ('news_views', True),
+    'views_asc': ('news_views', False),
+    'trending': ('trending_score', True),
+}
+
+
+def encode_cursor(value, pk):
+    # isoformat() sendiri: DjangoJSONEncoder membuang presisi mikrodetik
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, pk])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor, field):
+    try:
+        value, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if field == 'created_at':
+            value = parse_datetime(value)
+        if value is None or isinstance(value, bool) or not isinstance(pk, int):
+            raise ValueError
+        return value, pk
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise ValueError('cursor tidak valid')
+
+
+def paginate_news(news_items, field, descending, cursor, limit):
+    """Keyset pagination urut (field, id); mengembalikan (rows, next_cursor)."""
+    if descending:
+        news_items = news_items.order_by(f'-{field}', '-id')
+        after = 'lt'
+    else:
+        news_items = news_items.order_by(field, 'id')
+        after = 'gt'
+
+    if cursor:
+        value, pk = decode_cursor(cursor, field)
+        news_items = news_items.filter(
+            Q(**{f'{field}__{after}': value}) | Q(**{field: value, f'id__{after}': pk})
+        )
+
+    rows = list(news_items[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][field], rows[-1]['id'])
+    return rows, next_cursor
+
 
 def news_list(request):
     category = request.GET.get('category')
@@ -19,37 +82,53 @@ def news_list(request):
         news_items = news_items.filter(category=category)
 
     # Sorting
-    if sort_by == 'views_asc':
-        order_field = 'news_views'
-    elif sort_by == 'views_desc':
-        order_field = '-news_views'
-    else:
-        order_field = '-created_at'
-    news_items = news_items.order_by(order_field)
+    order_field, descending = SORT_FIELDS.get(sort_by, SORT_FIELDS['-created_at'])
 
     if request.headers.get('x-requested-with') == 'XMLHttpRequest':
+        try:
+            limit = min(int(request.GET.get('limit', NEWS_PAGE_SIZE)), MAX_NEWS_PAGE_SIZE)
+            if limit < 1:
+                raise ValueError
+            # Hanya kolom yang dipakai kartu berita; content dipotong di database
+            rows, next_cursor = paginate_news(
+                news_items.values(
+                    'id', 'title', 'category', 'thumbnail', 'created_at', 'news_views',
+                    'trending_score', 'is_featured', 'user_id', 'user__username',
+                    excerpt=Substr('content', 1, EXCERPT_LENGTH),
+                ),
+                order_field, descending, request.GET.get('cursor'), limit,
+            )
+        except (ValueError, TypeError):
+            # TypeError: nilai cursor bukan angka untuk kolom numerik (mis. sort=trending)
+            return JsonResponse({"success": False, "message": "Parameter cursor/limit tidak valid."}, status=400)
+
+        category_labels = dict(News.CATEGORY_CHOICES)
         data = []
-        for n in news_items:
+        for n in rows:
             data.append({
-                "id": n.id,
-                "title": n.title,
-                "content": n.content,
-                "category": n.category,
-                "category_display": n.get_category_display(),
-                "thumbnail": n.thumbnail,
-                "created_at": n.created_at.strftime("%d %b %Y"),
-                "views": n.news_views,
-                "is_featured": n.is_featured,
-                "user_id": n.user.id if n.user else None,
-                "username": n.user.username if n.user else "Anonymous",
+                "id": n['id'],
+                "title": n['title'],
+                "excerpt": n['excerpt'],
+                "category": n['category'],
+                "category_display": category_labels.get(n['category'], n['category']),
+                "thumbnail": n['thumbnail'],
+                "created_at": n['created_at'].strftime("%d %b %Y"),
+                "views": n['news_views'],
+                "is_featured": n['is_featured'],
+                "user_id": n['user_id'],
+                "username": n['user__username'] or "Anonymous",
             })
         return JsonResponse({
             "news_items": data,
+            "next_cursor": next_cursor,
             "current_user_id": request.user.id if request.user.is_authenticated else None
         }, status=200)
     
+    news_items = news_items.select_related('user').order_by(
+        f'-{order_field}' if descending else order_field, '-id' if descending else 'id'
+    )
     context = {
-        'news_items': news_items,
+        'news_items': news_items[:NEWS_PAGE_SIZE],
         'category_choices': News.CATEGORY_CHOICES,
         'current_category': category,
         'current_sort': sort_by,
@@ -57,6 +136,54 @@ def news_list(request):
     return render(request, 'news.html', context)
 
 
+def news_json_detail(request, pk):
+    """Data lengkap satu berita (termasuk content) untuk form edit."""
+    n = get_object_or_404(News.objects.select_related('user'), pk=pk)
+    return JsonResponse({
+        "id": n.id,
+        "title": n.title,
+        "content": n.content,
+        "category": n.category,
+        "thumbnail": n.thumbnail,
+        "is_featured": n.is_featured,
+        "user_id": n.user_id,
+    }, status=200)
+
+
+def hot_news(request):
+    """Feed berita trending: ORDER BY trending_score LIMIT n lewat news_trending_idx."""
+    try:
+        limit = min(max(int(request.GET.get('limit', HOT_FEED_SIZE)), 1), 50)
+    except ValueError:
+        return JsonResponse({"success": False, "message": "Parameter limit tidak valid."}, status=400)
+
+    news_items = News.objects.order_by('-trending_score', '-id').values(
+        'id', 'title', 'category', 'thumbnail', 'news_views', 'created_at',
+    )[:limit]
+    data = [{
+        "id": n['id'],
+        "title": n['title'],
+        "category": n['category'],
+        "thumbnail": n['thumbnail'],
+        "views": n['news_views'],
+        "created_at": n['created_at'].strftime("%d %b %Y"),
+    } for n in news_items]
+    return JsonResponse({"news_items": data}, status=200)
+
+
+def search_news(request):
+    """Pencarian full-text judul + isi berita, hasil urut relevansi dan di-highlight."""
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return JsonResponse({"success": False, "message": "Parameter q wajib diisi."}, status=400)
+    try:
+        limit = min(max(int(request.GET.get('limit', SEARCH_RESULTS_SIZE)), 1), 50)
+    except ValueError:
+        return JsonResponse({"success": False, "message": "Parameter limit tidak valid."}, status=400)
+
+    return JsonResponse({"query": query, "results": search.search_news(query, limit)}, status=200)
+
+
 def news_detail(request, pk):
     news_item = get_object_or_404(News, pk=pk)
     news_item.increment_views()
@@ -162,17 +289,60 @@ def proxy_image(request):
     image_url = request.GET.get('url')
     if not image_url:
         return HttpResponse('No URL provided', status=400)
+    if not image_proxy.is_allowed_url(image_url):
+        return HttpResponse('URL tidak valid', status=400)
     
+    # ?w= dan/atau ?fmt= -> varian resize/transcode; tanpa keduanya gambar asli diteruskan
+    fmt = request.GET.get('fmt')
+    if fmt and fmt not in image_proxy.FORMATS:
+        return HttpResponse('Format tidak didukung', status=400)
     try:
-        response = requests.get(image_url, timeout=10)
-        response.raise_for_status()
-        
-        return HttpResponse(
-            response.content,
-            content_type=response.headers.get('Content-Type', 'image/jpeg')
-        )
-    except requests.RequestException as e:
-        return HttpResponse(f'Error fetching image: {str(e)}', status=500)
+        width = int(request.GET['w']) if request.GET.get('w') else None
+    except ValueError:
+        return HttpResponse('Parameter w tidak valid', status=400)
+    if width is not None and width < 1:
+        return HttpResponse('Parameter w tidak valid', status=400)
+    
+    negotiated = width is not None and not fmt
+    if negotiated:
+        fmt = image_proxy.negotiate_format(request.headers.get('Accept'))
+    # Dua percobaan: body bisa dihapus evict() proses lain di antara lookup dan open()
+    for attempt in range(2):
+        try:
+            if width is None and not fmt:
+                entry = image_proxy.get_original(image_url)
+            else:
+                entry = image_proxy.get_variant(image_url, width, fmt)
+        except image_proxy.ImageTooManyPixels:
+            # Gambar tidak di-decode; tampilkan placeholder agar thumbnail tidak kosong
+            response = FileResponse(open(image_proxy.placeholder_path(), 'rb'), content_type='image/png')
+            response['X-Content-Type-Options'] = 'nosniff'
+            response['Cache-Control'] = f'public, max-age={image_proxy.ttl()}'
+            return response
+        except image_proxy.ImageTooLarge as e:
+            return HttpResponse(f'Error fetching image: {str(e)}', status=413)
+        except image_proxy.ImageProxyError as e:
+            return HttpResponse(f'Error fetching image: {str(e)}', status=502)
+
+        if entry['content_type'] not in image_proxy.RASTER_TYPES:
+            # entry lama dari sebelum Content-Type divalidasi
+            return HttpResponse('Error fetching image: bukan gambar raster', status=502)
+        if entry['etag'] in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+            break
+        try:
+            response = FileResponse(open(entry['path'], 'rb'), content_type=entry['content_type'])
+            break
+        except FileNotFoundError:
+            # Anggap cache miss: percobaan berikutnya mengambil ulang dari origin
+            if attempt:
+                return HttpResponse('Error fetching image: cache berubah saat dibaca', status=502)
+    response['X-Content-Type-Options'] = 'nosniff'
+    response['ETag'] = entry['etag']
+    response['Cache-Control'] = f'public, max-age={image_proxy.ttl()}'
+    if negotiated:
+        patch_vary_headers(response, ['Accept'])
+    return response
     
 @csrf_exempt
 def create_news_flutter(request):
@@ -1,92 +1,107 @@
 import csv
 import os
-import re
 from django.core.management.base import BaseCommand
-from django.core.files import File
 from django.conf import settings
+from django.db import transaction
 from players.models import Player
 from clubs.models import Club
+from main import media_files
+from players import search
+from clubs import detail as club_detail
+from stats import analytics, leaderboards
+
+BATCH_SIZE = 500
+UPDATE_FIELDS = [
+    'position', 'citizenship', 'age', 'curr_goals', 'curr_assists',
+    'match_played', 'curr_cleansheet', 'profile_picture_url',
+]
+UPLOAD_TO = Player._meta.get_field('profile_picture_url').upload_to
 
 
 class Command(BaseCommand):
     help = 'Import data pemain dari CSV dan gambar profil dari static/img/player/'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--csv', default=os.path.join(settings.BASE_DIR, 'data', 'players.csv'),
+                            help='Path file CSV pemain')
+
     def handle(self, *args, **options):
-        csv_path = os.path.join(settings.BASE_DIR, 'data', 'players.csv')
+        csv_path = options['csv']
         img_dir = os.path.join(settings.BASE_DIR, 'static', 'img', 'player')
+        verbose = options['verbosity'] >= 2
 
         if not os.path.exists(csv_path):
             self.stderr.write(self.style.ERROR(f"❌ File {csv_path} tidak ditemukan."))
             return
 
-        with open(csv_path, newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
+        # Semua lookup dimuat sekali: klub, pemain yang sudah ada, dan daftar file gambar
+        clubs = {club.nama_klub: club for club in Club.objects.all()}
+        existing = {(player.name, player.team_id): player for player in Player.objects.all()}
+        images = media_files.index_images(img_dir)
 
-            for row in reader:
+        to_create, to_update = [], []
+        seen = set()
+
+        with open(csv_path, newline='', encoding='utf-8') as csvfile:
+            for row in csv.DictReader(csvfile):
                 name = row['name'].strip()
-                position = row['position'].strip()
                 team_name = row['team'].strip()
-                citizenship = row['citizenship'].strip()
-                age = int(row['age'])
-                curr_goals = int(row['curr_goals'])
-                curr_assists = int(row['curr_assists'])
-                match_played = int(row['match_played'])
-                curr_cleansheet = int(row['curr_cleansheet'])
 
                 # --- 🔍 Cari klub ---
-                try:
-                    club = Club.objects.get(nama_klub=team_name)
-                except Club.DoesNotExist:
+                club = clubs.get(team_name)
+                if club is None:
                     self.stderr.write(self.style.WARNING(f"⚠️ Klub '{team_name}' tidak ditemukan. Lewati {name}."))
                     continue
+                if (name, club.id) in seen:
+                    self.stderr.write(self.style.WARNING(f"⚠️ {name} ({team_name}) muncul lebih dari sekali. Lewati."))
+                    continue
+                seen.add((name, club.id))
+
+                values = {
+                    'position': row['position'].strip(),
+                    'citizenship': row['citizenship'].strip(),
+                    'age': int(row['age']),
+                    'curr_goals': int(row['curr_goals']),
+                    'curr_assists': int(row['curr_assists']),
+                    'match_played': int(row['match_played']),
+                    'curr_cleansheet': int(row['curr_cleansheet']),
+                }
 
-                # --- 🔍 Cari foto profil berdasarkan nama pemain ---
-                normalized_name = re.sub(r'\s+', '_', name)
-                img_path = None
-
-                for ext in ['.png', '.jpg', '.jpeg', '.webp']:
-                    candidate = os.path.join(img_dir, f"{normalized_name}{ext}")
-                    if os.path.exists(candidate):
-                        img_path = candidate
-                        break
-                    candidate_lower = os.path.join(img_dir, f"{normalized_name.lower()}{ext}")
-                    if os.path.exists(candidate_lower):
-                        img_path = candidate_lower
-                        break
-
-                # --- 🧱 Simpan atau update Player ---
-                player, created = Player.objects.get_or_create(
-                    name=name,
-                    team=club,
-                    defaults={
-                        'position': position,
-                        'citizenship': citizenship,
-                        'age': age,
-                        'curr_goals': curr_goals,
-                        'curr_assists': curr_assists,
-                        'match_played': match_played,
-                        'curr_cleansheet': curr_cleansheet,
-                    }
-                )
-
-                if not created:
-                    player.position = position
-                    player.citizenship = citizenship
-                    player.age = age
-                    player.curr_goals = curr_goals
-                    player.curr_assists = curr_assists
-                    player.match_played = match_played
-                    player.curr_cleansheet = curr_cleansheet
-
-                # --- 🖼️ Simpan gambar jika ditemukan ---
+                player = existing.get((name, club.id))
+
+                # --- 🖼️ Gambar hanya disalin jika isinya berubah ---
+                img_path = media_files.find_image(images, name)
                 if img_path:
-                    with open(img_path, 'rb') as f:
-                        player.profile_picture_url.save(os.path.basename(img_path), File(f), save=False)
+                    digest = media_files.content_hash(img_path)
+                    current = player.profile_picture_url.name if player else None
+                    if current != media_files.media_name(img_path, UPLOAD_TO, digest):
+                        values['profile_picture_url'] = media_files.store_by_hash(img_path, UPLOAD_TO, digest)
                 else:
                     self.stdout.write(self.style.WARNING(f"⚠️ Foto untuk {name} tidak ditemukan."))
 
-                player.save()
-                status = "🟢 Dibuat" if created else "🟡 Diperbarui"
-                self.stdout.write(self.style.SUCCESS(f"{status}: {player.name} ({club.nama_klub})"))
+                # --- 🧱 Bandingkan dengan data di database ---
+                if player is None:
+                    to_create.append(Player(name=name, search_name=search.normalize(name), team=club, **values))
+                    if verbose:
+                        self.stdout.write(self.style.SUCCESS(f"🟢 Dibuat: {name} ({club.nama_klub})"))
+                elif any(getattr(player, field) != value for field, value in values.items()):
+                    for field, value in values.items():
+                        setattr(player, field, value)
+                    to_update.append(player)
+                    if verbose:
+                        self.stdout.write(self.style.SUCCESS(f"🟡 Diperbarui: {name} ({club.nama_klub})"))
+
+        with transaction.atomic():
+            Player.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+            Player.objects.bulk_update(to_update, UPDATE_FIELDS, batch_size=BATCH_SIZE)
+        if to_create or to_update:
+            # bulk query tidak memicu signal invalidasi cache analitik, statistik, pencarian dan detail klub
+            analytics.invalidate()
+            leaderboards.invalidate()
+            search.invalidate()
+            club_detail.invalidate()
 
-        self.stdout.write(self.style.SUCCESS("✅ Import pemain selesai!"))
+        unchanged = len(seen) - len(to_create) - len(to_update)
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Import pemain selesai! {len(to_create)} dibuat, {len(to_update)} diperbarui, {unchanged} tidak berubah."
+        ))
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0004_club_goals_standings_index'),
+        ('players', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['-curr_goals'], name='player_goals_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['-curr_assists'], name='player_assists_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['-curr_cleansheet'], name='player_cleansheet_idx'),
+        ),
+    ]
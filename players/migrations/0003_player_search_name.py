@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:36
+
+import unicodedata
+
+from django.db import migrations, models
+
+
+def normalize(name):
+    # Salinan normalisasi players.search saat migrasi ini dibuat; migrasi tidak
+    # boleh bergantung pada kode aplikasi yang bisa berubah
+    text = unicodedata.normalize('NFKD', (name or '').lower())
+    return ' '.join(''.join(ch for ch in text if not unicodedata.combining(ch)).split())
+
+
+def fill_search_name(apps, schema_editor):
+    Player = apps.get_model('players', 'Player')
+    players = list(Player.objects.only('id', 'name'))
+    for player in players:
+        player.search_name = normalize(player.name)
+    Player.objects.bulk_update(players, ['search_name'], batch_size=500)
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS player_search_name_trgm'
+        ' ON players_player USING GIN (search_name gin_trgm_ops)'
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS player_search_name_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('players', '0002_player_stat_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='player',
+            name='search_name',
+            field=models.CharField(default='', editable=False, max_length=100),
+        ),
+        migrations.RunPython(fill_search_name, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
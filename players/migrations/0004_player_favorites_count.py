@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:38
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_favorites_count(apps, schema_editor):
+    # Isi dari baris FavoritePlayer yang sudah ada (satu UPDATE, seperti stats.favorites.reconcile_counts)
+    Player = apps.get_model('players', 'Player')
+    FavoritePlayer = apps.get_model('stats', 'FavoritePlayer')
+    Player.objects.update(favorites_count=Coalesce(Subquery(
+        FavoritePlayer.objects.filter(player=OuterRef('pk'))
+        .values('player').annotate(total=Count('id')).values('total')
+    ), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('players', '0003_player_search_name'),
+        ('stats', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='player',
+            name='favorites_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_favorites_count, migrations.RunPython.noop),
+    ]
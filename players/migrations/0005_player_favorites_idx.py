@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0004_club_goals_standings_index'),
+        ('players', '0004_player_favorites_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['-favorites_count', 'name'], name='player_favorites_idx'),
+        ),
+    ]
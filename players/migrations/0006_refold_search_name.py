@@ -0,0 +1,33 @@
+import unicodedata
+
+from django.db import migrations
+
+# Salinan players.search.fold saat migrasi ini dibuat (transliterasi ß/ø/ł/...)
+TRANSLITERATION = str.maketrans({
+    'ß': 'ss', 'ø': 'o', 'ł': 'l', 'đ': 'd', 'ð': 'd', 'æ': 'ae', 'œ': 'oe', 'þ': 'th', 'ı': 'i',
+})
+
+
+def normalize(name):
+    text = unicodedata.normalize('NFKD', (name or '').lower().translate(TRANSLITERATION))
+    return ' '.join(''.join(ch for ch in text if not unicodedata.combining(ch)).split())
+
+
+def refold_search_name(apps, schema_editor):
+    Player = apps.get_model('players', 'Player')
+    players = [player for player in Player.objects.only('id', 'name', 'search_name')
+               if player.search_name != normalize(player.name)]
+    for player in players:
+        player.search_name = normalize(player.name)
+    Player.objects.bulk_update(players, ['search_name'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('players', '0005_player_favorites_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(refold_search_name, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from clubs.models import Club
+import re
 import uuid
 
 # Create your models here.
@@ -15,6 +16,40 @@ class Player(models.Model):
     curr_assists = models.PositiveIntegerField(default=0)
     match_played = models.PositiveIntegerField(default=0)
     curr_cleansheet = models.PositiveIntegerField(default=0)
+    # Jumlah user yang memfavoritkan, dijaga lewat F() di stats.favorites
+    favorites_count = models.PositiveIntegerField(default=0, editable=False)
+    # Nama huruf kecil tanpa aksen untuk pencarian (players.search)
+    search_name = models.CharField(max_length=100, default='', editable=False)
+
+    class Meta:
+        indexes = [
+            # Tabel top 10 statistics_api (stats.leaderboards)
+            models.Index(fields=['-curr_goals'], name='player_goals_idx'),
+            models.Index(fields=['-curr_assists'], name='player_assists_idx'),
+            models.Index(fields=['-curr_cleansheet'], name='player_cleansheet_idx'),
+            # "Paling difavoritkan" (stats.favorites.most_favorited)
+            models.Index(fields=['-favorites_count', 'name'], name='player_favorites_idx'),
+        ]
 
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+    def save(self, **kwargs):
+        from .search import normalize
+        self.search_name = normalize(self.name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not self._state.adding and not kwargs.get('force_insert'):
+            # favorites_count hanya diubah lewat F() (stats.favorites); save penuh jangan
+            # menimpanya dengan nilai basi di memori (mis. admin mengedit pemain)
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'favorites_count'
+            ]
+        elif update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'search_name'}
+        super().save(**kwargs)
+
+    @property
+    def static_image(self):
+        """Path foto di static/img/player tanpa ekstensi (penamaan sama dengan import_players)."""
+        return 'img/player/' + re.sub(r'\s+', '_', self.name)
\ No newline at end of file
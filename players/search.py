@@ -0,0 +1,153 @@
+"""
+Pencarian nama pemain (search-as-you-type), tidak peka huruf besar dan aksen.
+
+Nama di-fold (``fold``) ke kolom ``Player.search_name`` saat disimpan: huruf
+kecil, huruf tanpa dekomposisi Unicode ditransliterasi (ß -> ss, ø -> o, ...),
+lalu diakritik dibuang, sehingga "Mitrovic" cocok dengan "Mitrović", "gross"
+dengan "Groß", dan "odegaard" dengan "Ødegaard". Jika ``fold`` diubah, buat
+data migration yang mengisi ulang ``search_name`` (lihat migrasi 0006).
+
+* PostgreSQL: GIN index ``gin_trgm_ops`` (pg_trgm) di ``search_name`` membuat
+  ``LIKE '%q%'`` tidak perlu full scan.
+* SQLite: index prefix di memori proses (awalan tiap kata -> id pemain) plus
+  scan substring atas daftar nama yang sudah di-fold. Index dibangun ulang jika
+  token versi di cache Django berubah (signal save/delete Player, import).
+  Perubahan ``favorites_count`` lewat F() tidak membangun ulang index, jadi
+  urutan popularitas di SQLite bisa sedikit tertinggal sampai rebuild berikutnya.
+
+Hasil diurutkan: nama diawali query, lalu kata diawali query, lalu sisanya;
+dalam tiap kelompok pemain yang lebih populer (jumlah favorit, lalu laga
+dimainkan) lebih dulu.
+"""
+import threading
+import unicodedata
+import uuid
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Case, IntegerField, Value, When
+
+VERSION_KEY = 'players:search:version'
+MAX_PREFIX_LENGTH = 20
+# Popularitas: jumlah favorit, lalu laga dimainkan
+POPULARITY_FIELDS = ('favorites_count', 'match_played')
+
+# Huruf yang tidak punya dekomposisi NFKD, jadi tidak ikut kehilangan aksen
+TRANSLITERATION = str.maketrans({
+    'ß': 'ss', 'ø': 'o', 'ł': 'l', 'đ': 'd', 'ð': 'd', 'æ': 'ae', 'œ': 'oe', 'þ': 'th', 'ı': 'i',
+})
+
+_lock = threading.Lock()
+# (versi, nama per id, popularitas per id, awalan kata -> set id)
+_index = None
+
+
+def fold(text):
+    text = unicodedata.normalize('NFKD', text.lower().translate(TRANSLITERATION))
+    return ''.join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def normalize(name):
+    return ' '.join(fold(name or '').split())
+
+
+def invalidate():
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def _version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(VERSION_KEY, version, None):
+            version = cache.get(VERSION_KEY, version)
+    return version
+
+
+def _rank(search_name, query):
+    if search_name.startswith(query):
+        return 0
+    if f' {query}' in search_name:
+        return 1
+    return 2
+
+
+def _load_index():
+    from .models import Player
+
+    global _index
+    version = _version()
+    index = _index
+    if index and index[0] == version:
+        return index
+
+    with _lock:
+        if _index and _index[0] == version:
+            return _index
+        names, popularity, prefixes = {}, {}, {}
+        for player_id, search_name, *score in Player.objects.values_list('id', 'search_name', *POPULARITY_FIELDS):
+            names[player_id] = search_name
+            popularity[player_id] = tuple(-value for value in score)
+            for word in search_name.split():
+                for length in range(1, min(len(word), MAX_PREFIX_LENGTH) + 1):
+                    prefixes.setdefault(word[:length], set()).add(player_id)
+        _index = (version, names, popularity, prefixes)
+        return _index
+
+
+def _memory_search(query, limit):
+    _, names, popularity, prefixes = _load_index()
+    words = query.split()
+
+    # Setiap kata query harus menjadi awalan salah satu kata di nama
+    candidates = None
+    for word in words:
+        ids = prefixes.get(word[:MAX_PREFIX_LENGTH], set())
+        candidates = ids if candidates is None else candidates & ids
+
+    if len(candidates) < limit:
+        # Substring di tengah kata, mis. "trovi" -> "mitrovic"
+        # (set baru, bukan |=, agar set di index tidak ikut berubah)
+        candidates = candidates | {player_id for player_id, name in names.items() if query in name}
+
+    return sorted(
+        candidates,
+        key=lambda player_id: (_rank(names[player_id], query), popularity[player_id], names[player_id]),
+    )[:limit]
+
+
+def _database_ids(query, limit):
+    from .models import Player
+
+    qs = Player.objects.all()
+    for word in query.split():
+        qs = qs.filter(search_name__contains=word)
+    return list(qs.annotate(
+        rank=Case(
+            When(search_name__startswith=query, then=Value(0)),
+            When(search_name__contains=f' {query}', then=Value(1)),
+            default=Value(2),
+            output_field=IntegerField(),
+        ),
+    ).order_by('rank', *(f'-{field}' for field in POPULARITY_FIELDS), 'search_name').values_list('id', flat=True)[:limit])
+
+
+def search_players(query, limit=10):
+    """Pemain (dengan ``team`` sudah di-join) yang cocok dengan ``query``, urut relevansi."""
+    from .models import Player
+
+    query = normalize(query)
+    if not query:
+        return []
+    if connection.vendor == 'postgresql':
+        ids = _database_ids(query, limit)
+    else:
+        ids = _memory_search(query, limit)
+    players = Player.objects.select_related('team').in_bulk(ids)
+    return [players[player_id] for player_id in ids if player_id in players]
+
+
+def clear_cache():
+    global _index
+    with _lock:
+        _index = None
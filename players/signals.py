@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import search
+from .models import Player
+
+
+@receiver([post_save, post_delete], sender=Player)
+def invalidate_search_index(sender, **kwargs):
+    search.invalidate()
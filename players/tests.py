@@ -1,15 +1,34 @@
-from django.test import TestCase
+import csv
+import os
+import shutil
+import tempfile
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 from .models import Player
+from . import search
+from .search import search_players
+from stats.favorites import reconcile_counts
+from stats.models import FavoritePlayer
 from clubs.models import Club
 from PIL import Image
 import io
+import json
 from .views import show_player_detail, show_player_main
 
 # Create your tests here.
 class PlayerTests(TestCase):
     def setUp(self):
+        # Thumbnail upload jangan sampai menulis ke MEDIA_ROOT asli
+        self.media_root = tempfile.mkdtemp()
+        self.media_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.media_override.enable()
+
         self.image = Image.new('RGB', (100, 100), color='red')  # Create a red square
         img_io = io.BytesIO()
         self.image.save(img_io, format='PNG')
@@ -90,4 +109,252 @@ class PlayerTests(TestCase):
 
     def tearDown(self):
         self.team.delete()
-        return super().tearDown()
\ No newline at end of file
+        self.media_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+        return super().tearDown()
+
+class ImportPlayersTest(TestCase):
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.base_dir, True)
+        settings_override = override_settings(BASE_DIR=self.base_dir, MEDIA_ROOT=os.path.join(self.base_dir, 'media'))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        img_dir = os.path.join(self.base_dir, 'static', 'img', 'player')
+        os.makedirs(img_dir)
+        self.photo = os.path.join(img_dir, 'Bukayo_Saka.png')
+        Image.new('RGB', (50, 50), color='red').save(self.photo)
+
+        self.csv_path = os.path.join(self.base_dir, 'players.csv')
+        self.write_csv([
+            ['Bukayo Saka', 'Forward', 'Arsenal', 'English', 22, 4, 3, 10, 3],
+            ['David Raya', 'Goalkeeper', 'Arsenal', 'Spanish', 28, 0, 0, 10, 5],
+            ['Pemain Tanpa Klub', 'Forward', 'Klub Fiktif', 'English', 20, 0, 0, 0, 0],
+        ])
+        Club.objects.create(nama_klub='Arsenal')
+
+    def write_csv(self, rows):
+        with open(self.csv_path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(['name', 'position', 'team', 'citizenship', 'age', 'curr_goals',
+                             'curr_assists', 'match_played', 'curr_cleansheet'])
+            writer.writerows(rows)
+
+    def run_import(self):
+        out = io.StringIO()
+        call_command('import_players', csv=self.csv_path, stdout=out, stderr=io.StringIO())
+        return out.getvalue()
+
+    def media_files(self):
+        return os.listdir(os.path.join(self.base_dir, 'media', 'player_thumbnails'))
+
+    def test_import_is_bulk_and_idempotent(self):
+        with self.assertNumQueries(5):
+            output = self.run_import()
+        self.assertIn('2 dibuat, 0 diperbarui, 0 tidak berubah', output)
+        saka = Player.objects.get(name='Bukayo Saka')
+        self.assertTrue(saka.profile_picture_url.name.startswith('player_thumbnails/Bukayo_Saka.'))
+        self.assertFalse(Player.objects.get(name='David Raya').profile_picture_url)
+
+        # Run kedua tanpa perubahan: tidak ada tulis ke database maupun media
+        output = self.run_import()
+        self.assertIn('0 dibuat, 0 diperbarui, 2 tidak berubah', output)
+        self.assertEqual(len(self.media_files()), 1)
+
+    def test_changed_rows_and_images_updated(self):
+        self.run_import()
+        self.write_csv([['Bukayo Saka', 'Forward', 'Arsenal', 'English', 22, 9, 3, 11, 3]])
+        Image.new('RGB', (50, 50), color='blue').save(self.photo)
+
+        output = self.run_import()
+        self.assertIn('0 dibuat, 1 diperbarui', output)
+        saka = Player.objects.get(name='Bukayo Saka')
+        self.assertEqual((saka.curr_goals, saka.match_played), (9, 11))
+        self.assertEqual(len(self.media_files()), 2)
+
+
+class PlayerSearchTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        club = Club.objects.create(nama_klub='Fulham')
+        for name, played in (('Aleksandar Mitrović', 10), ('Mitchell Dijks', 30), ('Emile Smith Rowe', 5), ('Amadou Mitrovic', 1)):
+            Player.objects.create(name=name, position='FW', team=club, citizenship='-', match_played=played)
+
+    def names(self, query):
+        return [p.name for p in search_players(query)]
+
+    def test_accent_insensitive_and_ranked(self):
+        self.assertEqual(Player.objects.get(name='Aleksandar Mitrović').search_name, 'aleksandar mitrovic')
+        # awalan kata dulu, lalu popularitas (laga dimainkan)
+        self.assertEqual(self.names('MITROVIC'), ['Aleksandar Mitrović', 'Amadou Mitrovic'])
+        # substring di tengah kata ("smith") paling akhir
+        self.assertEqual(self.names('mit'), ['Mitchell Dijks', 'Aleksandar Mitrović', 'Amadou Mitrovic', 'Emile Smith Rowe'])
+        self.assertEqual(self.names('trovi'), ['Aleksandar Mitrović', 'Amadou Mitrovic'])
+
+    def test_transliterates_letters_without_decomposition(self):
+        club = Club.objects.get(nama_klub='Fulham')
+        for name in ('Pascal Groß', 'Martin Ødegaard'):
+            Player.objects.create(name=name, position='MF', team=club, citizenship='-')
+        self.assertEqual(self.names('gross'), ['Pascal Groß'])
+        self.assertEqual(self.names('odegaard'), ['Martin Ødegaard'])
+        self.assertEqual(self.names('ØDEGAARD'), ['Martin Ødegaard'])
+        self.assertEqual(self.names('smith ro'), ['Emile Smith Rowe'])
+        self.assertEqual(self.names(' '), [])
+
+    def test_index_refreshed_after_save(self):
+        self.assertEqual(self.names('rowe'), ['Emile Smith Rowe'])
+        Player.objects.create(name='Rowe Junior', position='MF', team=Club.objects.get(), citizenship='-')
+        self.assertEqual(self.names('rowe'), ['Rowe Junior', 'Emile Smith Rowe'])
+
+    def test_search_api_single_query_per_result_page(self):
+        User.objects.create_user(username='pencari', password='password123')
+        self.client.login(username='pencari', password='password123')
+        self.names('a')  # bangun index
+        with self.assertNumQueries(3):  # session, user, pemain + klub
+            response = self.client.get(reverse('stats:search_player_api'), {'q': 'mitrovic'})
+        self.assertEqual([p['club'] for p in response.json()['players']], ['Fulham', 'Fulham'])
+
+
+class FavoriteBatchApiTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        club = Club.objects.create(nama_klub='Arsenal')
+        self.saka, self.rice, self.odegaard = [
+            Player.objects.create(name=name, position='MF', team=club, citizenship='-')
+            for name in ('Saka', 'Rice', 'Odegaard')
+        ]
+        self.user = User.objects.create_user(username='fans', password='password123')
+        self.client.login(username='fans', password='password123')
+        self.url = reverse('stats:favorite_batch_api')
+
+    def post(self, payload):
+        return self.client.post(self.url, json.dumps(payload), content_type='application/json')
+
+    def counts(self):
+        return list(Player.objects.order_by('name').values_list('name', 'favorites_count'))
+
+    def test_add_remove_and_annotate_in_one_request(self):
+        response = self.post({'add': [str(self.saka.id), str(self.rice.id)], 'reasons': {str(self.saka.id): 'Starboy'}})
+        self.assertEqual(response.json(), {'added': 2, 'removed': 0, 'updated': 0})
+        # menambah yang sudah ada tidak menaikkan counter dua kali
+        response = self.post({
+            'add': [str(self.saka.id), str(self.odegaard.id)],
+            'remove': [str(self.rice.id)],
+            'reasons': {str(self.saka.id): 'Kapten masa depan'},
+        })
+        self.assertEqual(response.json(), {'added': 1, 'removed': 1, 'updated': 1})
+        self.assertEqual(self.counts(), [('Odegaard', 1), ('Rice', 0), ('Saka', 1)])
+
+        favorites = self.client.get(reverse('stats:favorite_api')).json()['favorites']
+        self.assertEqual({f['name']: f['reason'] for f in favorites}, {'Saka': 'Kapten masa depan', 'Odegaard': ''})
+        top = self.client.get(reverse('stats:most_favorited_api')).json()['players']
+        self.assertEqual([p['name'] for p in top], ['Odegaard', 'Saka'])
+
+    def test_remove_never_drives_counter_negative(self):
+        self.post({'add': [str(self.saka.id)]})
+        Player.objects.filter(pk=self.saka.pk).update(favorites_count=0)  # counter sudah drift
+        response = self.post({'remove': [str(self.saka.id)]})
+        self.assertEqual(response.json()['removed'], 1)
+        self.assertEqual(Player.objects.get(pk=self.saka.pk).favorites_count, 0)
+
+    def test_invalid_payload(self):
+        self.assertEqual(self.post({'add': ['bukan-uuid']}).status_code, 400)
+        self.assertEqual(self.post({'reasons': {str(self.saka.id): 'x' * 151}}).status_code, 400)
+
+    def test_list_cached_and_invalidated_by_toggle(self):
+        url = reverse('stats:favorite_api')
+        self.assertEqual(self.client.get(url).json()['favorites'], [])
+        with self.assertNumQueries(2):  # session + user, daftar dari cache
+            self.client.get(url)
+
+        response = self.client.post(url, json.dumps({'player_id': str(self.rice.id)}), content_type='application/json')
+        self.assertEqual(response.json()['status'], 'added')
+        self.assertEqual([f['name'] for f in self.client.get(url).json()['favorites']], ['Rice'])
+
+        response = self.client.post(url, json.dumps({'player_id': str(self.rice.id)}), content_type='application/json')
+        self.assertEqual(response.json()['status'], 'removed')
+        self.assertEqual(self.client.get(url).json()['favorites'], [])
+        self.assertEqual(Player.objects.get(name='Rice').favorites_count, 0)
+
+
+class FavoriteCountReconcileTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        club = Club.objects.create(nama_klub='Arsenal')
+        self.saka = Player.objects.create(name='Saka', position='FW', team=club, citizenship='-')
+        self.sakai = Player.objects.create(name='Sakai', position='DF', team=club, citizenship='-', match_played=30)
+
+    def test_reconcile_fixes_drift_in_one_query(self):
+        for i in range(2):
+            user = User.objects.create_user(username=f'fans{i}', password='password123')
+            FavoritePlayer.objects.create(user=user, player=self.saka)
+        # drift: counter tidak mengikuti baris (mis. hapus lewat raw SQL)
+        Player.objects.filter(pk=self.saka.pk).update(favorites_count=0)
+        Player.objects.filter(pk=self.sakai.pk).update(favorites_count=5)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(reconcile_counts(), 2)
+        self.assertEqual(dict(Player.objects.values_list('name', 'favorites_count')), {'Saka': 2, 'Sakai': 0})
+
+        out = io.StringIO()
+        call_command('reconcile_favorites', stdout=out)
+        self.assertIn('0 pemain diperbaiki', out.getvalue())
+
+    def test_cascade_delete_decrements_counter(self):
+        user = User.objects.create_user(username='fans', password='password123')
+        FavoritePlayer.objects.create(user=user, player=self.saka)
+
+        user.delete()
+        self.assertEqual(Player.objects.get(pk=self.saka.pk).favorites_count, 0)
+
+    def test_create_outside_service_increments_counter(self):
+        user = User.objects.create_user(username='admin-fans', password='password123')
+        FavoritePlayer.objects.create(user=user, player=self.saka)
+        self.assertEqual(Player.objects.get(pk=self.saka.pk).favorites_count, 1)
+
+    def test_full_save_keeps_concurrent_counter_updates(self):
+        stale = Player.objects.get(pk=self.saka.pk)
+        Player.objects.filter(pk=self.saka.pk).update(favorites_count=3)
+        stale.name = 'Bukayo Saka'
+        stale.save()
+        saka = Player.objects.get(pk=self.saka.pk)
+        self.assertEqual((saka.name, saka.search_name, saka.favorites_count), ('Bukayo Saka', 'bukayo saka', 3))
+
+    def test_search_ranks_by_favorites_before_matches_played(self):
+        self.assertEqual([p.name for p in search_players('sak')], ['Sakai', 'Saka'])
+        Player.objects.filter(pk=self.saka.pk).update(favorites_count=3)
+        search.invalidate()
+        self.assertEqual([p.name for p in search_players('sak')], ['Saka', 'Sakai'])
+
+
+class FavoritesCountMigrationTest(TransactionTestCase):
+    migrate_from = [('players', '0003_player_search_name'), ('stats', '0001_initial')]
+    migrate_to = [('players', '0004_player_favorites_count')]
+
+    def tearDown(self):
+        # Kembalikan skema ke migrasi terbaru untuk test berikutnya
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_existing_favorites_are_counted(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_from)
+        old_apps = executor.loader.project_state(self.migrate_from).apps
+        club = old_apps.get_model('clubs', 'Club').objects.create(nama_klub='Arsenal')
+        OldPlayer = old_apps.get_model('players', 'Player')
+        saka = OldPlayer.objects.create(name='Saka', position='FW', team=club, citizenship='-')
+        OldPlayer.objects.create(name='Rice', position='MF', team=club, citizenship='-')
+        OldUser = old_apps.get_model('auth', 'User')
+        OldFavorite = old_apps.get_model('stats', 'FavoritePlayer')
+        for i in range(2):
+            OldFavorite.objects.create(user=OldUser.objects.create(username=f'fans{i}'), player=saka)
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_to)
+        new_apps = executor.loader.project_state(self.migrate_to).apps
+        counts = dict(new_apps.get_model('players', 'Player').objects.values_list('name', 'favorites_count'))
+        self.assertEqual(counts, {'Saka': 2, 'Rice': 0})
@@ -0,0 +1,150 @@
+"""
+Analitik klub per musim dari hasil ``Match`` + ``MatchStats`` dan statistik pemain.
+
+Seluruh pertandingan yang sudah dimainkan dimuat dalam satu query (LEFT JOIN ke
+statistiknya), statistik pemain dalam satu GROUP BY per klub, lalu semua metrik
+turunan dihitung dalam satu lintasan di Python: konversi tembakan, poin per
+laga dan proyeksi poin, form 5 laga terakhir, serta split kandang/tandang.
+
+Hasilnya disimpan di cache Django (``CACHES``) sampai
+kickoff berikutnya (saat itu satu laga lagi terhitung "sudah dimainkan"; paling
+lama ``MAX_TIMEOUT``) dan dihapus lebih awal oleh signal save/delete ``Match``/``MatchStats``/``Player``/
+``Club`` (stats.signals) atau oleh command import yang memakai bulk query.
+"""
+import math
+
+from django.core.cache import cache
+from django.db.models import Sum
+from django.utils import timezone
+
+from clubs.models import Club
+from matches.models import Match
+from players.models import Player
+
+CACHE_KEY = 'stats:club_analytics'
+FORM_WINDOW = 5
+MAX_TIMEOUT = 24 * 60 * 60
+POINTS = {'W': 3, 'D': 1, 'L': 0}
+
+
+def invalidate():
+    cache.delete(CACHE_KEY)
+
+
+def _load_matches(now):
+    return Match.objects.filter(match_date__lte=now).order_by('match_date', 'id').values_list(
+        'home_team', 'away_team', 'home_score', 'away_score',
+        'stats__home_shots', 'stats__away_shots',
+        'stats__home_shots_on_target', 'stats__away_shots_on_target',
+    )
+
+
+def _side():
+    return {'played': 0, 'points': 0, 'goals_for': 0, 'goals_against': 0}
+
+
+def _empty(club):
+    return {
+        'club': club.nama_klub,
+        'club_logo': club.logo.url if club.logo else '',
+        'club_image': f'img/club/{club.logo_filename}',
+        'results': [],
+        'shots': 0,
+        'shots_on_target': 0,
+        'goals_with_stats': 0,
+        'home': _side(),
+        'away': _side(),
+    }
+
+
+def compute(now=None):
+    """Analitik semua klub, urut poin lalu selisih gol (tanpa cache)."""
+    now = now or timezone.now()
+    clubs = {club.nama_klub: _empty(club) for club in Club.objects.all()}
+
+    for home, away, home_score, away_score, home_shots, away_shots, home_sot, away_sot in _load_matches(now):
+        for name, side, scored, conceded, shots, on_target in (
+            (home, 'home', home_score, away_score, home_shots, home_sot),
+            (away, 'away', away_score, home_score, away_shots, away_sot),
+        ):
+            row = clubs.get(name)
+            if row is None:
+                continue
+            result = 'W' if scored > conceded else 'D' if scored == conceded else 'L'
+            row['results'].append(result)
+            split = row[side]
+            split['played'] += 1
+            split['points'] += POINTS[result]
+            split['goals_for'] += scored
+            split['goals_against'] += conceded
+            # Konversi hanya dari laga yang punya statistik tembakan
+            if shots is not None:
+                row['shots'] += shots
+                row['shots_on_target'] += on_target
+                row['goals_with_stats'] += scored
+
+    player_totals = Player.objects.values('team__nama_klub').annotate(
+        total_goals=Sum('curr_goals'),
+        total_assists=Sum('curr_assists'),
+        total_cleansheet=Sum('curr_cleansheet'),
+    ).order_by()
+    for totals in player_totals:
+        row = clubs.get(totals.pop('team__nama_klub'))
+        if row is not None:
+            row.update({key: value or 0 for key, value in totals.items()})
+
+    season_length = 2 * (len(clubs) - 1)
+    result = []
+    for row in clubs.values():
+        results = row.pop('results')
+        shots = row.pop('shots')
+        goals_with_stats = row.pop('goals_with_stats')
+        played = len(results)
+        points = row['home']['points'] + row['away']['points']
+        goals_for = row['home']['goals_for'] + row['away']['goals_for']
+        goals_against = row['home']['goals_against'] + row['away']['goals_against']
+        points_per_match = points / played if played else 0.0
+        form = results[-FORM_WINDOW:]
+        row.update({
+            'played': played,
+            'wins': results.count('W'),
+            'draws': results.count('D'),
+            'losses': results.count('L'),
+            'points': points,
+            'goals_for': goals_for,
+            'goals_against': goals_against,
+            'goal_difference': goals_for - goals_against,
+            'shot_conversion': round(goals_with_stats / shots, 3) if shots else 0.0,
+            'shot_accuracy': round(row.pop('shots_on_target') / shots, 3) if shots else 0.0,
+            'points_per_match': round(points_per_match, 2),
+            'projected_points': round(points_per_match * season_length),
+            'form': ''.join(form),
+            'form_points': sum(POINTS[r] for r in form),
+        })
+        row.setdefault('total_goals', 0)
+        row.setdefault('total_assists', 0)
+        row.setdefault('total_cleansheet', 0)
+        result.append(row)
+
+    result.sort(key=lambda row: (-row['points'], -row['goal_difference'], -row['goals_for'], row['club']))
+    return result
+
+
+def cache_timeout(now):
+    """Detik sampai kickoff berikutnya setelah ``now`` (maksimal ``MAX_TIMEOUT``)."""
+    next_kickoff = Match.objects.filter(match_date__gt=now).order_by('match_date').values_list(
+        'match_date', flat=True,
+    ).first()
+    if next_kickoff is None:
+        return MAX_TIMEOUT
+    return max(1, min(MAX_TIMEOUT, math.ceil((next_kickoff - now).total_seconds())))
+
+
+def club_analytics():
+    """Analitik semua klub dari cache, dihitung ulang jika sudah di-invalidate/kedaluwarsa."""
+    data = cache.get(CACHE_KEY)
+    if data is None:
+        now = timezone.now()
+        data = compute(now)
+        cache.set(CACHE_KEY, data, cache_timeout(now))
+    return data
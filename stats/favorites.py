@@ -0,0 +1,141 @@
+"""
+Operasi pemain favorit per user.
+
+Tambah/hapus/catatan untuk banyak pemain dikerjakan dengan query massal
+(``bulk_create(ignore_conflicts=True)``, satu DELETE, satu ``bulk_update``).
+``Player.favorites_count`` diubah dengan ``F()`` lewat ``change_count``: oleh signal
+``post_save`` (baris baru) dan ``post_delete`` FavoritePlayer (stats.signals, jadi
+admin, shell, dan cascade saat user dihapus ikut terhitung), dan langsung setelah
+``bulk_create`` yang tidak mengirim signal. "Paling difavoritkan" cukup membaca
+counter tanpa ``COUNT(*)``. Agar counter hanya
+bergerak untuk baris yang benar-benar bertambah/terhapus, perubahan favorit satu
+user diserialkan dengan ``SELECT ... FOR UPDATE`` pada baris user-nya: request
+yang bersamaan menunggu, lalu membaca keadaan favorit yang sudah final.
+
+Daftar favorit user (GET favorite_api) di-cache per user dan dihapus setiap
+ada perubahan; key-nya ikut token versi ``stats.leaderboards`` sehingga
+perubahan nama/foto/klub pemain juga membuat cache lama tidak terpakai.
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from main import image_pipeline
+from players.models import Player
+
+from . import leaderboards
+from .models import FavoritePlayer
+
+MAX_REASON_LENGTH = FavoritePlayer._meta.get_field('reason').max_length
+LIST_TIMEOUT = 60 * 60
+
+
+def _list_key(user_id):
+    return f'stats:favorites:{leaderboards.version()}:{user_id}'
+
+
+def invalidate(user_id):
+    cache.delete(_list_key(user_id))
+
+
+def favorite_list(user):
+    """Favorit ``user`` (URL gambar relatif), dari cache jika ada."""
+    key = _list_key(user.id)
+    data = cache.get(key)
+    if data is None:
+        favs = FavoritePlayer.objects.filter(user=user).select_related('player', 'player__team')
+        data = [{
+            "fav_id": f.id,
+            "player_id": f.player.id,
+            "name": f.player.name,
+            "club": f.player.team.nama_klub,
+            "photo": f.player.profile_picture_url.url if f.player.profile_picture_url else "",
+            "photo_sources": image_pipeline.sources(f.player.static_image),
+            "reason": f.reason,
+        } for f in favs]
+        cache.set(key, data, LIST_TIMEOUT)
+    return data
+
+
+def change_count(player_ids, delta):
+    """Tambah ``delta`` ke ``favorites_count`` pemain ``player_ids`` (tidak pernah di bawah 0)."""
+    if not player_ids:
+        return
+    players = Player.objects.filter(id__in=player_ids)
+    if delta < 0:
+        # Jangan sampai melanggar CHECK >= 0 jika counter sudah drift (lihat reconcile_favorites)
+        players = players.filter(favorites_count__gte=-delta)
+    players.update(favorites_count=F('favorites_count') + delta)
+
+
+def apply_changes(user, add=(), remove=(), reasons=None):
+    """
+    Tambah ``add``, hapus ``remove``, dan set catatan ``reasons`` ({player_id: teks})
+    dalam satu transaksi. Id yang tidak ada diabaikan. Mengembalikan jumlah
+    (ditambah, dihapus, catatan diubah).
+    """
+    reasons = reasons or {}
+    add = set(add)
+    with transaction.atomic():
+        # Kunci baris user: add/remove bersamaan untuk user yang sama tidak bisa
+        # sama-sama menganggap favorit "belum ada"/"masih ada"
+        list(get_user_model().objects.select_for_update().filter(pk=user.pk).values_list('pk', flat=True))
+        wanted = add | set(reasons)
+        valid = set(Player.objects.filter(id__in=wanted).values_list('id', flat=True)) if wanted else set()
+        existing = set(FavoritePlayer.objects.filter(
+            user=user, player_id__in=wanted,
+        ).values_list('player_id', flat=True)) if wanted else set()
+
+        new_ids = [player_id for player_id in valid if player_id in add and player_id not in existing]
+        FavoritePlayer.objects.bulk_create([
+            FavoritePlayer(user=user, player_id=player_id, reason=reasons.get(player_id, ''))
+            for player_id in new_ids
+        ], ignore_conflicts=True)
+        # bulk_create tidak mengirim post_save
+        change_count(new_ids, 1)
+
+        removed_ids = []
+        if remove:
+            removed_ids = list(FavoritePlayer.objects.filter(
+                user=user, player_id__in=remove,
+            ).values_list('player_id', flat=True))
+            # counter diturunkan per baris oleh signal post_delete
+            deleted, _ = FavoritePlayer.objects.filter(user=user, player_id__in=removed_ids).delete()
+            if deleted != len(removed_ids):
+                # seharusnya tidak terjadi selama baris user terkunci; counter jangan ditebak
+                reconcile_counts(removed_ids)
+
+        # Catatan untuk favorit yang sudah ada (yang baru sudah dapat catatan saat dibuat)
+        to_update = []
+        annotate_ids = [player_id for player_id in reasons if player_id in existing and player_id not in removed_ids]
+        if annotate_ids:
+            for fav in FavoritePlayer.objects.filter(user=user, player_id__in=annotate_ids):
+                if fav.reason != reasons[fav.player_id]:
+                    fav.reason = reasons[fav.player_id]
+                    to_update.append(fav)
+            FavoritePlayer.objects.bulk_update(to_update, ['reason'])
+
+    if new_ids or removed_ids or to_update:
+        invalidate(user.id)
+    return len(new_ids), len(removed_ids), len(to_update)
+
+
+def reconcile_counts(player_ids=None):
+    """
+    Samakan ``favorites_count`` dengan jumlah baris FavoritePlayer (jaring pengaman,
+    mis. setelah hapus lewat raw SQL yang tidak memicu signal). Satu UPDATE dengan
+    subquery GROUP BY; ``player_ids`` membatasi ke pemain tertentu. Mengembalikan
+    jumlah pemain yang diperbaiki.
+    """
+    actual = Coalesce(Subquery(
+        FavoritePlayer.objects.filter(player=OuterRef('pk'))
+        .values('player').annotate(total=Count('id')).values('total')
+    ), 0)
+    players = Player.objects.all() if player_ids is None else Player.objects.filter(id__in=player_ids)
+    return players.exclude(favorites_count=actual).update(favorites_count=actual)
+
+
+def most_favorited(limit=10):
+    return Player.objects.select_related('team').filter(favorites_count__gt=0).order_by('-favorites_count', 'name')[:limit]
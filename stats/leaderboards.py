@@ -0,0 +1,100 @@
+"""
+Payload ``statistics_api`` (top 10 pemain dan klub) yang sudah jadi.
+
+Tabel top 10 hanya berubah saat data pemain/klub berubah (biasanya lewat
+import), jadi JSON-nya dibangun sekali lalu disimpan di cache Django bersama
+ETag kuat (sha256 isi body). URL gambar dibuat absolut terhadap ``base_url``
+request, sehingga payload di-cache per host.
+
+Invalidasi memakai token versi: ``invalidate()`` mengganti token sehingga semua
+payload lama (untuk host mana pun) tidak terpakai lagi dan kedaluwarsa sendiri.
+"""
+import hashlib
+import json
+import uuid
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+from main import image_pipeline
+from players.models import Player
+
+from . import analytics
+
+VERSION_KEY = 'stats:leaderboards:version'
+PAYLOAD_TIMEOUT = 24 * 60 * 60
+TOP_N = 10
+
+
+def invalidate():
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def version():
+    token = cache.get(VERSION_KEY)
+    if token is None:
+        token = uuid.uuid4().hex
+        # add(): jika proses lain lebih dulu membuat token, token itu yang dipakai
+        if not cache.add(VERSION_KEY, token, None):
+            token = cache.get(VERSION_KEY, token)
+    return token
+
+
+def _absolute(base_url, url):
+    return base_url + url if url else ""
+
+
+def build_payload(base_url):
+    """
+    Dict payload statistics_api dengan URL gambar absolut terhadap ``base_url``.
+    ``*_sources`` berisi srcset AVIF/WebP dari ``build_images`` untuk <picture>.
+    """
+    players = Player.objects.select_related("team")
+
+    def serialize_player(p):
+        return {
+            "id": p.id,
+            "name": p.name,
+            "club": p.team.nama_klub,
+            "club_logo": _absolute(base_url, p.team.logo.url if p.team.logo else ""),
+            "club_logo_sources": image_pipeline.sources(f"img/club/{p.team.logo_filename}", base_url),
+            "photo": _absolute(base_url, p.profile_picture_url.url if p.profile_picture_url else ""),
+            "photo_sources": image_pipeline.sources(p.static_image, base_url),
+            "goals": p.curr_goals,
+            "assists": p.curr_assists,
+            "clean_sheet": p.curr_cleansheet,
+        }
+
+    # Agregat klub diambil dari cache analitik (stats.analytics)
+    clubs = [{
+        "club": c["club"],
+        "club_logo": _absolute(base_url, c["club_logo"]),
+        "club_logo_sources": image_pipeline.sources(c["club_image"], base_url),
+        "total_goals": c["total_goals"],
+        "total_assists": c["total_assists"],
+        "total_cleansheet": c["total_cleansheet"],
+    } for c in analytics.club_analytics()]
+
+    return {
+        "player": {
+            "top_scorer": [serialize_player(p) for p in players.order_by("-curr_goals")[:TOP_N]],
+            "top_assist": [serialize_player(p) for p in players.order_by("-curr_assists")[:TOP_N]],
+            "clean_sheet": [serialize_player(p) for p in players.order_by("-curr_cleansheet")[:TOP_N]],
+        },
+        "club": {
+            "top_scorer": sorted(clubs, key=lambda x: x["total_goals"], reverse=True)[:TOP_N],
+            "top_assist": sorted(clubs, key=lambda x: x["total_assists"], reverse=True)[:TOP_N],
+            "clean_sheet": sorted(clubs, key=lambda x: x["total_cleansheet"], reverse=True)[:TOP_N],
+        },
+    }
+
+
+def get_payload(base_url):
+    """(body JSON dalam bytes, ETag) dari cache, dibangun ulang jika sudah di-invalidate."""
+    key = f'stats:leaderboards:{version()}:{base_url}'
+    cached = cache.get(key)
+    if cached is None:
+        body = json.dumps(build_payload(base_url), cls=DjangoJSONEncoder).encode()
+        cached = (body, '"%s"' % hashlib.sha256(body).hexdigest()[:32])
+        cache.set(key, cached, PAYLOAD_TIMEOUT)
+    return cached
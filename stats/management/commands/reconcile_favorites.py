@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from players import search
+from stats import favorites
+
+
+class Command(BaseCommand):
+    help = 'Samakan Player.favorites_count dengan jumlah FavoritePlayer sebenarnya (satu UPDATE)'
+
+    def handle(self, *args, **options):
+        fixed = favorites.reconcile_counts()
+        if fixed:
+            # counter ikut menentukan urutan pencarian pemain
+            search.invalidate()
+        self.stdout.write(self.style.SUCCESS(f"✅ Counter favorit selesai dicek! {fixed} pemain diperbaiki."))
@@ -0,0 +1,36 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from clubs.models import Club
+from matches.models import Match, MatchStats
+from players.models import Player
+
+from . import analytics, favorites, leaderboards
+from .models import FavoritePlayer
+
+
+@receiver([post_save, post_delete], sender=Match)
+@receiver([post_save, post_delete], sender=MatchStats)
+@receiver([post_save, post_delete], sender=Player)
+@receiver([post_save, post_delete], sender=Club)
+def invalidate_analytics(sender, **kwargs):
+    analytics.invalidate()
+
+
+@receiver([post_save, post_delete], sender=Player)
+@receiver([post_save, post_delete], sender=Club)
+def invalidate_leaderboards(sender, **kwargs):
+    leaderboards.invalidate()
+
+
+@receiver(post_save, sender=FavoritePlayer)
+def increment_favorites_count(sender, instance, created, raw=False, **kwargs):
+    # Tambah favorit lewat admin/shell/create(); bulk_create di stats.favorites menghitung sendiri
+    if created and not raw:
+        favorites.change_count([instance.player_id], 1)
+
+
+@receiver(post_delete, sender=FavoritePlayer)
+def decrement_favorites_count(sender, instance, **kwargs):
+    # Juga berjalan untuk cascade (user dihapus), jadi reconcile_favorites cukup jaring pengaman
+    favorites.change_count([instance.player_id], -1)
@@ -6,6 +6,10 @@ app_name = 'stats'
 urlpatterns = [
     path('', views.show_stats, name='show_stats'),
     path('api/stats/', views.statistics_api, name='statistics_api'),
+    path('api/club-analytics/', views.club_analytics_api, name='club_analytics_api'),
+    path('api/club-match-stats/', views.club_match_stats_api, name='club_match_stats_api'),
     path('api/favorite/', views.favorite_api, name='favorite_api'),
+    path('api/favorite/batch/', views.favorite_batch_api, name='favorite_batch_api'),
+    path('api/favorite/top/', views.most_favorited_api, name='most_favorited_api'),
     path('api/player/search/', views.search_player_api, name='search_player_api'),
 ]
\ No newline at end of file
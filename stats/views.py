@@ -1,13 +1,17 @@
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse, HttpResponseNotModified, JsonResponse
+from django.utils.cache import parse_etags
 from django.views.decorators.http import require_http_methods
 from django.contrib.auth.decorators import login_required
-from django.db.models import Sum
 from clubs.models import Club 
 from players.models import Player 
 from stats.models import FavoritePlayer
+from matches.match_stats import club_season_stats
+from stats import analytics, favorites, leaderboards
+from players.search import search_players
 from django.views.decorators.csrf import csrf_exempt
 import json
+import uuid
 
 def show_stats(request):    
     return render(request, 'stats.html', {"title": "Statistik Klub & Pemain"})
@@ -24,69 +28,60 @@ def statistics_api(request):
     - club.clean_sheet
     """
 
-    players = Player.objects.select_related("team").all()
-
-    top_scorer = players.order_by("-curr_goals")[:10]
-    top_assist = players.order_by("-curr_assists")[:10]
-    clean_sheet = players.order_by("-curr_cleansheet")[:10]
-
-    def serialize_player(p):
-        return {
-            "id": p.id,
-            "name": p.name,
-            "club": p.team.nama_klub,
-            "club_logo": request.build_absolute_uri(p.team.logo.url) if p.team.logo else "",
-            "photo": request.build_absolute_uri(p.profile_picture_url.url) if p.profile_picture_url else "",
-            "goals": p.curr_goals,
-            "assists": p.curr_assists,
-            "clean_sheet": p.curr_cleansheet,
-        }
-
-    clubs_qs = Club.objects.annotate(
-        total_goals=Sum("player__curr_goals"),
-        total_assists=Sum("player__curr_assists"),
-        total_cleansheet=Sum("player__curr_cleansheet"),
-    )
-
-    clubs = [{
-        "club": c.nama_klub,
-        "club_logo": request.build_absolute_uri(c.logo.url) if c.logo else "",
-        "total_goals": c.total_goals or 0,
-        "total_assists": c.total_assists or 0,
-        "total_cleansheet": c.total_cleansheet or 0,
-    } for c in clubs_qs]
+    # Payload dan ETag-nya di-cache sampai data pemain/klub berubah (stats.leaderboards)
+    body, etag = leaderboards.get_payload(request.build_absolute_uri('/')[:-1])
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+def club_analytics_api(request):
+    """Analitik semua klub: konversi tembakan, proyeksi poin, form, split kandang/tandang."""
+    clubs = [
+        dict(c, club_logo=request.build_absolute_uri(c["club_logo"]) if c["club_logo"] else "")
+        for c in analytics.club_analytics()
+    ]
+    return JsonResponse({"clubs": clubs})
+
+def club_match_stats_api(request):
+    """
+    Agregat statistik pertandingan per klub (kartu, penguasaan bola, akurasi
+    tembakan, rata-rata per laga). ``?week=`` membatasi sampai pekan tertentu,
+    ``?club=`` ke satu klub.
+    """
+    week = request.GET.get('week')
+    if week:
+        try:
+            week = int(week)
+        except ValueError:
+            return JsonResponse({'message': 'Parameter week tidak valid!'}, status=400)
+    else:
+        week = None
 
     return JsonResponse({
-        "player": {
-            "top_scorer": [serialize_player(p) for p in top_scorer],
-            "top_assist": [serialize_player(p) for p in top_assist],
-            "clean_sheet": [serialize_player(p) for p in clean_sheet],
-        },
-        "club": {
-            "top_scorer": sorted(clubs, key=lambda x: x["total_goals"], reverse=True)[:10],
-            "top_assist": sorted(clubs, key=lambda x: x["total_assists"], reverse=True)[:10],
-            "clean_sheet": sorted(clubs, key=lambda x: x["total_cleansheet"], reverse=True)[:10],
-        }
+        'week': week,
+        'clubs': club_season_stats(week=week, club=request.GET.get('club') or None),
     })
 
+def _parse_player_id(value):
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
 @csrf_exempt
 @login_required
 def favorite_api(request):
 
     if request.method == "GET":
-        favs = FavoritePlayer.objects.filter(
-            user=request.user
-        ).select_related("player", "player__team")
-
-        data = [{
-            "fav_id": f.id,
-            "player_id": f.player.id,
-            "name": f.player.name,
-            "club": f.player.team.nama_klub,
-            "photo": request.build_absolute_uri(f.player.profile_picture_url.url) if f.player.profile_picture_url else "",
-            "reason": f.reason,
-        } for f in favs]
-
+        base_url = request.build_absolute_uri('/')[:-1]
+        data = [
+            dict(f, photo=base_url + f["photo"] if f["photo"] else "")
+            for f in favorites.favorite_list(request.user)
+        ]
         return JsonResponse({"favorites": data})
 
     if request.method == "POST":
@@ -97,33 +92,65 @@ def favorite_api(request):
         if not player_id:
             return JsonResponse({"error": "player_id is required"}, status=400)
 
-        player = get_object_or_404(Player, id=player_id)
-
-        fav, created = FavoritePlayer.objects.get_or_create(
-            user=request.user,
-            player=player
-        )
+        player_id = _parse_player_id(player_id)
+        if player_id is None or not Player.objects.filter(id=player_id).exists():
+            raise Http404
 
         if reason is not None:
-            if len(reason) > 150:
+            if len(reason) > favorites.MAX_REASON_LENGTH:
                 return JsonResponse({"error": "Note terlalu panjang"}, status=400)
-            fav.reason = reason
-            fav.save()
-            return JsonResponse({"status": "updated", "reason": fav.reason})
+            favorites.apply_changes(request.user, add=[player_id], reasons={player_id: reason})
+            return JsonResponse({"status": "updated", "reason": reason})
 
-        if not created:
-            fav.delete()
+        added, _, _ = favorites.apply_changes(request.user, add=[player_id])
+        if not added:
+            favorites.apply_changes(request.user, remove=[player_id])
             return JsonResponse({"status": "removed"})
 
         return JsonResponse({"status": "added"})
 
     return JsonResponse({"error": "Method Not Allowed"}, status=405)
 
+@csrf_exempt
+@login_required
+@require_http_methods(["POST"])
+def favorite_batch_api(request):
+    """
+    Ubah banyak favorit sekaligus:
+    {"add": [player_id, ...], "remove": [player_id, ...], "reasons": {player_id: catatan}}
+    """
+    try:
+        body = json.loads(request.body)
+        add = [_parse_player_id(value) for value in body.get("add", [])]
+        remove = [_parse_player_id(value) for value in body.get("remove", [])]
+        reasons = {_parse_player_id(key): value for key, value in body.get("reasons", {}).items()}
+    except (ValueError, AttributeError, TypeError):
+        return JsonResponse({"error": "Format request tidak valid"}, status=400)
+
+    if None in add or None in remove or None in reasons:
+        return JsonResponse({"error": "player_id tidak valid"}, status=400)
+    if any(not isinstance(reason, str) or len(reason) > favorites.MAX_REASON_LENGTH for reason in reasons.values()):
+        return JsonResponse({"error": "Note terlalu panjang"}, status=400)
+
+    added, removed, updated = favorites.apply_changes(request.user, add=add, remove=remove, reasons=reasons)
+    return JsonResponse({"added": added, "removed": removed, "updated": updated})
+
+def most_favorited_api(request):
+    """Pemain paling difavoritkan, dibaca dari counter Player.favorites_count."""
+    data = [{
+        "id": p.id,
+        "name": p.name,
+        "club": p.team.nama_klub,
+        "favorites": p.favorites_count,
+    } for p in favorites.most_favorited()]
+    return JsonResponse({"players": data})
+
 @csrf_exempt    
 @login_required
 def search_player_api(request):
     q = request.GET.get("q", "")
-    players = Player.objects.filter(name__icontains=q)[:10]
+    # Index nama tanpa aksen, urut awalan lalu popularitas (players.search)
+    players = search_players(q, limit=10)
 
     data = [{
         "id": p.id,